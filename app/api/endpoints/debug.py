@@ -0,0 +1,95 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import ProfilerBusyError, SamplingProfiler
+
+
+def require_debug_token(request: Request):
+    token = settings.DEBUG_API_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(credentials, token):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid debug token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_debug_token)])
+
+
+@router.get("/traces/slow")
+async def slow_traces(request: Request, limit: int = Query(20, ge=1, le=1000)):
+    traces = request.app.state.traces
+    return {
+        "capacity": traces.capacity,
+        "traces": traces.slowest(limit),
+    }
+
+
+@router.delete("/traces/slow")
+async def clear_slow_traces(request: Request):
+    request.app.state.traces.clear()
+    return {"status": "CLEARED"}
+
+
+@router.get("/profile")
+async def profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+):
+    """
+    Sample every thread for `seconds` and return collapsed stacks
+    (pipe into flamegraph.pl, or load in speedscope).
+    """
+    if seconds > settings.DEBUG_PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be <= {settings.DEBUG_PROFILE_MAX_SECONDS}",
+        )
+
+    profiler: SamplingProfiler = request.app.state.profiler
+    lag = request.app.state.loop_lag
+    lag.reset_max()
+
+    try:
+        result = await profiler.profile(seconds, interval_ms / 1000)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    loop_lag = {"last_seconds": lag.last, "max_seconds": lag.max}
+
+    if format == "json":
+        return {
+            "duration_seconds": result["duration_seconds"],
+            "interval_seconds": result["interval_seconds"],
+            "samples": result["samples"],
+            "event_loop_lag": loop_lag,
+            "stacks": dict(result["stacks"].most_common()),
+        }
+
+    return PlainTextResponse(
+        SamplingProfiler.collapsed(result["stacks"]),
+        headers={
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Event-Loop-Lag-Max": f"{loop_lag['max_seconds']:.6f}",
+        },
+    )
+
+
+@router.get("/loop-lag")
+async def loop_lag(request: Request):
+    lag = request.app.state.loop_lag
+    return {
+        "interval_seconds": lag.interval,
+        "last_seconds": lag.last,
+        "max_seconds": lag.max,
+    }
@@ -11,12 +11,13 @@ router = APIRouter()
 
 
 @router.post("/pdf")
-async def ingest_pdf(request: Request,file: UploadFile = File(...),rag_access_level:str = "public"):
+async def ingest_pdf(request: Request,file: UploadFile = File(...),rag_access_level:str = "public",namespace:str | None = None):
     # ---------- Validation ----------
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     level, access_rank = RAGUtils.validate_rag_access_level(rag_access_level)
+    namespace = RAGUtils.validate_namespace(namespace)
 
     # ---------- Save file ----------
     file_path: Path = await FileUtils.save_upload_async(file=file)
@@ -26,11 +27,13 @@ async def ingest_pdf(request: Request,file: UploadFile = File(...),rag_access_le
         IngestionService.ingest_document(file_path=file_path,
                                          request=request, 
                                          rag_access_level=level,
-                                         access_rank=access_rank)
+                                         access_rank=access_rank,
+                                         namespace=namespace)
                                 )
 
     return {
         "status": "INGESTION_STARTED",
         "filename": file.filename,
+        "namespace": namespace,
         "message": "PDF ingestion started asynchronously",
     }
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.service.retrieval_service import RetrievalService
+
+router = APIRouter()
+
+
+class BatchQuery(BaseModel):
+    query: str = Field(min_length=1)
+    id: str | None = None
+    rag_access_level: str = "public"
+    namespaces: str | list[str] | None = None
+    top_k: int = Field(5, ge=1, le=100)
+
+
+class BatchRetrieveRequest(BaseModel):
+    queries: list[BatchQuery] = Field(min_length=1)
+
+
+@router.post("/batch")
+async def retrieve_batch(request: Request, body: BatchRetrieveRequest):
+    """
+    Ranked chunks for many queries: one embedding pass, then at most
+    RETRIEVAL_BATCH_CONCURRENCY vector-store queries in flight.
+    """
+    if len(body.queries) > settings.RETRIEVAL_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.RETRIEVAL_BATCH_MAX_QUERIES} queries per batch",
+        )
+
+    queries = RetrievalService.resolve([q.model_dump() for q in body.queries])
+
+    return await RetrievalService.retrieve_batch(
+        queries,
+        embedder=request.app.state.embedder,
+        retriever=request.app.state.retriever,
+        concurrency=settings.RETRIEVAL_BATCH_CONCURRENCY,
+    )
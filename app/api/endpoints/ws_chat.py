@@ -1,8 +1,11 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import json
+from app.core.config import settings
 from app.service.chat_service import ChatService
+from app.service.chat_session import ChatSession
 from app.core.logger import get_logger
 from app.core.metrics import ACTIVE_WS_CONNECTIONS
+from app.core.tracing import new_request_id
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -13,6 +16,7 @@ async def chat_websocket(ws: WebSocket):
     await ws.accept()
     logger.info("WebSocket connected")
     ACTIVE_WS_CONNECTIONS.inc()
+    session = ChatSession.from_settings() if settings.CHAT_SESSION_ENABLED else None
 
     try:
         while True:
@@ -23,7 +27,9 @@ async def chat_websocket(ws: WebSocket):
 
             if event_type == "chat_request":
                 payload = data.get("payload", {})
-                await ChatService.handle_chat(ws, payload)
+                await ChatService.handle_chat(
+                    ws, payload, request_id=new_request_id(), session=session
+                )
 
             else:
                 await ws.send_json({
@@ -36,3 +42,5 @@ async def chat_websocket(ws: WebSocket):
 
     finally:
         ACTIVE_WS_CONNECTIONS.dec()
+        if session is not None:
+            session.close()
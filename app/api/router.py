@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 from app.api.endpoints.ingestion import router as ingestion_router
 from app.api.endpoints.ws_chat import router as ws_chat_router
+from app.api.endpoints.debug import router as debug_router
+from app.api.endpoints.retrieval import router as retrieval_router
 # Feature routers
 
 # Future routers (placeholders)
-# from app.api.retrieval import router as retrieval_router
 # from app.api.evaluation import router as evaluation_router
 
 api_router = APIRouter()
@@ -32,16 +33,28 @@ api_router.include_router(
     ws_chat_router,
 )
 
+# -------------------------
+# RAG Retrieval APIs
+# -------------------------
+api_router.include_router(
+    retrieval_router,
+    prefix="/retrieve",
+    tags=["RAG Retrieval"],
+)
+
+# -------------------------
+# Diagnostics
+# -------------------------
+api_router.include_router(
+    debug_router,
+    prefix="/debug",
+    tags=["Debug"],
+)
+
 # -------------------------
 # Future Expansion
 # -------------------------
 # api_router.include_router(
-#     retrieval_router,
-#     prefix="/retrieve",
-#     tags=["RAG Retrieval"],
-# )
-#
-# api_router.include_router(
 #     evaluation_router,
 #     prefix="/evaluate",
 #     tags=["RAG Evaluation"],
@@ -1,7 +1,7 @@
 from functools import lru_cache
 from pydantic import  Field, field_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -24,6 +24,13 @@ class Settings(BaseSettings):
     PINECONE_CLOUD: str = "aws"
     PINECONE_REGION: str = "us-east-1"
     NAME_SPACE: str = "Enterprise-RAG"
+    # Direct index host; skips control-plane calls when set
+    PINECONE_INDEX_HOST: Optional[str] = None
+    # Native asyncio data-plane I/O (pooled httpx) instead of executor threads
+    PINECONE_ASYNC_HTTP: bool = True
+    PINECONE_POOL_SIZE: int = 100
+    PINECONE_TIMEOUT_SECONDS: float = 10.0
+    PINECONE_API_VERSION: str = "2025-04"
     RAG_ACCESS_LEVELS : dict[str, int]= {
     "public": 1,
     "internal": 2,
@@ -32,17 +39,105 @@ class Settings(BaseSettings):
     }
 
 
+    # -------------------------
+    # Retrieval Configuration
+    # -------------------------
+    # Upper bound on namespaces searched by one fan-out query
+    RETRIEVAL_MAX_NAMESPACES: int = 8
+    # Store each access level in its own namespace partition and fan out
+    # over readable partitions instead of filtering on access rank.
+    # Switching layouts requires re-ingesting documents.
+    ACCESS_PARTITIONED_NAMESPACES: bool = False
+
+    # Result cache
+    RETRIEVAL_CACHE_ENABLED: bool = True
+    RETRIEVAL_CACHE_TTL_SECONDS: float = 300.0
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = 2048
+    RETRIEVAL_CACHE_MAX_MB: int = 64
+
+    # POST /retrieve/batch
+    RETRIEVAL_BATCH_MAX_QUERIES: int = 256
+    RETRIEVAL_BATCH_CONCURRENCY: int = 16
+
+    # Chat context selection. Matches below RETRIEVAL_MIN_SCORE, or below
+    # RETRIEVAL_ADAPTIVE_RATIO * best score, are dropped (adaptive k).
+    # With MMR, RETRIEVAL_MMR_FETCH_K candidates are fetched with their
+    # vectors and RETRIEVAL_TOP_K diverse ones kept.
+    RETRIEVAL_TOP_K: int = 5
+    RETRIEVAL_MIN_SCORE: Optional[float] = None
+    RETRIEVAL_ADAPTIVE_RATIO: Optional[float] = None
+    RETRIEVAL_MMR_ENABLED: bool = False
+    RETRIEVAL_MMR_LAMBDA: float = 0.7
+    RETRIEVAL_MMR_FETCH_K: int = 20
+
+    # With reduced vectors and the chunk store (which then also keeps the
+    # full vectors): over-fetch this many candidates and re-rank them by
+    # full-dimension similarity
+    RETRIEVAL_RESCORE_ENABLED: bool = False
+    RETRIEVAL_RESCORE_FETCH_K: int = 50
+
+
+    # -------------------------
+    # Chunk Store Configuration
+    # -------------------------
+    # Keep chunk text in a local SQLite store instead of vector metadata.
+    # Vectors ingested without it are not retrievable once enabled.
+    CHUNK_STORE_ENABLED: bool = False
+    CHUNK_STORE_PATH: str = "data/chunks.sqlite3"
+
+
     # -------------------------
     # Embeddings Configuration
     # -------------------------
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BATCH_SIZE: int = 32
+    # In-memory precision of ingestion embeddings; float16 halves memory,
+    # values are widened only when upsert batches are serialized. Query
+    # embeddings are always float32.
+    EMBEDDING_DTYPE: Literal["float32", "float16"] = "float32"
+    # "onnx" runs on ONNX Runtime (CPU); the model is exported once to
+    # EMBEDDING_ONNX_DIR. Requires sentence-transformers[onnx].
+    EMBEDDING_BACKEND: Literal["torch", "onnx"] = "torch"
+    EMBEDDING_ONNX_QUANTIZE: bool = False
+    EMBEDDING_ONNX_QUANTIZATION_CONFIG: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = "avx512_vnni"
+    EMBEDDING_ONNX_DIR: str = "data/onnx"
+    # Intra-op threads per embedding forward pass (None: library default)
+    EMBEDDING_NUM_THREADS: Optional[int] = None
+    # Shared embedding process for multi-worker deployments
+    # (python -m app.rag_core.embeddings.sidecar). When set, workers embed
+    # through this Unix socket instead of loading their own model; with
+    # EMBEDDING_SIDECAR_FALLBACK they load one in-process while it is down.
+    EMBEDDING_SIDECAR_SOCKET: Optional[str] = None
+    EMBEDDING_SIDECAR_FALLBACK: bool = True
+    EMBEDDING_SIDECAR_RETRY_SECONDS: float = 5.0
+    EMBEDDING_SIDECAR_MAX_BATCH: int = 64
+    EMBEDDING_SIDECAR_MAX_WAIT_MS: float = 2.0
+    # Store reduced vectors in the index. "pca" projects onto components
+    # fitted on a corpus sample (python -m app.rag_core.embeddings.reduction),
+    # "truncate" keeps the leading dimensions (Matryoshka-trained models).
+    # The index dimension becomes EMBEDDING_REDUCED_DIMENSION; switching
+    # requires a new index and re-ingesting.
+    EMBEDDING_REDUCTION: Literal["none", "pca", "truncate"] = "none"
+    EMBEDDING_REDUCED_DIMENSION: int = 128
+    EMBEDDING_REDUCTION_PATH: str = "data/reduction/projection.npz"
 
     # -------------------------
     # Chunking Configuration
     # -------------------------
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 150
+
+    # -------------------------
+    # Parse Cache Configuration
+    # -------------------------
+    # Extracted page text keyed by file hash, so re-chunking and
+    # duplicate uploads skip PDF/DOCX parsing. Off by default: it keeps
+    # document text on local disk under PARSE_CACHE_DIR
+    PARSE_CACHE_ENABLED: bool = False
+    PARSE_CACHE_DIR: str = "data/parse_cache"
+    PARSE_CACHE_MAX_MB: int = 512
+    PARSE_CACHE_MAX_ENTRIES: int = 10000
     # -------------------------
     # Runtime / ML Configuration
     # -------------------------
@@ -62,6 +157,95 @@ class Settings(BaseSettings):
     NVIDIA_MODELS: str
     NVIDIA_DEFAULT_MODEL: str
 
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_POOL_SIZE: int = 64
+    LLM_KEEPALIVE_SECONDS: float = 60.0
+
+    # LLM admission control (per model)
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_MAX_QUEUE: int = 64
+    LLM_MAX_QUEUE_WAIT_SECONDS: float = 5.0
+    LLM_RATE_LIMIT_PER_SECOND: Optional[float] = None
+    LLM_RATE_LIMIT_BURST: int = 10
+    # Per-model overrides, e.g. {"meta/llama3-70b-instruct": {"max_concurrency": 4}}
+    LLM_MODEL_LIMITS: dict[str, dict[str, float]] = {}
+
+    # LLM hedging: start the prompt on a fallback model when the primary
+    # has no first token after the rolling p<LLM_HEDGE_PERCENTILE> delay.
+    # Fallbacks map primary -> fallback model ("*" applies to all).
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_FALLBACKS: dict[str, str] = {}
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_WINDOW: int = 200
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_INITIAL_DELAY_SECONDS: float = 2.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 0.3
+    LLM_HEDGE_MAX_DELAY_SECONDS: float = 5.0
+
+
+
+    # -------------------------
+    # Chat Deadlines
+    # -------------------------
+    # Default per-request budget; payload `deadline_ms` may override
+    # up to CHAT_MAX_DEADLINE_SECONDS
+    CHAT_DEADLINE_SECONDS: float = 30.0
+    CHAT_MAX_DEADLINE_SECONDS: float = 120.0
+    # Per-stage caps (also bounded by the remaining budget)
+    CHAT_EMBEDDING_TIMEOUT_SECONDS: float = 2.0
+    CHAT_RETRIEVAL_TIMEOUT_SECONDS: float = 3.0
+    CHAT_FIRST_TOKEN_TIMEOUT_SECONDS: float = 15.0
+    # Budget kept back from embedding/retrieval for the LLM stream
+    CHAT_LLM_RESERVE_SECONDS: float = 5.0
+    # Warm the upstream LLM connection concurrently with embed + retrieve
+    CHAT_PIPELINED: bool = True
+
+
+    # -------------------------
+    # Chat Sessions (per WebSocket connection)
+    # -------------------------
+    CHAT_SESSION_ENABLED: bool = True
+    # Turns kept, and the prompt token budget for replaying them
+    CHAT_SESSION_MAX_TURNS: int = 6
+    CHAT_SESSION_HISTORY_TOKENS: int = 1024
+    # Retrieved chunks kept for reuse by follow-up retrievals
+    CHAT_SESSION_MAX_CHUNKS: int = 256
+    # Cosine similarity to the previous query above which its retrieval
+    # is reused as-is, e.g. 0.95 (None: always retrieve)
+    CHAT_SESSION_REUSE_SIMILARITY: Optional[float] = None
+
+
+    # -------------------------
+    # Tracing
+    # -------------------------
+    # Slowest chat traces kept for /api/v1/debug/traces/slow
+    TRACE_SLOW_BUFFER_SIZE: int = 50
+
+
+    # -------------------------
+    # Logging
+    # -------------------------
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Bounded queue to the writer thread. When full, "drop" discards the
+    # record at once; "block" waits up to LOG_QUEUE_BLOCK_SECONDS first.
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_POLICY: Literal["drop", "block"] = "drop"
+    LOG_QUEUE_BLOCK_SECONDS: float = 0.05
+    # Per-logger (or package) hot-path limits: records/sec per message
+    # template, and fraction of INFO/DEBUG records kept. ERROR always passes.
+    LOG_RATE_LIMITS: dict[str, float] = {"app.rag_core.llm.nvidia_client": 5.0}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+
+    # -------------------------
+    # Diagnostics
+    # -------------------------
+    # /api/v1/debug/* is disabled unless a token is set; clients send
+    # it as "Authorization: Bearer <token>"
+    DEBUG_API_TOKEN: Optional[str] = None
+    DEBUG_PROFILE_MAX_SECONDS: float = 60.0
+    EVENT_LOOP_LAG_PROBE_INTERVAL_SECONDS: float = 0.5
 
 
     # -------------------------
@@ -75,6 +259,15 @@ class Settings(BaseSettings):
             raise ValueError("CHUNK_OVERLAP must be smaller than CHUNK_SIZE")
         return v
     
+    @property
+    def vector_dimension(self) -> int:
+        """
+        Dimension of the vectors stored in the index.
+        """
+        if self.EMBEDDING_REDUCTION == "none":
+            return self.EMBEDDING_DIMENSION
+        return self.EMBEDDING_REDUCED_DIMENSION
+
     @property
     def nvidia_model_list(self) -> list[str]:
         return [m.strip() for m in self.NVIDIA_MODELS.split(",")]
@@ -95,5 +288,19 @@ def get_settings() -> Settings:
     return Settings()
 
 
+class _LazySettings:
+    """
+    Module-level handle to the cached settings. The environment / .env
+    is read on first attribute access rather than at import, so importing
+    the app (CLI tools, tests) does not require a complete configuration.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {Settings.__name__}>"
+
+
 # Singleton-style access
-settings = get_settings()
+settings = _LazySettings()
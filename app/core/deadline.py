@@ -0,0 +1,143 @@
+import asyncio
+from time import monotonic
+
+from app.core.metrics import STAGE_TIMEOUTS_TOTAL
+
+
+async def _bounded(awaitable, timeout: float):
+    """
+    Await in the current task, raising asyncio.TimeoutError after `timeout`.
+    Unlike wait_for on Python 3.10, no task is created per call.
+    """
+    if hasattr(asyncio, "timeout"):
+        async with asyncio.timeout(timeout):
+            return await awaitable
+
+    task = asyncio.current_task()
+    timed_out = False
+
+    def expire():
+        nonlocal timed_out
+        timed_out = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(timeout, expire)
+    try:
+        return await awaitable
+    except asyncio.CancelledError:
+        if timed_out:
+            raise asyncio.TimeoutError from None
+        raise
+    finally:
+        handle.cancel()
+
+
+class StageTimeoutError(TimeoutError):
+    """
+    A pipeline stage ran out of its share of the request deadline.
+    """
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"Stage '{stage}' exceeded its budget ({budget:.3f}s)")
+        self.stage = stage
+        self.budget = budget
+
+
+class Deadline:
+    """
+    Per-request time budget propagated through every pipeline stage.
+
+    Each stage awaits through `run()`/`stream()`, which bound it by
+    min(stage cap, remaining budget - reserve). Work offloaded to threads
+    (e.g. embedding) is abandoned, not interrupted, on timeout.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return self.seconds - (self.expires_at - monotonic())
+
+    def budget(self, cap: float | None = None, reserve: float = 0.0) -> float:
+        """
+        Time a stage may take: remaining minus `reserve` for later stages.
+        The reserve never takes more than half of what is left, so short
+        deadlines still give early stages a chance.
+        """
+        remaining = self.remaining()
+        budget = remaining - min(reserve, remaining / 2)
+        if cap is not None:
+            budget = min(budget, cap)
+        return max(0.0, budget)
+
+    def check(self, stage: str):
+        """
+        Raise if no budget is left before starting a synchronous stage.
+        """
+        if self.expired():
+            self._timeout(stage, 0.0)
+
+    async def run(
+        self,
+        stage: str,
+        awaitable,
+        cap: float | None = None,
+        reserve: float = 0.0,
+    ):
+        budget = self.budget(cap, reserve)
+
+        if budget <= 0:
+            close = getattr(awaitable, "close", None)
+            if close is not None:
+                close()
+            self._timeout(stage, budget)
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout=budget)
+        except asyncio.TimeoutError:
+            self._timeout(stage, budget)
+
+    async def stream(
+        self,
+        agen,
+        first_stage: str,
+        next_stage: str,
+        first_cap: float | None = None,
+    ):
+        """
+        Iterate an async generator, bounding the first item by
+        `first_cap` and every item by the remaining budget.
+
+        The generator is driven from the consuming task (no task per item),
+        so context managers inside it are always resumed by the same task.
+        """
+        stage, cap = first_stage, first_cap
+        try:
+            while True:
+                budget = self.budget(cap)
+                if budget <= 0:
+                    self._timeout(stage, budget)
+
+                try:
+                    item = await _bounded(agen.__anext__(), budget)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    self._timeout(stage, budget)
+
+                stage, cap = next_stage, None
+                yield item
+        finally:
+            await agen.aclose()
+
+    @staticmethod
+    def _timeout(stage: str, budget: float):
+        STAGE_TIMEOUTS_TOTAL.labels(stage=stage).inc()
+        raise StageTimeoutError(stage, budget)
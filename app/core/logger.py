@@ -1,69 +1,334 @@
+import copy
+import json
 import logging
 import logging.handlers
 import queue
+import random
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from time import monotonic
 from typing import Optional
 
+from app.core.config import settings
+from app.core.metrics import LOG_RECORDS_DROPPED, LOG_RECORDS_SUPPRESSED
+from app.core.tracing import current_request_id
+
 # ---------- Paths ----------
 BASE_DIR = Path(__file__).resolve().parents[2]
 LOG_DIR = BASE_DIR / "logs"
 INFO_LOG_FILE = LOG_DIR / "info.log"
 ERROR_LOG_FILE = LOG_DIR / "error.log"
 
-# Ensure log directory exists
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+_EXC_FORMATTER = logging.Formatter()
 
 # ---------- Async Queue ----------
 _log_queue: Optional[queue.Queue] = None
 _listener: Optional[logging.handlers.QueueListener] = None
+# Loggers handed out by get_logger(); configure_logging() applies settings to them
+_loggers: dict[str, logging.Logger] = {}
+_configure_lock = threading.RLock()
+
+# LOG_* options used when settings cannot be loaded (incomplete environment)
+_DEFAULT_OPTIONS = {
+    "LOG_LEVEL": "INFO",
+    "LOG_FORMAT": "text",
+    "LOG_QUEUE_SIZE": 0,
+    "LOG_QUEUE_POLICY": "drop",
+    "LOG_QUEUE_BLOCK_SECONDS": 0.05,
+    "LOG_RATE_LIMITS": {},
+    "LOG_SAMPLE_RATES": {},
+}
+_options: dict = dict(_DEFAULT_OPTIONS)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue.
+
+    policy="drop": a full queue discards the record immediately.
+    policy="block": wait up to `block_seconds` for space, then discard.
+    Discarded records are counted in rag_log_records_dropped_total.
+
+    Created without a queue by get_logger(): the first record then
+    configures logging (CLI tools that never run the app lifespan).
+    """
+
+    def __init__(
+        self,
+        log_queue: Optional[queue.Queue] = None,
+        policy: str = "drop",
+        block_seconds: float = 0.05,
+    ):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_seconds = block_seconds
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self.queue is None:
+            configure_logging()
+            if record.levelno < logging.getLogger(record.name).level:
+                return False
+        return super().handle(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render only the message here; the listener thread applies the
+        # text/JSON formatter (and keeps tracebacks out of "message")
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_seconds)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(policy=self.policy).inc()
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener whose stop() waits for room in a full bounded queue
+    instead of failing to enqueue its sentinel.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamp records with the current chat request ID on the calling
+    thread (the context variable is not visible to the listener thread).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Hot-path limiter attached to individual loggers.
+
+    - `rate`: records/sec per message template (token bucket, burst =
+      max(1, rate), so rates below 1/s still let a record through)
+    - `sample`: fraction of INFO/DEBUG records kept
+
+    Runs before any formatting, so suppressed %-style records are never
+    rendered. ERROR and above always pass.
+    """
+
+    def __init__(self, rate: Optional[float] = None, sample: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self.capacity = max(1.0, rate) if rate is not None else None
+        self.sample = sample
+        # template -> (tokens, last refill); races between threads only
+        # let an occasional extra record through
+        self._buckets: dict[tuple, tuple[float, float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        if (
+            self.sample < 1.0
+            and record.levelno < logging.WARNING
+            and random.random() >= self.sample
+        ):
+            return self._suppress(record, "sampled")
+
+        if self.rate is not None and not self._take((record.name, record.msg)):
+            return self._suppress(record, "rate_limited")
+
+        return True
+
+    def _take(self, key: tuple) -> bool:
+        now = monotonic()
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return False
+
+        self._buckets[key] = (tokens - 1, now)
+        return True
+
+    @staticmethod
+    def _suppress(record: logging.LogRecord, reason: str) -> bool:
+        LOG_RECORDS_SUPPRESSED.labels(logger=record.name, reason=reason).inc()
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def _logger_limits(name: str) -> Optional[RateLimitFilter]:
+    def lookup(table: dict):
+        # Exact logger name or closest configured parent package
+        parts = name.split(".")
+        for i in range(len(parts), 0, -1):
+            value = table.get(".".join(parts[:i]))
+            if value is not None:
+                return value
+        return None
+
+    rate = lookup(_options["LOG_RATE_LIMITS"])
+    sample = lookup(_options["LOG_SAMPLE_RATES"])
+
+    if rate is None and sample is None:
+        return None
+    return RateLimitFilter(rate=rate, sample=1.0 if sample is None else sample)
+
+
+def _load_options() -> dict:
+    """
+    LOG_* settings, or the defaults when settings cannot be loaded:
+    a log call must never raise, even without a complete .env.
+    """
+    try:
+        return {key: getattr(settings, key) for key in _DEFAULT_OPTIONS}
+    except Exception:
+        return dict(_DEFAULT_OPTIONS)
+
+
+def configure_logging():
+    """
+    Create the log directory, start the writer thread and apply the LOG_*
+    settings to every logger from get_logger(). Idempotent.
+
+    Called from the application lifespan; otherwise it runs when the
+    first record is emitted, so importing modules has no side effects.
+    """
+    global _log_queue, _listener, _options
+
+    with _configure_lock:
+        if _log_queue is not None:
+            return
+
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+        _options = _load_options()
+        log_queue = queue.Queue(maxsize=_options["LOG_QUEUE_SIZE"])
+
+        formatter = _build_formatter(_options["LOG_FORMAT"])
+
+        # -------- INFO & WARNING HANDLER --------
+        info_handler = logging.handlers.RotatingFileHandler(
+            INFO_LOG_FILE,
+            maxBytes=10 * 1024 * 1024,  # 10 MB
+            backupCount=5,
+        )
+        info_handler.setLevel(logging.INFO)
+        info_handler.setFormatter(formatter)
+        info_handler.addFilter(lambda record: record.levelno < logging.ERROR)
+
+        # -------- ERROR & EXCEPTION HANDLER --------
+        error_handler = logging.handlers.RotatingFileHandler(
+            ERROR_LOG_FILE,
+            maxBytes=10 * 1024 * 1024,  # 10 MB
+            backupCount=5,
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(formatter)
+
+        # -------- Console (Optional but Enterprise-Useful) --------
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+
+        # -------- Queue Listener (Background Thread) --------
+        _listener = BoundedQueueListener(
+            log_queue,
+            info_handler,
+            error_handler,
+            console_handler,
+            respect_handler_level=True,
+        )
+        _listener.start()
+
+        _log_queue = log_queue
+        for logger in _loggers.values():
+            _apply_settings(logger)
 
 
-def _setup_async_logging():
+def shutdown_logging():
+    """
+    Drain the queue and stop the writer thread (application shutdown).
+    A later record configures logging again.
+    """
     global _log_queue, _listener
 
-    if _log_queue is not None:
-        return
-
-    _log_queue = queue.Queue(-1)
-
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-    )
-
-    # -------- INFO & WARNING HANDLER --------
-    info_handler = logging.handlers.RotatingFileHandler(
-        INFO_LOG_FILE,
-        maxBytes=10 * 1024 * 1024,  # 10 MB
-        backupCount=5,
-    )
-    info_handler.setLevel(logging.INFO)
-    info_handler.setFormatter(formatter)
-    info_handler.addFilter(lambda record: record.levelno < logging.ERROR)
-
-    # -------- ERROR & EXCEPTION HANDLER --------
-    error_handler = logging.handlers.RotatingFileHandler(
-        ERROR_LOG_FILE,
-        maxBytes=10 * 1024 * 1024,  # 10 MB
-        backupCount=5,
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(formatter)
-
-    # -------- Console (Optional but Enterprise-Useful) --------
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-
-    # -------- Queue Listener (Background Thread) --------
-    _listener = logging.handlers.QueueListener(
-        _log_queue,
-        info_handler,
-        error_handler,
-        console_handler,
-        respect_handler_level=True,
-    )
-    _listener.start()
+    with _configure_lock:
+        if _listener is None:
+            return
+
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+
+        _listener = None
+        _log_queue = None
+        for logger in _loggers.values():
+            for handler in logger.handlers:
+                if isinstance(handler, BoundedQueueHandler):
+                    handler.queue = None
+
+
+def _apply_settings(logger: logging.Logger):
+    logger.setLevel(_options["LOG_LEVEL"])
+
+    for existing in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+        logger.removeFilter(existing)
+    limits = _logger_limits(logger.name)
+    if limits is not None:
+        logger.addFilter(limits)
+
+    for handler in logger.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            handler.queue = _log_queue
+            handler.policy = _options["LOG_QUEUE_POLICY"]
+            handler.block_seconds = _options["LOG_QUEUE_BLOCK_SECONDS"]
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -71,18 +336,33 @@ def get_logger(name: str) -> logging.Logger:
     Enterprise async-safe logger.
     - INFO / WARNING → logs/info.log
     - ERROR / EXCEPTION → logs/error.log
+    - Bounded queue (LOG_QUEUE_SIZE / LOG_QUEUE_POLICY)
+    - Optional per-logger rate limits / sampling (LOG_RATE_LIMITS / LOG_SAMPLE_RATES)
+
+    Log with %-style arguments, not f-strings, so records that are
+    filtered out are never formatted.
+
+    Cheap at import time: settings are read and the writer thread started
+    by configure_logging().
     """
-    _setup_async_logging()
+    with _configure_lock:
+        logger = logging.getLogger(name)
 
-    logger = logging.getLogger(name)
+        if name not in _loggers:
+            _loggers[name] = logger
 
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
+            queue_handler = BoundedQueueHandler()
+            queue_handler.addFilter(RequestContextFilter())
+            logger.addHandler(queue_handler)
 
-        queue_handler = logging.handlers.QueueHandler(_log_queue)
-        logger.addHandler(queue_handler)
+            # Prevent duplicate logs
+            logger.propagate = False
 
-        # Prevent duplicate logs
-        logger.propagate = False
+            if _log_queue is not None:
+                _apply_settings(logger)
+            else:
+                # Let the first record through to configure logging;
+                # the configured level applies from then on
+                logger.setLevel(logging.DEBUG)
 
     return logger
@@ -35,14 +35,199 @@ RETRIEVAL_LATENCY = Histogram(
     "Vector retrieval latency",
 )
 
+# -------------------------
+# Embedding Sidecar Metrics
+# -------------------------
+EMBEDDING_SIDECAR_BATCH_TEXTS = Histogram(
+    "rag_embedding_sidecar_batch_texts",
+    "Texts per sidecar forward pass (merged across workers)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+EMBEDDING_SIDECAR_BATCH_REQUESTS = Histogram(
+    "rag_embedding_sidecar_batch_requests",
+    "Client requests merged into one sidecar forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+EMBEDDING_SIDECAR_FALLBACKS = Counter(
+    "rag_embedding_sidecar_fallbacks_total",
+    "Embedding calls served in-process because the sidecar was unavailable",
+)
+
+# -------------------------
+# Parse Cache Metrics
+# -------------------------
+PARSE_CACHE_HITS = Counter(
+    "rag_parse_cache_hits_total",
+    "Documents whose extracted text was served from the parse cache",
+)
+
+PARSE_CACHE_MISSES = Counter(
+    "rag_parse_cache_misses_total",
+    "Documents parsed because no (readable) cache entry existed",
+)
+
+PARSE_CACHE_EVICTIONS = Counter(
+    "rag_parse_cache_evictions_total",
+    "Parse cache entries evicted by size bounds",
+)
+
+PARSE_CACHE_ENTRIES = Gauge(
+    "rag_parse_cache_entries",
+    "Number of cached parsed documents",
+)
+
+PARSE_CACHE_BYTES = Gauge(
+    "rag_parse_cache_bytes",
+    "Compressed size of the parse cache on disk",
+)
+
+# -------------------------
+# Batch Retrieval Metrics
+# -------------------------
+RETRIEVAL_BATCH_QUERIES = Histogram(
+    "rag_retrieval_batch_queries",
+    "Queries per batch retrieval request",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+RETRIEVAL_BATCH_LATENCY = Histogram(
+    "rag_retrieval_batch_latency_seconds",
+    "Batch retrieval latency (embedding + all vector-store queries)",
+)
+
+# Kept out of rag_embedding_latency_seconds, which times single chat queries
+RETRIEVAL_BATCH_EMBEDDING_LATENCY = Histogram(
+    "rag_retrieval_batch_embedding_latency_seconds",
+    "Embedding latency for a whole batch retrieval request (one model pass)",
+)
+
+# -------------------------
+# Retrieval Cache Metrics
+# -------------------------
+RETRIEVAL_CACHE_HITS = Counter(
+    "rag_retrieval_cache_hits_total",
+    "Retrieval cache hits",
+)
+
+RETRIEVAL_CACHE_MISSES = Counter(
+    "rag_retrieval_cache_misses_total",
+    "Retrieval cache misses (including expired/invalidated entries)",
+)
+
+RETRIEVAL_CACHE_EVICTIONS = Counter(
+    "rag_retrieval_cache_evictions_total",
+    "Retrieval cache entries evicted by size bounds",
+)
+
+RETRIEVAL_CACHE_ENTRIES = Gauge(
+    "rag_retrieval_cache_entries",
+    "Number of cached retrieval results",
+)
+
+RETRIEVAL_CACHE_BYTES = Gauge(
+    "rag_retrieval_cache_bytes",
+    "Approximate memory held by cached retrieval results",
+)
+
 LLM_FIRST_TOKEN_LATENCY = Histogram(
     "rag_llm_first_token_latency_seconds",
     "Time to first token from LLM",
+    ["model"],
 )
 
 CHAT_TOTAL_LATENCY = Histogram(
     "rag_chat_total_latency_seconds",
     "End-to-end chat latency",
+    ["model"],
+)
+
+CHAT_STAGE_LATENCY = Histogram(
+    "rag_chat_stage_latency_seconds",
+    "Chat pipeline span latency (exemplar: trace_id)",
+    ["model", "stage"],
+)
+
+CHAT_PHASE_LATENCY = Histogram(
+    "rag_chat_phase_latency_seconds",
+    "Critical-path time per phase up to the first token "
+    "(mode=serial|pipelined)",
+    ["phase", "mode"],
+)
+
+# -------------------------
+# LLM Admission Control Metrics
+# -------------------------
+LLM_INFLIGHT_REQUESTS = Gauge(
+    "rag_llm_inflight_requests",
+    "Upstream LLM streams currently in flight",
+    ["model"],
+)
+
+LLM_QUEUED_REQUESTS = Gauge(
+    "rag_llm_queued_requests",
+    "Requests waiting for an upstream LLM slot",
+    ["model"],
+)
+
+LLM_REJECTED_REQUESTS = Counter(
+    "rag_llm_rejected_requests_total",
+    "Requests shed by LLM admission control",
+    ["model", "reason"],
+)
+
+# -------------------------
+# LLM Hedging Metrics
+# -------------------------
+LLM_HEDGES_TOTAL = Counter(
+    "rag_llm_hedges_total",
+    "Requests for which a hedged fallback stream was started",
+    ["model"],
+)
+
+LLM_HEDGE_OUTCOMES = Counter(
+    "rag_llm_hedge_outcomes_total",
+    "Which stream produced the first token (unhedged, primary, fallback)",
+    ["model", "outcome"],
+)
+
+LLM_HEDGED_FIRST_TOKEN_LATENCY = Histogram(
+    "rag_llm_hedged_first_token_latency_seconds",
+    "First-token latency of hedged requests, by winning stream",
+    ["model", "winner"],
+)
+
+# -------------------------
+# Deadline Metrics
+# -------------------------
+STAGE_TIMEOUTS_TOTAL = Counter(
+    "rag_stage_timeouts_total",
+    "Chat pipeline stages that exceeded their deadline budget",
+    ["stage"],
+)
+
+# -------------------------
+# Runtime Metrics
+# -------------------------
+EVENT_LOOP_LAG = Gauge(
+    "rag_event_loop_lag_seconds",
+    "Event loop wake-up delay measured by the background lag probe",
+)
+
+# -------------------------
+# Logging Metrics
+# -------------------------
+LOG_RECORDS_DROPPED = Counter(
+    "rag_log_records_dropped_total",
+    "Log records discarded because the log queue was full",
+    ["policy"],
+)
+
+LOG_RECORDS_SUPPRESSED = Counter(
+    "rag_log_records_suppressed_total",
+    "Log records suppressed by per-logger rate limiting or sampling",
+    ["logger", "reason"],
 )
 
 # -------------------------
@@ -53,3 +238,34 @@ RETRIEVED_CONTEXTS = Histogram(
     "Number of contexts retrieved",
     buckets=(0, 1, 2, 3, 5, 8, 13),
 )
+
+RETRIEVAL_CONTEXTS_SAVED = Counter(
+    "rag_retrieval_contexts_saved_total",
+    "Contexts dropped by score cutoffs/MMR relative to plain top-k",
+)
+
+RETRIEVAL_PROMPT_TOKENS_SAVED = Histogram(
+    "rag_retrieval_prompt_tokens_saved",
+    "Estimated prompt tokens saved per request by context selection",
+    buckets=(0, 64, 128, 256, 512, 1024, 2048, 4096),
+)
+
+# -------------------------
+# Chat Session Metrics
+# -------------------------
+CHAT_SESSION_RETRIEVALS_AVOIDED = Counter(
+    "rag_chat_session_retrievals_avoided_total",
+    "Follow-up queries answered from the session's previous retrieval",
+)
+
+CHAT_SESSION_RETRIEVALS_AVOIDED_PER_SESSION = Histogram(
+    "rag_chat_session_retrievals_avoided_per_session",
+    "Vector-store retrievals avoided per WebSocket session",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21),
+)
+
+CHAT_SESSION_CHUNKS = Counter(
+    "rag_chat_session_chunks_total",
+    "Chunks of session retrievals, reused from the session or newly loaded",
+    ["source"],
+)
@@ -0,0 +1,150 @@
+import asyncio
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from time import perf_counter, sleep
+
+from app.core.logger import get_logger
+from app.core.metrics import EVENT_LOOP_LAG
+
+logger = get_logger(__name__)
+
+
+class ProfilerBusyError(RuntimeError):
+    """
+    Raised when a profile is requested while another one is running.
+    """
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over every thread in the process
+    (event loop, to_thread workers, logging QueueListener, ...).
+
+    Samples `sys._current_frames()` from a dedicated thread, so it keeps
+    sampling while the event loop is blocked. Output is in collapsed-stack
+    format (`thread;outer;...;inner count`), ready for flamegraph.pl or
+    speedscope.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, seconds: float, interval: float = 0.005) -> dict:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def settle(method, value):
+            # The awaiting request may have been cancelled (client gone)
+            if not done.done():
+                method(value)
+
+        def run():
+            try:
+                result = self._sample(seconds, interval)
+                loop.call_soon_threadsafe(settle, done.set_result, result)
+            except BaseException as exc:
+                loop.call_soon_threadsafe(settle, done.set_exception, exc)
+            finally:
+                self._lock.release()
+
+        threading.Thread(target=run, name="sampling-profiler", daemon=True).start()
+        return await done
+
+    def _sample(self, seconds: float, interval: float) -> dict:
+        own = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        samples = 0
+
+        start = perf_counter()
+        while perf_counter() - start < seconds:
+            names = {t.ident: t.name for t in threading.enumerate()}
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stacks[self._collapse(names.get(ident, str(ident)), frame)] += 1
+
+            samples += 1
+            sleep(interval)
+
+        return {
+            "duration_seconds": perf_counter() - start,
+            "interval_seconds": interval,
+            "samples": samples,
+            "stacks": stacks,
+        }
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(
+                f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+
+        parts.append(thread_name)
+        return ";".join(reversed(parts))
+
+    @staticmethod
+    def collapsed(stacks: Counter) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in stacks.most_common()
+        ) + "\n"
+
+
+class EventLoopLagMonitor:
+    """
+    Background probe: sleeps `interval` on the event loop and reports
+    how late it wakes up (time the loop spent blocked on something else).
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reset_max(self) -> float:
+        peak, self.max = self.max, 0.0
+        return peak
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+
+            self.last = lag
+            self.max = max(self.max, lag)
+            EVENT_LOOP_LAG.set(lag)
+
+            if lag > 1.0:
+                logger.warning("Event loop blocked | lag=%.3fs", lag)
@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import secrets
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter, time
+
+from app.core.metrics import CHAT_STAGE_LATENCY
+
+_current_trace: ContextVar["Trace | None"] = ContextVar("current_trace", default=None)
+
+
+def new_request_id() -> str:
+    return secrets.token_hex(8)
+
+
+def current_trace() -> "Trace | None":
+    return _current_trace.get()
+
+
+def current_request_id() -> str | None:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Span on the active trace; no-op outside a traced request.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    with trace.span(name, **attrs) as s:
+        yield s
+
+
+class Span:
+    __slots__ = ("name", "offset", "duration", "attrs")
+
+    def __init__(self, name: str, offset: float, attrs: dict):
+        self.name = name
+        self.offset = offset
+        self.duration = 0.0
+        self.attrs = attrs
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "offset_ms": round(self.offset * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            **self.attrs,
+        }
+
+
+class Trace:
+    """
+    In-process trace of one chat request.
+
+    Every finished span is also observed on the per-model/per-stage
+    latency histogram with the request ID as exemplar.
+    """
+
+    def __init__(self, request_id: str, name: str = "chat", model: str = "unknown"):
+        self.request_id = request_id
+        self.name = name
+        self.model = model
+        self.status = "ok"
+        self.attrs: dict = {}
+        self.spans: list[Span] = []
+        self.started_at = time()
+        self.duration: float | None = None
+        self._start = perf_counter()
+
+    def elapsed(self) -> float:
+        return perf_counter() - self._start
+
+    def exemplar(self) -> dict:
+        return {"trace_id": self.request_id}
+
+    @contextmanager
+    def activate(self):
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        s = Span(name, self.elapsed(), attrs)
+        try:
+            yield s
+        finally:
+            s.duration = self.elapsed() - s.offset
+            self._add(s)
+
+    def record(self, name: str, start: float, seconds: float, **attrs):
+        """
+        Add a span measured elsewhere (`start` is a perf_counter value).
+        """
+        s = Span(name, start - self._start, attrs)
+        s.duration = seconds
+        self._add(s)
+
+    def finish(self, status: str | None = None) -> float:
+        if status is not None:
+            self.status = status
+        self.duration = self.elapsed()
+        return self.duration
+
+    def span_durations(self) -> dict[str, float]:
+        """
+        Total milliseconds per span name.
+        """
+        totals: dict[str, float] = {}
+        for s in self.spans:
+            totals[s.name] = totals.get(s.name, 0.0) + s.duration * 1000
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+    def to_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "name": self.name,
+            "model": self.model,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round((self.duration or self.elapsed()) * 1000, 3),
+            **self.attrs,
+            "spans": [
+                s.to_dict() for s in sorted(self.spans, key=lambda s: s.offset)
+            ],
+        }
+
+    def _add(self, s: Span):
+        self.spans.append(s)
+        CHAT_STAGE_LATENCY.labels(model=self.model, stage=s.name).observe(
+            s.duration, exemplar=self.exemplar()
+        )
+
+
+class SlowTraceBuffer:
+    """
+    Keeps the N slowest finished traces (min-heap on duration, so a new
+    trace only displaces the fastest one retained).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._heap: list[tuple[float, int, Trace]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def offer(self, trace: Trace):
+        if self.capacity <= 0 or trace.duration is None:
+            return
+
+        item = (trace.duration, next(self._seq), trace)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, item)
+        elif trace.duration > self._heap[0][0]:
+            heapq.heapreplace(self._heap, item)
+
+    def slowest(self, limit: int | None = None) -> list[dict]:
+        items = sorted(self._heap, key=lambda item: item[0], reverse=True)
+        return [trace.to_dict() for _, _, trace in items[:limit]]
+
+    def clear(self):
+        self._heap.clear()
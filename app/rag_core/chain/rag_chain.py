@@ -1,11 +1,18 @@
+from app.core.tracing import span
 from app.rag_core.prompt.prompt_builder import build_prompt
 
 class RAGChain:
     def __init__(self, llm_client):
         self.llm = llm_client
 
-    async def stream(self, query: str, contexts: list[str]):
-        prompt = build_prompt(query, contexts)
+    async def stream(
+        self,
+        query: str,
+        contexts: list[str],
+        history: list[tuple[str, str]] | None = None,
+    ):
+        with span("prompt_build", contexts=len(contexts), turns=len(history or ())):
+            prompt = build_prompt(query, contexts, history)
 
         async for token in self.llm.stream(prompt):
             yield token
@@ -1,7 +1,13 @@
 import asyncio
-from typing import List
-from sentence_transformers import SentenceTransformer
-import torch
+from pathlib import Path
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+# torch / sentence_transformers are imported when an embedder is built,
+# so importing the app does not pay for them
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 class AsyncSentenceEmbedder:
@@ -20,23 +26,57 @@ class AsyncSentenceEmbedder:
         model_name: str = "all-MiniLM-L6-v2",
         device: str | None = None,
         normalize_embeddings: bool = True,
+        batch_size: int = 32,
+        backend: str = "torch",
+        quantize: bool = False,
+        quantization_config: str = "avx512_vnni",
+        onnx_dir: str | Path = "data/onnx",
+        num_threads: int | None = None,
+        dtype: str = "float32",
     ):
         """
         :param model_name: SentenceTransformer model name
         :param device: 'cuda', 'cpu', or None (auto-detect)
         :param normalize_embeddings: cosine-similarity friendly vectors
+        :param batch_size: texts per forward pass during ingestion
+        :param backend: 'torch' or 'onnx' (ONNX Runtime, CPU)
+        :param quantize: use a dynamic int8-quantized ONNX model
+        :param quantization_config: 'arm64', 'avx2', 'avx512' or 'avx512_vnni'
+        :param onnx_dir: where exported ONNX models are cached
+        :param num_threads: intra-op threads (None: library default)
+        :param dtype: 'float32' or 'float16' for embed_array (ingestion)
+            results; query embeddings are always float32
         """
 
-        if device is None:
+        if backend == "onnx":
+            device = "cpu"
+        elif device is None:
+            import torch
+
             device = "cuda" if torch.cuda.is_available() else "cpu"
 
         self.device = device
         self.normalize_embeddings = normalize_embeddings
+        self.batch_size = batch_size
+        self.backend = backend
+        self.dtype = np.dtype(dtype)
 
-        self.model = SentenceTransformer(
-            model_name,
-            device=self.device,
-        )
+        if backend == "onnx":
+            self.model = self._load_onnx(
+                model_name, quantize, quantization_config, Path(onnx_dir), num_threads
+            )
+        elif backend == "torch":
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            if num_threads:
+                torch.set_num_threads(num_threads)
+            self.model = SentenceTransformer(
+                model_name,
+                device=self.device,
+            )
+        else:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
 
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """
@@ -44,6 +84,20 @@ class AsyncSentenceEmbedder:
         """
         return await asyncio.to_thread(self._embed_sync, texts)
 
+    async def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed multiple texts (used during ingestion) as one contiguous
+        (len(texts), dimension) array of `dtype`, without per-float
+        Python objects.
+        """
+        return await asyncio.to_thread(self._encode, texts, self.dtype)
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed a batch of queries as one float32 array (used during retrieval).
+        """
+        return await asyncio.to_thread(self._encode, queries)
+
     async def embed_query(self, query: str) -> List[float]:
         """
         Embed a single query (used during retrieval).
@@ -57,13 +111,75 @@ class AsyncSentenceEmbedder:
         Runs in a worker thread to protect event loop.
         """
 
+        # Convert numpy arrays to plain Python lists
+        return self._encode(texts).tolist()
+
+    def _encode(self, texts: List[str], dtype=np.float32) -> np.ndarray:
+        """
+        `dtype` matrix of shape (len(texts), dimension).
+        """
         vectors = self.model.encode(
             texts,
-            batch_size=32,
+            batch_size=self.batch_size,
             show_progress_bar=False,
             convert_to_numpy=True,
             normalize_embeddings=self.normalize_embeddings,
         )
+        return vectors.astype(dtype, copy=False)
 
-        # Convert numpy arrays to plain Python lists
-        return vectors.tolist()
+    @staticmethod
+    def _load_onnx(
+        model_name: str,
+        quantize: bool,
+        quantization_config: str,
+        onnx_dir: Path,
+        num_threads: int | None,
+    ) -> "SentenceTransformer":
+        """
+        Export the model to ONNX once (optionally with a dynamic int8
+        copy) under `onnx_dir`, then load it on ONNX Runtime.
+        """
+        try:
+            import onnxruntime as ort
+            from sentence_transformers import (
+                SentenceTransformer,
+                export_dynamic_quantized_onnx_model,
+            )
+        except ImportError as exc:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=onnx requires: pip install 'sentence-transformers[onnx]'"
+            ) from exc
+
+        export_dir = onnx_dir / model_name.replace("/", "__")
+        file_name = (
+            f"onnx/model_qint8_{quantization_config}.onnx" if quantize
+            else "onnx/model.onnx"
+        )
+
+        if not (export_dir / "onnx" / "model.onnx").exists():
+            SentenceTransformer(model_name, device="cpu", backend="onnx").save_pretrained(
+                str(export_dir)
+            )
+
+        if quantize and not (export_dir / file_name).exists():
+            export_dynamic_quantized_onnx_model(
+                SentenceTransformer(str(export_dir), device="cpu", backend="onnx"),
+                quantization_config=quantization_config,
+                model_name_or_path=str(export_dir),
+            )
+
+        session_options = ort.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+            session_options.inter_op_num_threads = 1
+
+        return SentenceTransformer(
+            str(export_dir),
+            device="cpu",
+            backend="onnx",
+            model_kwargs={
+                "file_name": file_name,
+                "provider": "CPUExecutionProvider",
+                "session_options": session_options,
+            },
+        )
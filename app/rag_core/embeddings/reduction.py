@@ -0,0 +1,279 @@
+"""
+Reduced-dimension vectors for the index.
+
+- pca: projection onto the top principal directions of a corpus sample.
+  Fitted on the uncentered second moment, so projected dot products
+  approximate the original ones (what cosine retrieval ranks on).
+- truncate: the leading dimensions, for Matryoshka-trained models.
+
+Either way projected vectors are re-normalized. The projection is saved
+to EMBEDDING_REDUCTION_PATH and loaded at startup, so ingestion and
+queries always use the same one.
+
+    python -m app.rag_core.embeddings.reduction --method pca --dimension 128 --docs data/raw
+    python -m app.rag_core.embeddings.reduction --method pca --dimension 128 \\
+        --chunk-store data/chunks.sqlite3 --sample 20000
+    python -m app.rag_core.embeddings.reduction --method truncate --dimension 128
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorReducer:
+    """
+    Maps full embeddings (source_dimension) to stored vectors (dimension).
+    """
+
+    def __init__(
+        self,
+        method: str,
+        dimension: int,
+        source_dimension: int,
+        components: np.ndarray | None = None,
+        model_name: str = "",
+        explained_variance: float | None = None,
+    ):
+        if method not in ("pca", "truncate"):
+            raise ValueError(f"Unsupported reduction method: {method}")
+        if not 0 < dimension <= source_dimension:
+            raise ValueError(
+                f"Reduced dimension must be in 1..{source_dimension}, got {dimension}"
+            )
+        if method == "pca" and (components is None or components.shape != (dimension, source_dimension)):
+            raise ValueError("PCA reduction needs (dimension, source_dimension) components")
+
+        self.method = method
+        self.dimension = dimension
+        self.source_dimension = source_dimension
+        self.components = None if components is None else components.astype(np.float32)
+        self.model_name = model_name
+        self.explained_variance = explained_variance
+
+    @classmethod
+    def fit_pca(cls, vectors: np.ndarray, dimension: int, model_name: str = "") -> "VectorReducer":
+        """
+        :param vectors: (n, source_dimension) sample of corpus embeddings
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if len(vectors) < dimension:
+            raise ValueError(
+                f"Need at least {dimension} sample vectors to fit PCA, got {len(vectors)}"
+            )
+
+        second_moment = vectors.T @ vectors / len(vectors)
+        eigenvalues, eigenvectors = np.linalg.eigh(second_moment)
+        order = np.argsort(eigenvalues)[::-1][:dimension]
+
+        return cls(
+            "pca",
+            dimension,
+            vectors.shape[1],
+            components=eigenvectors[:, order].T,
+            model_name=model_name,
+            explained_variance=float(eigenvalues[order].sum() / eigenvalues.sum()),
+        )
+
+    @classmethod
+    def truncation(cls, source_dimension: int, dimension: int, model_name: str = "") -> "VectorReducer":
+        return cls("truncate", dimension, source_dimension, model_name=model_name)
+
+    def transform(self, vectors) -> np.ndarray:
+        """
+        Project (n, source_dimension) or (source_dimension,) vectors.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.method == "pca":
+            reduced = vectors @ self.components.T
+        else:
+            reduced = vectors[..., : self.dimension]
+        return _normalize(reduced).astype(np.float32, copy=False)
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            "method": np.array(self.method),
+            "dimension": np.array(self.dimension),
+            "source_dimension": np.array(self.source_dimension),
+            "model_name": np.array(self.model_name),
+        }
+        if self.components is not None:
+            arrays["components"] = self.components
+        if self.explained_variance is not None:
+            arrays["explained_variance"] = np.array(self.explained_variance)
+
+        # Written next to the target and renamed, so workers never load a partial file
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "VectorReducer":
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(
+                str(data["method"]),
+                int(data["dimension"]),
+                int(data["source_dimension"]),
+                components=data["components"] if "components" in data else None,
+                model_name=str(data["model_name"]),
+                explained_variance=(
+                    float(data["explained_variance"]) if "explained_variance" in data else None
+                ),
+            )
+
+
+def load_reducer(
+    method: str,
+    path: str | Path,
+    dimension: int,
+    source_dimension: int,
+    model_name: str,
+) -> VectorReducer | None:
+    """
+    The configured reducer (None for method "none"), checked against the
+    current model and dimensions. A truncation is created on first use;
+    a PCA projection must have been fitted.
+    """
+    if method == "none":
+        return None
+
+    path = Path(path)
+    if not path.exists():
+        if method == "pca":
+            raise RuntimeError(
+                f"No PCA projection at {path}. Fit one with: "
+                "python -m app.rag_core.embeddings.reduction --method pca "
+                f"--dimension {dimension} --docs <dir>"
+            )
+        VectorReducer.truncation(source_dimension, dimension, model_name).save(path)
+
+    reducer = VectorReducer.load(path)
+    expected = (method, dimension, source_dimension, model_name)
+    found = (reducer.method, reducer.dimension, reducer.source_dimension, reducer.model_name)
+    if found != expected:
+        raise RuntimeError(
+            f"Projection at {path} is {found}, settings expect {expected}"
+        )
+
+    logger.info(
+        "Vector reduction loaded | method=%s | dimension=%d->%d | explained_variance=%s",
+        reducer.method,
+        reducer.source_dimension,
+        reducer.dimension,
+        reducer.explained_variance,
+    )
+    return reducer
+
+
+# -------------------------
+# Fitting (CLI)
+# -------------------------
+
+
+async def _sample_texts(args) -> list[str]:
+    if args.chunk_store:
+        from app.rag_core.vectorstore.chunk_store import SQLiteChunkStore
+
+        store = SQLiteChunkStore(args.chunk_store)
+        store.open()
+        try:
+            return await store.sample_texts(args.sample)
+        finally:
+            store.close()
+
+    from app.core.config import settings
+    from app.rag_core.ingestion.chunker import AsyncSentenceChunker
+    from app.rag_core.ingestion.loader import AsyncDocumentLoader
+
+    loader = AsyncDocumentLoader()
+    chunker = AsyncSentenceChunker(
+        model_name=settings.EMBEDDING_MODEL,
+        max_tokens=settings.CHUNK_SIZE,
+        overlap_tokens=settings.CHUNK_OVERLAP,
+    )
+
+    texts = []
+    for file_path in sorted(Path(args.docs).iterdir()):
+        if file_path.suffix.lower() in (".pdf", ".docx"):
+            chunks = await chunker.split(await loader.load(file_path))
+            texts.extend(chunks.texts)
+
+    rng = np.random.default_rng(0)
+    if len(texts) > args.sample:
+        texts = [texts[i] for i in rng.choice(len(texts), args.sample, replace=False)]
+    return texts
+
+
+async def _fit(args) -> VectorReducer:
+    from app.core.config import settings
+
+    if args.method == "truncate":
+        return VectorReducer.truncation(
+            settings.EMBEDDING_DIMENSION, args.dimension, settings.EMBEDDING_MODEL
+        )
+
+    if not (args.docs or args.chunk_store):
+        raise SystemExit("--docs or --chunk-store is required for --method pca")
+
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+
+    texts = await _sample_texts(args)
+    embedder = AsyncSentenceEmbedder(
+        model_name=settings.EMBEDDING_MODEL,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+    )
+    vectors = await embedder.embed_array(texts)
+
+    return VectorReducer.fit_pca(vectors, args.dimension, settings.EMBEDDING_MODEL)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--method", choices=["pca", "truncate"], default="pca")
+    parser.add_argument("--dimension", type=int, required=True)
+    parser.add_argument("--docs", help="directory of .pdf/.docx files to sample chunks from")
+    parser.add_argument("--chunk-store", help="sample already-ingested chunk texts instead")
+    parser.add_argument("--sample", type=int, default=20000, help="max chunks to fit on")
+    parser.add_argument("--out", help="default: EMBEDDING_REDUCTION_PATH")
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+
+    reducer = asyncio.run(_fit(args))
+    path = reducer.save(args.out or settings.EMBEDDING_REDUCTION_PATH)
+
+    print(
+        f"Saved {reducer.method} projection {reducer.source_dimension}->{reducer.dimension} "
+        f"to {path}"
+        + (
+            f" (explained variance {reducer.explained_variance:.3f})"
+            if reducer.explained_variance is not None else ""
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
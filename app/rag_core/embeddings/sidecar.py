@@ -0,0 +1,507 @@
+"""
+Embedding sidecar: one process owns the model and serves every uvicorn
+worker over a local Unix socket, merging concurrent requests from all
+workers into shared forward passes.
+
+    python -m app.rag_core.embeddings.sidecar --socket /run/rag/embedding.sock
+
+Workers connect with EMBEDDING_SIDECAR_SOCKET set; see SidecarEmbedder.
+
+Wire format (little-endian, every frame prefixed with its u32 length):
+
+    request:  u32 request_id, u32 count, u32 byte_length * count, utf-8 texts
+    response: u32 request_id, u8 status, u32 rows, u32 dim, float32 * rows * dim
+              (status 1: the body is a utf-8 error message)
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import struct
+from contextlib import suppress
+from pathlib import Path
+from time import monotonic
+from typing import Callable, List
+
+import numpy as np
+
+from app.core.logger import get_logger
+from app.core.metrics import (
+    EMBEDDING_SIDECAR_BATCH_REQUESTS,
+    EMBEDDING_SIDECAR_BATCH_TEXTS,
+    EMBEDDING_SIDECAR_FALLBACKS,
+)
+
+logger = get_logger(__name__)
+
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+_U32 = struct.Struct("<I")
+_REQUEST_HEADER = struct.Struct("<II")
+_RESPONSE_HEADER = struct.Struct("<IBII")
+
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+
+
+class EmbeddingSidecarError(RuntimeError):
+    """
+    The sidecar received the request but could not embed it.
+    """
+
+
+# -------------------------
+# Framing
+# -------------------------
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _U32.unpack(await reader.readexactly(_U32.size))
+    if length > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Embedding sidecar frame too large: {length} bytes")
+    return await reader.readexactly(length)
+
+
+def _frame(body: bytes) -> bytes:
+    return _U32.pack(len(body)) + body
+
+
+def encode_request(request_id: int, texts: List[str]) -> bytes:
+    encoded = [text.encode("utf-8") for text in texts]
+    return _frame(
+        _REQUEST_HEADER.pack(request_id, len(encoded))
+        + struct.pack(f"<{len(encoded)}I", *(len(e) for e in encoded))
+        + b"".join(encoded)
+    )
+
+
+def decode_request(frame: bytes) -> tuple[int, List[str]]:
+    request_id, count = _REQUEST_HEADER.unpack_from(frame)
+    lengths = struct.unpack_from(f"<{count}I", frame, _REQUEST_HEADER.size)
+
+    texts = []
+    offset = _REQUEST_HEADER.size + _U32.size * count
+    for length in lengths:
+        texts.append(frame[offset : offset + length].decode("utf-8"))
+        offset += length
+
+    return request_id, texts
+
+
+def encode_response(request_id: int, vectors: np.ndarray) -> bytes:
+    data = np.ascontiguousarray(vectors, dtype="<f4")
+    rows, dim = data.shape
+    return _frame(_RESPONSE_HEADER.pack(request_id, _STATUS_OK, rows, dim) + data.tobytes())
+
+
+def encode_error(request_id: int, message: str) -> bytes:
+    return _frame(
+        _RESPONSE_HEADER.pack(request_id, _STATUS_ERROR, 0, 0) + message.encode("utf-8")
+    )
+
+
+def decode_response(frame: bytes) -> tuple[int, np.ndarray | EmbeddingSidecarError]:
+    request_id, status, rows, dim = _RESPONSE_HEADER.unpack_from(frame)
+
+    if status != _STATUS_OK:
+        message = frame[_RESPONSE_HEADER.size :].decode("utf-8", errors="replace")
+        return request_id, EmbeddingSidecarError(message)
+
+    vectors = np.frombuffer(
+        frame, dtype="<f4", count=rows * dim, offset=_RESPONSE_HEADER.size
+    )
+    return request_id, vectors.reshape(rows, dim)
+
+
+# -------------------------
+# Server
+# -------------------------
+
+
+class EmbeddingSidecarServer:
+    """
+    Serves an in-process embedder on a Unix socket.
+
+    Requests from all connections share one queue. The batcher takes
+    whatever is queued (waiting up to `max_wait_seconds` for more, until
+    `max_batch` texts) and runs a single forward pass; requests that
+    arrive meanwhile form the next batch.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        path: str | Path,
+        max_batch: int = 64,
+        max_wait_seconds: float = 0.002,
+    ):
+        self.embedder = embedder
+        self.path = Path(path)
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._server: asyncio.AbstractServer | None = None
+        self._batcher: asyncio.Task | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Stale socket from a previous run
+        with suppress(FileNotFoundError):
+            self.path.unlink()
+
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        os.chmod(self.path, 0o600)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+        logger.info("Embedding sidecar listening on %s", self.path)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._batcher
+            self._batcher = None
+
+        # Clients see the connection drop and fall back
+        for writer in list(self._connections):
+            writer.close()
+
+        with suppress(FileNotFoundError):
+            self.path.unlink()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        write_lock = asyncio.Lock()
+        responders: set[asyncio.Task] = set()
+        self._connections.add(writer)
+
+        try:
+            while True:
+                request_id, texts = decode_request(await read_frame(reader))
+
+                future = loop.create_future()
+                await self._queue.put((texts, future))
+
+                # Responses go out as soon as ready, not in request order
+                task = asyncio.create_task(
+                    self._respond(writer, write_lock, request_id, future)
+                )
+                responders.add(task)
+                task.add_done_callback(responders.discard)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            logger.exception("Embedding sidecar connection failed")
+        finally:
+            for task in responders:
+                task.cancel()
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, write_lock: asyncio.Lock, request_id: int, future: asyncio.Future):
+        try:
+            frame = encode_response(request_id, await future)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            frame = encode_error(request_id, f"{type(exc).__name__}: {exc}")
+
+        with suppress(ConnectionError):
+            async with write_lock:
+                writer.write(frame)
+                await writer.drain()
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait_seconds
+
+            while size < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                batch.append(item)
+                size += len(item[0])
+
+            # Clients that disconnected while queued
+            batch = [(texts, future) for texts, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            EMBEDDING_SIDECAR_BATCH_TEXTS.observe(len(texts))
+            EMBEDDING_SIDECAR_BATCH_REQUESTS.observe(len(batch))
+
+            try:
+                # Full precision on the wire; clients cast ingestion arrays
+                vectors = await self.embedder.embed_queries(texts)
+            except Exception as exc:
+                logger.exception("Embedding sidecar batch of %d texts failed", len(texts))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset : offset + len(request_texts)])
+                offset += len(request_texts)
+
+
+# -------------------------
+# Client
+# -------------------------
+
+
+class SidecarEmbedder:
+    """
+    AsyncSentenceEmbedder-compatible client of the embedding sidecar.
+
+    Each worker keeps one connection; concurrent requests are pipelined
+    on it and matched to responses by id. While the sidecar is
+    unreachable, calls go to an in-process embedder built by `fallback`
+    on first need (and the sidecar is retried after `retry_seconds`).
+    Without a fallback, connection errors propagate.
+
+    The sidecar answers in float32; embed_array results are cast to
+    `dtype` like the in-process embedder's.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fallback: Callable[[], object] | None = None,
+        connect_timeout_seconds: float = 2.0,
+        retry_seconds: float = 5.0,
+        dtype: str = "float32",
+    ):
+        self.path = str(path)
+        self.dtype = np.dtype(dtype)
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.retry_seconds = retry_seconds
+
+        self._fallback_factory = fallback
+        self._fallback = None
+        self._fallback_lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def start(self):
+        """
+        Connect eagerly; failure is logged, not raised, when a fallback exists.
+        """
+        try:
+            await self.connect()
+        except (OSError, asyncio.TimeoutError) as exc:
+            if self._fallback_factory is None:
+                raise
+            logger.warning(
+                "Embedding sidecar at %s unavailable at startup (%s)", self.path, exc
+            )
+
+    async def connect(self):
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.path),
+                self.connect_timeout_seconds,
+            )
+            self._writer = writer
+            self._read_task = asyncio.create_task(self._read_loop(reader, writer))
+
+            logger.info("Connected to embedding sidecar at %s", self.path)
+
+    async def aclose(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._read_task
+            self._read_task = None
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed multiple texts (used during ingestion).
+        """
+        return (await self._embed(texts)).tolist()
+
+    async def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed multiple texts (used during ingestion) as one `dtype` array
+        (for float32, a read-only view of the response).
+        """
+        return (await self._embed(texts, ingestion=True)).astype(self.dtype, copy=False)
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed a batch of queries as one float32 array (used during retrieval).
+        """
+        return await self._embed(queries)
+
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a single query (used during retrieval).
+        """
+        return (await self._embed([query]))[0].tolist()
+
+    async def _embed(self, texts: List[str], ingestion: bool = False) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if self._fallback_factory is None:
+            return await self._request(texts)
+
+        if monotonic() >= self._retry_at:
+            try:
+                return await self._request(texts)
+            except (OSError, asyncio.TimeoutError) as exc:
+                self._retry_at = monotonic() + self.retry_seconds
+                logger.warning(
+                    "Embedding sidecar at %s unavailable (%s); embedding in-process for %.0fs",
+                    self.path, exc, self.retry_seconds,
+                )
+
+        EMBEDDING_SIDECAR_FALLBACKS.inc()
+        fallback = await self._get_fallback()
+        if ingestion:
+            return await fallback.embed_array(texts)
+        return await fallback.embed_queries(texts)
+
+    async def _get_fallback(self):
+        async with self._fallback_lock:
+            if self._fallback is None:
+                # Model loading blocks for seconds
+                self._fallback = await asyncio.to_thread(self._fallback_factory)
+        return self._fallback
+
+    async def _request(self, texts: List[str]) -> np.ndarray:
+        await self.connect()
+
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            async with self._write_lock:
+                self._writer.write(encode_request(request_id, texts))
+                await self._writer.drain()
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        error: Exception = ConnectionError("Embedding sidecar connection closed")
+
+        try:
+            while True:
+                request_id, result = decode_response(await read_frame(reader))
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            error = ConnectionError(f"Embedding sidecar connection lost: {exc}")
+            logger.warning("Embedding sidecar connection to %s lost", self.path)
+
+        finally:
+            if self._writer is writer:
+                self._writer = None
+            writer.close()
+
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+
+# -------------------------
+# Entry point
+# -------------------------
+
+
+def main(argv=None):
+    from app.core.config import settings
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--socket", default=settings.EMBEDDING_SIDECAR_SOCKET)
+    parser.add_argument("--max-batch", type=int, default=settings.EMBEDDING_SIDECAR_MAX_BATCH)
+    parser.add_argument(
+        "--max-wait-ms", type=float, default=settings.EMBEDDING_SIDECAR_MAX_WAIT_MS
+    )
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args(argv)
+
+    if not args.socket:
+        parser.error("--socket is required when EMBEDDING_SIDECAR_SOCKET is unset")
+
+    if args.metrics_port:
+        from prometheus_client import start_http_server
+
+        start_http_server(args.metrics_port)
+
+    embedder = AsyncSentenceEmbedder(
+        model_name=settings.EMBEDDING_MODEL,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        backend=settings.EMBEDDING_BACKEND,
+        quantize=settings.EMBEDDING_ONNX_QUANTIZE,
+        quantization_config=settings.EMBEDDING_ONNX_QUANTIZATION_CONFIG,
+        onnx_dir=settings.EMBEDDING_ONNX_DIR,
+        num_threads=settings.EMBEDDING_NUM_THREADS,
+    )
+    server = EmbeddingSidecarServer(
+        embedder,
+        args.socket,
+        max_batch=args.max_batch,
+        max_wait_seconds=args.max_wait_ms / 1000,
+    )
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
-from sentence_transformers import SentenceTransformer
-import torch
+from pathlib import Path
 
 
 class SentenceTokenizerProvider:
     """
     Lightweight tokenizer provider without embedding overhead.
+
+    Loads only the tokenizer files, never the model weights, so chunking
+    does not hold a second model copy per worker.
     """
 
     _tokenizer = None
@@ -12,11 +14,11 @@ class SentenceTokenizerProvider:
     @classmethod
     def get_tokenizer(cls, model_name: str = "all-MiniLM-L6-v2"):
         if cls._tokenizer is None:
-            # load model ONCE, CPU is enough for tokenizer
-            model = SentenceTransformer(
-                model_name,
-                device="cpu",
-            )
-            cls._tokenizer = model.tokenizer
+            from transformers import AutoTokenizer
+
+            # Bare SentenceTransformer names live under the sentence-transformers org
+            if "/" not in model_name and not Path(model_name).exists():
+                model_name = f"sentence-transformers/{model_name}"
+            cls._tokenizer = AutoTokenizer.from_pretrained(model_name)
 
         return cls._tokenizer
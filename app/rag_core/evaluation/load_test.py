@@ -0,0 +1,372 @@
+"""
+Offline end-to-end load test.
+
+Boots the API (uvicorn subprocess) against local stand-ins for Pinecone
+and the NVIDIA endpoint, drives N concurrent WebSocket clients replaying
+a query file and reports throughput plus p50/p95/p99 for embedding,
+retrieval, first token and total latency.
+
+    python -m app.rag_core.evaluation.load_test --concurrency 16 --requests 500
+    python -m app.rag_core.evaluation.load_test --baseline data/benchmarks/load_test.json
+
+Query files hold one query per line, or JSON lines with a "query" key
+(and optional "namespace", "model", "rag_access_level").
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+
+from app.rag_core.evaluation.stand_ins import (
+    serve_llm,
+    serve_vector_store,
+    start_process,
+    wait_for_port,
+)
+from app.rag_core.evaluation.stats import summarize
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+STAGES = ("embedding", "retrieval", "first_token", "total")
+
+# Server span name -> reported stage
+_SERVER_STAGES = {"embed": "embedding", "retrieve": "retrieval"}
+
+DEFAULT_QUERIES = [
+    "What is the company leave policy?",
+    "How do I request access to the internal wiki?",
+    "Summarize the quarterly security report.",
+    "Which benefits are available to new employees?",
+    "What is the escalation path for customer incidents?",
+    "How are expense reports approved?",
+    "Describe the data retention requirements.",
+    "Who owns the platform on-call rotation?",
+]
+
+# Required settings the app never uses against the stand-ins
+_APP_ENV = {
+    "PINECONE_API_KEY": "load-test",
+    "OPENAI_API_KEY": "load-test",
+    "NVIDIA_API_KEY": "load-test",
+}
+
+
+def load_queries(path: str | None) -> list[dict]:
+    if path is None:
+        return [{"query": q} for q in DEFAULT_QUERIES]
+
+    queries = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        queries.append(json.loads(line) if line.startswith("{") else {"query": line})
+
+    if not queries:
+        raise ValueError(f"No queries in {path}")
+    return queries
+
+
+# -------------------------
+# Clients
+# -------------------------
+
+
+async def _one_request(ws, payload: dict) -> dict:
+    record = {"status": "ok", "tokens": 0}
+    start = perf_counter()
+
+    await ws.send(json.dumps({"event_type": "chat_request", "payload": payload}))
+
+    while True:
+        event = json.loads(await ws.recv())
+        event_type = event.get("event_type")
+
+        if event_type == "chat_stream":
+            if record["tokens"] == 0:
+                record["first_token"] = perf_counter() - start
+            record["tokens"] += 1
+
+        elif event_type == "chat_complete":
+            for span, stage in _SERVER_STAGES.items():
+                if span in event.get("timings_ms", {}):
+                    record[stage] = event["timings_ms"][span] / 1000
+            break
+
+        elif event_type == "timeout" and event.get("degraded"):
+            record["degraded"] = True
+
+        else:
+            record["status"] = event.get("code") or event_type
+            break
+
+    record["total"] = perf_counter() - start
+    return record
+
+
+async def _client(url: str, jobs, records: list, defaults: dict):
+    import websockets
+
+    async with websockets.connect(url, max_size=None) as ws:
+        for query in jobs:
+            payload = {**defaults, **query, "include_timings": True}
+            try:
+                records.append(await _one_request(ws, payload))
+            except websockets.ConnectionClosed:
+                records.append({"status": "connection_closed"})
+                return
+
+
+async def drive(
+    url: str,
+    queries: list[dict],
+    concurrency: int,
+    requests: int,
+    defaults: dict | None = None,
+) -> tuple[list[dict], float]:
+    """
+    Run `requests` chat requests over `concurrency` WebSocket clients
+    (queries replayed round-robin). Returns records and wall seconds.
+    """
+    # Shared iterator: each client pulls the next query when it is free
+    jobs = itertools.islice(itertools.cycle(queries), requests)
+    records: list[dict] = []
+
+    start = perf_counter()
+    await asyncio.gather(*(
+        _client(url, jobs, records, defaults or {})
+        for _ in range(concurrency)
+    ))
+    return records, perf_counter() - start
+
+
+# -------------------------
+# Reporting
+# -------------------------
+
+
+def build_report(records: list[dict], wall_seconds: float, config: dict) -> dict:
+    ok = [r for r in records if r["status"] == "ok"]
+
+    errors: dict[str, int] = {}
+    for r in records:
+        if r["status"] != "ok":
+            errors[r["status"]] = errors.get(r["status"], 0) + 1
+
+    return {
+        "config": config,
+        "requests": len(records),
+        "succeeded": len(ok),
+        "degraded": sum(1 for r in ok if r.get("degraded")),
+        "errors": errors,
+        "wall_seconds": wall_seconds,
+        "throughput_rps": len(ok) / wall_seconds if wall_seconds else 0.0,
+        "tokens_per_second": sum(r["tokens"] for r in ok) / wall_seconds if wall_seconds else 0.0,
+        "latency": {
+            stage: summarize([r[stage] for r in ok if stage in r])
+            for stage in STAGES
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.10) -> list[str]:
+    """
+    Regressions of `report` against `baseline`: any stage p50/p95/p99
+    more than `threshold` slower, or throughput more than `threshold` lower.
+    """
+    regressions = []
+
+    for stage in STAGES:
+        current = report["latency"].get(stage, {})
+        previous = baseline.get("latency", {}).get(stage, {})
+        for key in ("p50", "p95", "p99"):
+            if key in current and previous.get(key):
+                change = current[key] / previous[key] - 1
+                if change > threshold:
+                    regressions.append(
+                        f"{stage} {key}: {previous[key] * 1000:.1f}ms -> "
+                        f"{current[key] * 1000:.1f}ms (+{change:.0%})"
+                    )
+
+    if baseline.get("throughput_rps"):
+        change = report["throughput_rps"] / baseline["throughput_rps"] - 1
+        if change < -threshold:
+            regressions.append(
+                f"throughput: {baseline['throughput_rps']:.2f} -> "
+                f"{report['throughput_rps']:.2f} req/s ({change:.0%})"
+            )
+
+    return regressions
+
+
+def print_report(report: dict):
+    print(
+        f"requests={report['requests']} ok={report['succeeded']} "
+        f"degraded={report['degraded']} errors={report['errors']}"
+    )
+    print(
+        f"throughput={report['throughput_rps']:.2f} req/s "
+        f"tokens={report['tokens_per_second']:.1f}/s "
+        f"wall={report['wall_seconds']:.1f}s"
+    )
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, summary in report["latency"].items():
+        if not summary.get("count"):
+            continue
+        print(
+            f"{stage:<12}"
+            + "".join(f"{summary[k] * 1000:>10.1f}" for k in ("p50", "p95", "p99", "max"))
+        )
+
+
+# -------------------------
+# Environment
+# -------------------------
+
+
+@contextmanager
+def boot(args):
+    """
+    Start the stand-ins and the API; yield the WebSocket URL.
+    """
+    host = args.host
+    processes = [
+        start_process(
+            serve_vector_store,
+            host=host,
+            port=args.vector_port,
+            latency_seconds=args.vector_latency_ms / 1000,
+            seed_namespaces={args.namespace: args.vectors},
+        ),
+        start_process(
+            serve_llm,
+            host=host,
+            port=args.llm_port,
+            tokens_per_second=args.token_rate,
+            first_token_delay_seconds=args.first_token_ms / 1000,
+            answer_tokens=args.answer_tokens,
+        ),
+    ]
+
+    env = {
+        **_APP_ENV,
+        **os.environ,
+        "PINECONE_INDEX_HOST": f"http://{host}:{args.vector_port}",
+        "NVIDIA_BASE_URL": f"http://{host}:{args.llm_port}",
+        "NVIDIA_MODELS": args.model,
+        "NVIDIA_DEFAULT_MODEL": args.model,
+        "NAME_SPACE": args.namespace,
+    }
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+
+    app = None
+    try:
+        wait_for_port(host, args.vector_port)
+        wait_for_port(host, args.llm_port)
+
+        app = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", host,
+                "--port", str(args.app_port),
+                "--workers", str(args.workers),
+                "--log-level", "warning",
+            ],
+            cwd=BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        # Model loading dominates startup
+        wait_for_port(host, args.app_port, timeout=args.startup_timeout)
+
+        yield f"ws://{host}:{args.app_port}/api/v1/ws/chat"
+
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=30)
+        for process in processes:
+            process.terminate()
+
+
+async def run(args) -> dict:
+    queries = load_queries(args.queries)
+    defaults = {"model": args.model, "rag_access_level": args.access_level}
+
+    with boot(args) as url:
+        if args.warmup:
+            await drive(url, queries, min(args.concurrency, args.warmup), args.warmup, defaults)
+
+        records, wall = await drive(url, queries, args.concurrency, args.requests, defaults)
+
+    config = {
+        key: value for key, value in vars(args).items()
+        if key not in ("baseline", "out")
+    }
+    return build_report(records, wall, config)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", help="query file (default: built-in queries)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--model", default="load-test-model")
+    parser.add_argument("--namespace", default="load-test")
+    parser.add_argument("--access-level", default="public")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--vector-latency-ms", type=float, default=5.0)
+    parser.add_argument("--token-rate", type=float, default=50.0, help="LLM tokens/sec")
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--answer-tokens", type=int, default=64)
+    parser.add_argument(
+        "--app-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra settings for the app, e.g. RETRIEVAL_CACHE_ENABLED=false",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--app-port", type=int, default=8765)
+    parser.add_argument("--vector-port", type=int, default=5081)
+    parser.add_argument("--llm-port", type=int, default=5091)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    parser.add_argument("--out", default="data/benchmarks/load_test.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    # Read first: --out may overwrite the baseline file
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved {out}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,574 @@
+"""
+Retrieval quality and latency evaluation.
+
+Ingests a fixed corpus through the real chunker and embedder into an
+in-memory index, runs a labeled query set through the Retriever and
+reports recall@k, MRR and nDCG@k next to ingestion throughput, index
+size and query latency, for every configuration in a sweep.
+
+--reductions adds reduced-dimension indexes (PCA fitted on the corpus
+chunks, or truncation) and --rescore-k full-dimension rescoring of that
+many over-fetched candidates, to weigh recall loss against index size
+and query latency (recall_vs_full is relative to the unreduced index).
+
+    python -m app.rag_core.evaluation.retrieval_eval
+    python -m app.rag_core.evaluation.retrieval_eval \\
+        --chunk-sizes 256,512,1000 --overlaps 0,50,150 --top-k 3,5,10
+    python -m app.rag_core.evaluation.retrieval_eval --corpus docs/ --qrels qrels.jsonl
+    python -m app.rag_core.evaluation.retrieval_eval --chunk-sizes 256 --overlaps 50 \
+        --reductions none,pca:128,pca:64,truncate:128 --rescore-k 0,50
+
+Without --corpus a seeded synthetic corpus is generated (fact paragraphs
+among filler, one question per fact). A --qrels file holds JSON lines:
+
+    {"query": "...", "answers": ["text a relevant chunk contains"]}
+    {"query": "...", "relevant": [{"source": "handbook.pdf", "page": 3}]}
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from app.rag_core.evaluation.stand_ins import InMemoryPineconeClient
+from app.rag_core.evaluation.stats import summarize
+
+EVAL_NAMESPACE = "eval"
+EVAL_ACCESS_RANK = 1
+
+
+# -------------------------
+# Corpus + labels
+# -------------------------
+
+_TEAMS = ["sales", "finance", "platform", "security", "support", "legal",
+          "marketing", "research", "design", "operations", "data", "mobile"]
+_CITIES = ["Austin", "Berlin", "Toronto", "Dublin", "Singapore", "Madrid",
+           "Seattle", "Warsaw", "Lisbon", "Osaka", "Nairobi", "Denver"]
+_SYSTEMS = ["billing", "search", "payroll", "ledger", "identity", "catalog",
+            "messaging", "analytics", "checkout", "inventory", "reporting",
+            "notification", "scheduler", "gateway", "archive", "telemetry"]
+_PEOPLE = ["Priya Raman", "Tomas Novak", "Aisha Bello", "Kenji Sato",
+           "Laura Chen", "Mateo Ruiz", "Olga Ivanova", "Samuel Osei",
+           "Hannah Weber", "Diego Alvarez", "Mei Lin", "Noah Fischer"]
+
+_FACTS = [
+    (
+        "The {team} team's travel budget for {year} is {amount} dollars.",
+        "What is the travel budget of the {team} team for {year}?",
+    ),
+    (
+        "In {year}, employees based in the {city} office receive {n} days of paid leave.",
+        "How many days of paid leave did employees in {city} get in {year}?",
+    ),
+    (
+        "The {team} team's {system} service is owned by {person}, who leads its on-call escalations.",
+        "Who owns the {system} service of the {team} team?",
+    ),
+    (
+        "Incidents affecting the {team} team's {system} service must be acknowledged within {n} minutes.",
+        "How quickly must the {team} team acknowledge incidents on the {system} service?",
+    ),
+    (
+        "Access to the {system} dashboard in {city} requires written approval from {person}.",
+        "Who approves access to the {system} dashboard in {city}?",
+    ),
+    (
+        "Backups of the {system} database in the {city} region are retained for {n} days.",
+        "How long are {system} database backups retained in {city}?",
+    ),
+]
+
+_FILLER = [
+    "All staff should review the relevant policy documents at least once a year.",
+    "Questions about this section can be raised with the responsible manager.",
+    "This guideline applies to full-time employees and contractors alike.",
+    "Exceptions must be documented and approved before they take effect.",
+    "Teams are encouraged to share feedback through the usual channels.",
+    "The policy is reviewed each quarter and updated when regulations change.",
+    "Records must be kept in the approved document management system.",
+    "Managers are responsible for communicating changes to their teams.",
+]
+
+
+def build_synthetic_corpus(
+    documents: int = 8,
+    pages: int = 6,
+    facts_per_page: int = 4,
+    filler_per_fact: int = 3,
+    seed: int = 0,
+):
+    """
+    Deterministic corpus: pages of unique fact paragraphs separated by
+    filler, plus one labeled query per fact.
+    Returns (DocumentChunk pages, qrels).
+    """
+    from app.rag_core.ingestion.loader import DocumentChunk
+
+    rng = np.random.default_rng(seed)
+    used: set[str] = set()
+    pages_out, qrels = [], []
+
+    def fact():
+        for _ in range(10_000):
+            template, question = _FACTS[int(rng.integers(len(_FACTS)))]
+            values = {
+                "team": _TEAMS[int(rng.integers(len(_TEAMS)))],
+                "city": _CITIES[int(rng.integers(len(_CITIES)))],
+                "system": _SYSTEMS[int(rng.integers(len(_SYSTEMS)))],
+                "person": _PEOPLE[int(rng.integers(len(_PEOPLE)))],
+                "year": int(rng.integers(2019, 2027)),
+                "amount": f"{int(rng.integers(10, 500)) * 1000:,}",
+                "n": int(rng.integers(2, 90)),
+            }
+            q = question.format(**values)
+            if q not in used:
+                used.add(q)
+                return template.format(**values), q
+        raise ValueError("Synthetic corpus too large for the fact templates")
+
+    for d in range(documents):
+        for p in range(1, pages + 1):
+            paragraphs = []
+            for _ in range(facts_per_page):
+                sentence, query = fact()
+                qrels.append({"query": query, "answers": [sentence]})
+                paragraphs.append(sentence)
+                paragraphs.extend(
+                    " ".join(
+                        _FILLER[int(i)]
+                        for i in rng.integers(len(_FILLER), size=3)
+                    )
+                    for _ in range(filler_per_fact)
+                )
+
+            pages_out.append(
+                DocumentChunk(
+                    text="\n".join(paragraphs),
+                    metadata={"source": f"synthetic-{d}.pdf", "page": p, "type": "pdf"},
+                )
+            )
+
+    return pages_out, qrels
+
+
+async def load_corpus(path: str) -> list:
+    """
+    PDF/DOCX through AsyncDocumentLoader; .txt/.md as single documents.
+    """
+    from app.rag_core.ingestion.loader import AsyncDocumentLoader, DocumentChunk
+
+    loader = AsyncDocumentLoader()
+    documents = []
+
+    for file_path in sorted(Path(path).iterdir()):
+        suffix = file_path.suffix.lower()
+        if suffix in (".pdf", ".docx"):
+            documents.extend(await loader.load(file_path))
+        elif suffix in (".txt", ".md"):
+            documents.append(
+                DocumentChunk(
+                    text=file_path.read_text(encoding="utf-8"),
+                    metadata={"source": file_path.name, "type": suffix[1:]},
+                )
+            )
+
+    if not documents:
+        raise ValueError(f"No loadable documents in {path}")
+    return documents
+
+
+def load_qrels(path: str) -> list[dict]:
+    return [
+        json.loads(line)
+        for line in Path(path).read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+
+
+# -------------------------
+# Metrics
+# -------------------------
+
+
+def _normalize(text: str) -> str:
+    # The tokenizer round-trip in chunk overlaps lowercases and re-spaces text
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def _targets(qrel: dict) -> list:
+    return (
+        [("answer", _normalize(a)) for a in qrel.get("answers", [])]
+        + [("page", (r["source"], r.get("page"))) for r in qrel.get("relevant", [])]
+    )
+
+
+def _hits(target, text: str, metadata: dict) -> bool:
+    kind, value = target
+    if kind == "answer":
+        return value in text
+    return (metadata.get("source"), metadata.get("page")) == value
+
+
+def score_query(qrel: dict, matches: list[dict], k: int, relevant_in_index: int) -> dict:
+    """
+    recall@k (fraction of targets found in the top k), reciprocal rank
+    and binary nDCG@k for one query.
+    """
+    targets = _targets(qrel)
+    found = set()
+    gains = []
+
+    for match in matches[:k]:
+        metadata = match.get("metadata", {})
+        text = _normalize(metadata.get("text", ""))
+        hit = [i for i, target in enumerate(targets) if _hits(target, text, metadata)]
+        found.update(hit)
+        gains.append(1.0 if hit else 0.0)
+
+    first = next((rank for rank, gain in enumerate(gains, start=1) if gain), None)
+    dcg = sum(gain / math.log2(rank + 1) for rank, gain in enumerate(gains, start=1))
+    ideal = sum(1 / math.log2(rank + 1) for rank in range(1, min(k, relevant_in_index) + 1))
+
+    return {
+        "recall": len(found) / len(targets) if targets else 0.0,
+        "mrr": 1 / first if first else 0.0,
+        "ndcg": dcg / ideal if ideal else 0.0,
+    }
+
+
+def _count_relevant(qrel: dict, vectors: list[dict]) -> int:
+    targets = _targets(qrel)
+    return sum(
+        1 for v in vectors
+        if any(
+            _hits(t, _normalize(v["metadata"].get("text", "")), v["metadata"])
+            for t in targets
+        )
+    )
+
+
+# -------------------------
+# Evaluation
+# -------------------------
+
+
+async def ingest(documents, embedder, client, namespace: str, chunk_size: int, overlap: int, model_name: str) -> dict:
+    from app.rag_core.ingestion.chunker import AsyncSentenceChunker
+
+    chunker = AsyncSentenceChunker(
+        model_name=model_name,
+        max_tokens=chunk_size,
+        overlap_tokens=overlap,
+    )
+
+    start = perf_counter()
+    chunks = await chunker.split(documents)
+    chunk_seconds = perf_counter() - start
+
+    start = perf_counter()
+    embeddings = await embedder.embed_array(chunks.texts)
+    embed_seconds = perf_counter() - start
+
+    vectors = [
+        {
+            "id": f"eval-{i}",
+            "values": vector,
+            "metadata": {
+                **metadata,
+                "text": text,
+                "rag_access_level": "public",
+                "rag_access_level_rank": EVAL_ACCESS_RANK,
+            },
+        }
+        for i, (text, metadata, vector) in enumerate(
+            zip(chunks.texts, chunks.metadata, embeddings)
+        )
+    ]
+
+    start = perf_counter()
+    await client.upsert(vectors, namespace)
+    upsert_seconds = perf_counter() - start
+
+    total = chunk_seconds + embed_seconds + upsert_seconds
+    dimension = len(vectors[0]["values"]) if vectors else 0
+
+    return {
+        "vectors": vectors,
+        "chunks": len(chunks),
+        "source_chars": sum(len(d.text) for d in documents),
+        "chunk_seconds": chunk_seconds,
+        "embed_seconds": embed_seconds,
+        "upsert_seconds": upsert_seconds,
+        "chunks_per_second": len(chunks) / total if total else 0.0,
+        "index_vector_mb": len(vectors) * dimension * 4 / 1e6,
+        "index_metadata_mb": sum(len(json.dumps(v["metadata"])) for v in vectors) / 1e6,
+    }
+
+
+def parse_reduction(value: str) -> tuple[str, int | None]:
+    """
+    "none" | "pca:<dimension>" | "truncate:<dimension>"
+    """
+    if value == "none":
+        return "none", None
+    method, _, dimension = value.partition(":")
+    if method not in ("pca", "truncate") or not dimension.isdigit():
+        raise ValueError(f"Invalid reduction: {value}")
+    return method, int(dimension)
+
+
+async def index_reduced(vectors: list[dict], reducer, client, namespace: str) -> dict:
+    """
+    Upsert the same chunks with reduced vectors.
+    """
+    reduced = reducer.transform(np.stack([v["values"] for v in vectors]))
+
+    start = perf_counter()
+    await client.upsert(
+        [{**v, "values": r} for v, r in zip(vectors, reduced)], namespace
+    )
+    upsert_seconds = perf_counter() - start
+
+    return {
+        "upsert_seconds": upsert_seconds,
+        "index_vector_mb": reduced.size * 4 / 1e6,
+    }
+
+
+async def _retrievers(client, vectors, reductions, rescore_ks, model_name, dimension, store_path):
+    """
+    (reduction, dimension, rescore_k, retriever, index stats) per variant;
+    `client` holds the full-dimension vectors.
+    """
+    from app.rag_core.embeddings.reduction import VectorReducer
+    from app.rag_core.retrieval.retriever import Retriever
+    from app.rag_core.vectorstore.chunk_store import SQLiteChunkStore
+
+    store = None
+
+    for reduction in reductions:
+        method, reduced_dimension = parse_reduction(reduction)
+        if method == "none":
+            yield reduction, dimension, 0, Retriever(client), {}
+            continue
+
+        embeddings = np.stack([v["values"] for v in vectors])
+        if method == "truncate":
+            reducer = VectorReducer.truncation(dimension, reduced_dimension, model_name)
+        elif len(vectors) < reduced_dimension:
+            print(
+                f"Skipping {reduction}: {len(vectors)} chunks are too few to fit it",
+                file=sys.stderr,
+            )
+            continue
+        else:
+            reducer = VectorReducer.fit_pca(embeddings, reduced_dimension, model_name)
+
+        reduced_client = InMemoryPineconeClient(dimension=reduced_dimension)
+        index_stats = await index_reduced(vectors, reducer, reduced_client, EVAL_NAMESPACE)
+
+        for rescore_k in rescore_ks:
+            if not rescore_k:
+                retriever = Retriever(reduced_client, reducer=reducer)
+                yield reduction, reduced_dimension, 0, retriever, index_stats
+                continue
+
+            if store is None:
+                # Texts and full vectors, as ingestion writes them
+                store = SQLiteChunkStore(store_path)
+                store.open()
+                await store.put_many(
+                    [(v["id"], "eval", v["metadata"]["text"], v["metadata"]) for v in vectors],
+                    vectors=embeddings,
+                )
+
+            retriever = Retriever(
+                reduced_client, chunk_store=store, reducer=reducer, rescore_fetch_k=rescore_k
+            )
+            yield reduction, reduced_dimension, rescore_k, retriever, {
+                **index_stats,
+                "local_vector_mb": embeddings.size * 4 / 1e6,
+            }
+
+    if store is not None:
+        store.close()
+
+
+async def evaluate(
+    documents,
+    qrels: list[dict],
+    embedder,
+    chunk_sizes: list[int],
+    overlaps: list[int],
+    top_ks: list[int],
+    model_name: str,
+    dimension: int,
+    reductions: list[str] = ("none",),
+    rescore_ks: list[int] = (0,),
+) -> list[dict]:
+    workdir = tempfile.TemporaryDirectory()
+
+    # Query embeddings do not depend on chunking: embed once
+    query_vectors, embed_latencies = [], []
+    for qrel in qrels:
+        start = perf_counter()
+        query_vectors.append(await embedder.embed_query(qrel["query"]))
+        embed_latencies.append(perf_counter() - start)
+    query_embedding = summarize(embed_latencies)
+
+    rows = []
+    for chunk_size in chunk_sizes:
+        for overlap in overlaps:
+            if overlap >= chunk_size:
+                continue
+
+            client = InMemoryPineconeClient(dimension=dimension)
+            stats = await ingest(
+                documents, embedder, client, EVAL_NAMESPACE,
+                chunk_size, overlap, model_name,
+            )
+            vectors = stats.pop("vectors")
+            relevant = [_count_relevant(q, vectors) for q in qrels]
+
+            variants = _retrievers(
+                client, vectors, reductions, rescore_ks, model_name, dimension,
+                store_path=Path(workdir.name) / f"chunks-{chunk_size}-{overlap}.sqlite3",
+            )
+            async for reduction, stored_dimension, rescore_k, retriever, index_stats in variants:
+                for k in top_ks:
+                    scores, latencies = [], []
+                    for qrel, vector, n_relevant in zip(qrels, query_vectors, relevant):
+                        start = perf_counter()
+                        result = await retriever.retrieve(vector, EVAL_NAMESPACE, EVAL_ACCESS_RANK, k)
+                        latencies.append(perf_counter() - start)
+                        scores.append(score_query(qrel, result["matches"], k, n_relevant))
+
+                    latency = summarize(latencies)
+                    rows.append({
+                        "chunk_size": chunk_size,
+                        "overlap": overlap,
+                        "reduction": reduction,
+                        "dimension": stored_dimension,
+                        "rescore_k": rescore_k,
+                        "top_k": k,
+                        "recall": float(np.mean([s["recall"] for s in scores])),
+                        "mrr": float(np.mean([s["mrr"] for s in scores])),
+                        "ndcg": float(np.mean([s["ndcg"] for s in scores])),
+                        **stats,
+                        "local_vector_mb": 0.0,
+                        **index_stats,
+                        "query_p50_ms": latency["p50"] * 1000,
+                        "query_p95_ms": latency["p95"] * 1000,
+                        "query_embed_p50_ms": query_embedding["p50"] * 1000,
+                    })
+
+    workdir.cleanup()
+
+    # Recall change against the unreduced index with the same chunking and k
+    baseline = {
+        (r["chunk_size"], r["overlap"], r["top_k"]): r["recall"]
+        for r in rows if r["reduction"] == "none"
+    }
+    for row in rows:
+        full = baseline.get((row["chunk_size"], row["overlap"], row["top_k"]))
+        row["recall_vs_full"] = row["recall"] - full if full is not None else 0.0
+
+    return rows
+
+
+COLUMNS = [
+    "chunk_size", "overlap", "reduction", "rescore_k", "top_k",
+    "recall", "recall_vs_full", "mrr", "ndcg",
+    "chunks", "chunks_per_second", "index_vector_mb", "local_vector_mb",
+    "index_metadata_mb", "query_p50_ms", "query_p95_ms",
+]
+
+
+def print_rows(rows: list[dict], columns: list[str] = COLUMNS):
+    def fmt(value):
+        return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+    widths = {c: max(len(c), *(len(fmt(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(fmt(row[c]).ljust(widths[c]) for c in columns))
+
+
+def _ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+async def run(args) -> dict:
+    from app.core.config import settings
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+
+    if args.corpus:
+        if not args.qrels:
+            raise SystemExit("--qrels is required with --corpus")
+        documents, qrels = await load_corpus(args.corpus), load_qrels(args.qrels)
+    else:
+        documents, qrels = build_synthetic_corpus(
+            documents=args.synthetic_docs, seed=args.seed,
+        )
+
+    if args.max_queries:
+        qrels = qrels[: args.max_queries]
+
+    embedder = AsyncSentenceEmbedder(model_name=settings.EMBEDDING_MODEL)
+
+    rows = await evaluate(
+        documents,
+        qrels,
+        embedder,
+        chunk_sizes=_ints(args.chunk_sizes),
+        overlaps=_ints(args.overlaps),
+        top_ks=_ints(args.top_k),
+        model_name=settings.EMBEDDING_MODEL,
+        dimension=settings.EMBEDDING_DIMENSION,
+        reductions=args.reductions.split(","),
+        rescore_ks=_ints(args.rescore_k),
+    )
+
+    return {
+        "config": vars(args),
+        "documents": len(documents),
+        "queries": len(qrels),
+        "results": rows,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of .pdf/.docx/.txt/.md files")
+    parser.add_argument("--qrels", help="labeled queries (JSON lines)")
+    parser.add_argument("--chunk-sizes", default="256,512,1000")
+    parser.add_argument("--overlaps", default="0,50,150")
+    parser.add_argument("--top-k", default="3,5,10")
+    parser.add_argument("--reductions", default="none", help="e.g. none,pca:128,truncate:128")
+    parser.add_argument("--rescore-k", default="0", help="over-fetch for full-dimension rescoring (0: off)")
+    parser.add_argument("--synthetic-docs", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-queries", type=int, default=0)
+    parser.add_argument("--out", default="data/benchmarks/retrieval_eval.json")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print(f"documents={report['documents']} queries={report['queries']}\n")
+    print_rows(report["results"])
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
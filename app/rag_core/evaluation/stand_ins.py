@@ -0,0 +1,490 @@
+"""
+Local stand-ins for external services, used by benchmarks and offline
+evaluation. Nothing here is imported by the serving path.
+"""
+import asyncio
+import multiprocessing
+import socket
+import time
+
+import numpy as np
+
+
+# -------------------------
+# In-memory vector index
+# -------------------------
+
+
+class _Namespace:
+    """
+    Brute-force cosine index for one namespace with columnar metadata
+    filtering (Pinecone filter subset: $eq $ne $gt $gte $lt $lte $in
+    $nin $and $or).
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.metadata: list[dict] = []
+        self._rows: list[np.ndarray] = []
+        self._matrix: np.ndarray | None = None
+        self._columns: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def upsert(self, vectors: list[dict]):
+        for item in vectors:
+            values = np.asarray(item["values"], dtype=np.float32)
+            norm = np.linalg.norm(values)
+            if norm:
+                values = values / norm
+
+            position = self.positions.get(item["id"])
+            if position is None:
+                self.positions[item["id"]] = len(self.ids)
+                self.ids.append(item["id"])
+                self.metadata.append(item.get("metadata") or {})
+                self._rows.append(values)
+            else:
+                self.metadata[position] = item.get("metadata") or {}
+                self._rows[position] = values
+
+        self._matrix = None
+        self._columns.clear()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = (
+                np.vstack(self._rows)
+                if self._rows
+                else np.empty((0, self.dimension), dtype=np.float32)
+            )
+        return self._matrix
+
+    def query(
+        self,
+        vector,
+        top_k: int,
+        metadata_filter: dict | None = None,
+        include_metadata: bool = True,
+        include_values: bool = False,
+    ) -> list[dict]:
+        if not self.ids:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if metadata_filter:
+            candidates = np.flatnonzero(self._mask(metadata_filter))
+            scores = self.matrix[candidates] @ query
+        else:
+            candidates = None
+            scores = self.matrix @ query
+
+        k = min(top_k, len(scores))
+        if k == 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        matches = []
+        for i in top:
+            position = int(candidates[i]) if candidates is not None else int(i)
+            match = {"id": self.ids[position], "score": float(scores[i])}
+            if include_metadata:
+                match["metadata"] = self.metadata[position]
+            if include_values:
+                match["values"] = self.matrix[position].tolist()
+            matches.append(match)
+
+        return matches
+
+    def fetch(self, ids: list[str]) -> dict:
+        found = {}
+        for vector_id in ids:
+            position = self.positions.get(vector_id)
+            if position is not None:
+                found[vector_id] = {
+                    "id": vector_id,
+                    "values": self.matrix[position].tolist(),
+                    "metadata": self.metadata[position],
+                }
+        return found
+
+    # -------------------------
+    # Filtering
+    # -------------------------
+
+    def _column(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        if key not in self._columns:
+            raw = np.empty(len(self.metadata), dtype=object)
+            raw[:] = [m.get(key) for m in self.metadata]
+
+            numeric = np.full(len(self.metadata), np.nan)
+            for i, value in enumerate(raw):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numeric[i] = value
+
+            self._columns[key] = (raw, numeric)
+
+        return self._columns[key]
+
+    def _mask(self, metadata_filter: dict) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+
+        for key, condition in metadata_filter.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self._mask(sub)
+            elif key == "$or":
+                any_mask = np.zeros(len(self.ids), dtype=bool)
+                for sub in condition:
+                    any_mask |= self._mask(sub)
+                mask &= any_mask
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for op, value in condition.items():
+                    mask &= self._compare(key, op, value)
+
+        return mask
+
+    def _compare(self, key: str, op: str, value) -> np.ndarray:
+        raw, numeric = self._column(key)
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+
+        with np.errstate(invalid="ignore"):
+            if op == "$eq":
+                return numeric == value if is_number else raw == value
+            if op == "$ne":
+                return ~(numeric == value if is_number else raw == value)
+            if op == "$gt":
+                return numeric > value
+            if op == "$gte":
+                return numeric >= value
+            if op == "$lt":
+                return numeric < value
+            if op == "$lte":
+                return numeric <= value
+            if op in ("$in", "$nin"):
+                allowed = set(value)
+                hit = np.fromiter(
+                    (v in allowed for v in raw), dtype=bool, count=len(raw)
+                )
+                return hit if op == "$in" else ~hit
+
+        raise ValueError(f"Unsupported filter operator: {op}")
+
+
+class InMemoryVectorIndex:
+    """
+    Namespaced in-memory stand-in for a Pinecone index.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self._namespaces: dict[str, _Namespace] = {}
+
+    def namespace(self, name: str) -> _Namespace:
+        if name not in self._namespaces:
+            self._namespaces[name] = _Namespace(self.dimension)
+        return self._namespaces[name]
+
+    def upsert(self, vectors: list[dict], namespace: str) -> int:
+        self.namespace(namespace).upsert(vectors)
+        return len(vectors)
+
+    def query(
+        self,
+        vector,
+        namespace: str,
+        top_k: int = 5,
+        include_metadata: bool = True,
+        include_values: bool = False,
+        metadata_filter: dict | None = None,
+    ) -> dict:
+        ns = self._namespaces.get(namespace)
+        matches = (
+            ns.query(
+                vector,
+                top_k,
+                metadata_filter=metadata_filter,
+                include_metadata=include_metadata,
+                include_values=include_values,
+            )
+            if ns is not None
+            else []
+        )
+        return {"matches": matches, "namespace": namespace}
+
+    def fetch(self, ids: list[str], namespace: str) -> dict:
+        ns = self._namespaces.get(namespace)
+        return {
+            "vectors": ns.fetch(ids) if ns is not None else {},
+            "namespace": namespace,
+        }
+
+    def stats(self) -> dict:
+        namespaces = {
+            name: {"vectorCount": len(ns)}
+            for name, ns in self._namespaces.items()
+        }
+        return {
+            "dimension": self.dimension,
+            "namespaces": namespaces,
+            "totalVectorCount": sum(len(ns) for ns in self._namespaces.values()),
+        }
+
+
+class InMemoryPineconeClient:
+    """
+    In-process drop-in for PineconeClient (same async interface),
+    backed by InMemoryVectorIndex.
+    """
+
+    def __init__(self, index: InMemoryVectorIndex | None = None, dimension: int = 384):
+        self.index = index or InMemoryVectorIndex(dimension)
+
+    async def upsert(self, vectors: list, namespace: str, batch_size: int = 100):
+        self.index.upsert(vectors, namespace)
+
+    async def query(
+        self,
+        vector,
+        namespace: str,
+        top_k: int = 5,
+        include_metadata: bool = True,
+        metadata_filter: dict | None = None,
+        include_values: bool = False,
+    ) -> dict:
+        return self.index.query(
+            vector=vector,
+            namespace=namespace,
+            top_k=top_k,
+            include_metadata=include_metadata,
+            include_values=include_values,
+            metadata_filter=metadata_filter,
+        )
+
+    async def fetch(self, ids: list[str], namespace: str) -> dict:
+        return {
+            vector_id: {"id": vector_id, "metadata": dict(vector["metadata"])}
+            for vector_id, vector in self.index.fetch(ids, namespace)["vectors"].items()
+        }
+
+
+def seed_random_vectors(
+    index: InMemoryVectorIndex,
+    namespace: str,
+    count: int,
+    access_ranks: tuple[int, ...] = (1, 2, 3, 4),
+    seed: int = 0,
+) -> None:
+    """
+    Fill a namespace with random unit vectors and chat-style metadata.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((count, index.dimension), dtype=np.float32)
+
+    vectors = []
+    for i in range(count):
+        rank = access_ranks[i % len(access_ranks)]
+        vectors.append(
+            {
+                "id": f"synthetic-{i}",
+                "values": values[i],
+                "metadata": {
+                    "document_id": f"doc-{i // 50}",
+                    "text": f"Synthetic chunk {i} " * 20,
+                    "rag_access_level_rank": rank,
+                },
+            }
+        )
+
+    index.upsert(vectors, namespace)
+
+
+# -------------------------
+# HTTP stand-in (Pinecone data-plane REST subset)
+# -------------------------
+
+
+def create_vector_store_app(
+    index: InMemoryVectorIndex,
+    latency_seconds: float = 0.0,
+):
+    from fastapi import FastAPI, Request
+
+    app = FastAPI(title="Vector store stand-in")
+
+    async def _simulate_latency():
+        if latency_seconds:
+            await asyncio.sleep(latency_seconds)
+
+    @app.post("/query")
+    async def query(request: Request):
+        body = await request.json()
+        await _simulate_latency()
+        return index.query(
+            vector=body["vector"],
+            namespace=body.get("namespace", ""),
+            top_k=body.get("topK", 10),
+            include_metadata=body.get("includeMetadata", False),
+            include_values=body.get("includeValues", False),
+            metadata_filter=body.get("filter"),
+        )
+
+    @app.post("/vectors/upsert")
+    async def upsert(request: Request):
+        body = await request.json()
+        await _simulate_latency()
+        count = index.upsert(body["vectors"], body.get("namespace", ""))
+        return {"upsertedCount": count}
+
+    @app.get("/vectors/fetch")
+    async def fetch(request: Request):
+        ids = request.query_params.getlist("ids")
+        await _simulate_latency()
+        return index.fetch(ids, request.query_params.get("namespace", ""))
+
+    @app.post("/describe_index_stats")
+    async def describe_index_stats():
+        return index.stats()
+
+    return app
+
+
+def serve_vector_store(
+    host: str = "127.0.0.1",
+    port: int = 5081,
+    dimension: int = 384,
+    latency_seconds: float = 0.0,
+    seed_namespaces: dict[str, int] | None = None,
+) -> None:
+    """
+    Blocking server entry point (run in a subprocess).
+    """
+    import uvicorn
+
+    index = InMemoryVectorIndex(dimension)
+    for namespace, count in (seed_namespaces or {}).items():
+        seed_random_vectors(index, namespace, count)
+
+    uvicorn.run(
+        create_vector_store_app(index, latency_seconds),
+        host=host,
+        port=port,
+        log_level="warning",
+    )
+
+
+# -------------------------
+# LLM stand-in (OpenAI-compatible SSE streaming subset)
+# -------------------------
+
+
+def create_llm_app(
+    tokens_per_second: float = 50.0,
+    first_token_delay_seconds: float = 0.3,
+    answer_tokens: int = 64,
+):
+    """
+    Fake NVIDIA/OpenAI-compatible endpoint: GET /models and streaming
+    POST /chat/completions. The first token arrives after
+    `first_token_delay_seconds`, the rest at `tokens_per_second`.
+    """
+    import json
+
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI(title="LLM stand-in")
+    interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+    def sse(model: str, content: str) -> str:
+        chunk = {
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": content}}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    @app.get("/models")
+    async def models():
+        return {"object": "list", "data": []}
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "stand-in")
+        tokens = body.get("max_tokens") or answer_tokens
+
+        async def stream():
+            await asyncio.sleep(first_token_delay_seconds)
+            for i in range(tokens):
+                if i:
+                    await asyncio.sleep(interval)
+                yield sse(model, f"token{i} ")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def serve_llm(
+    host: str = "127.0.0.1",
+    port: int = 5091,
+    tokens_per_second: float = 50.0,
+    first_token_delay_seconds: float = 0.3,
+    answer_tokens: int = 64,
+) -> None:
+    """
+    Blocking server entry point (run in a subprocess).
+    """
+    import uvicorn
+
+    uvicorn.run(
+        create_llm_app(tokens_per_second, first_token_delay_seconds, answer_tokens),
+        host=host,
+        port=port,
+        log_level="warning",
+    )
+
+
+# -------------------------
+# Process helpers
+# -------------------------
+
+
+def start_process(target, **kwargs) -> multiprocessing.Process:
+    """
+    Start a stand-in server in a spawned subprocess.
+    """
+    process = multiprocessing.get_context("spawn").Process(
+        target=target,
+        kwargs=kwargs,
+        daemon=True,
+    )
+    process.start()
+    return process
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f"Stand-in server did not start on {host}:{port}")
@@ -0,0 +1,30 @@
+import math
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile (pct in 0..100).
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: list[float]) -> dict:
+    """
+    Latency summary used by benchmarks and harness reports.
+    """
+    if not values:
+        return {"count": 0}
+
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
@@ -0,0 +1,125 @@
+"""
+Synthetic PDF/DOCX inputs of configurable size for benchmarks.
+
+PDFs are written by hand (one Helvetica text stream per page), so no PDF
+writer dependency is needed; DOCX files use python-docx.
+"""
+from pathlib import Path
+
+import numpy as np
+
+_WORDS = [
+    "policy", "employee", "access", "quarterly", "report", "customer",
+    "platform", "security", "review", "approval", "budget", "service",
+    "incident", "retention", "manager", "request", "system", "training",
+    "benefit", "compliance", "office", "schedule", "vendor", "contract",
+    "the", "of", "and", "for", "with", "must", "each", "within", "is", "a",
+]
+
+
+def synthetic_paragraphs(count: int, words_per_paragraph: int = 60, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    paragraphs = []
+
+    for _ in range(count):
+        words = [_WORDS[i] for i in rng.integers(len(_WORDS), size=words_per_paragraph)]
+        # Sentences of ~12 words
+        for i in range(11, len(words), 12):
+            words[i] += "."
+        words[0] = words[0].capitalize()
+        paragraphs.append(" ".join(words))
+
+    return paragraphs
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(paragraph: str, width: int = 90) -> list[str]:
+    lines, line = [], ""
+    for word in paragraph.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def write_synthetic_pdf(
+    path: Path,
+    pages: int = 10,
+    paragraphs_per_page: int = 6,
+    words_per_paragraph: int = 60,
+    seed: int = 0,
+) -> Path:
+    paragraphs = synthetic_paragraphs(pages * paragraphs_per_page, words_per_paragraph, seed)
+
+    # Objects: 1 catalog, 2 pages tree, 3 font, then (page, content) pairs
+    objects: list[bytes] = []
+    page_ids = [4 + 2 * i for i in range(pages)]
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(
+        f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] "
+        f"/Count {pages} >>".encode()
+    )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for i in range(pages):
+        lines = []
+        for paragraph in paragraphs[i * paragraphs_per_page : (i + 1) * paragraphs_per_page]:
+            lines.extend(_wrap(paragraph))
+            lines.append("")
+
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[i] + 1} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n"
+            + stream + b"\nendstream"
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+
+    path = Path(path)
+    path.write_bytes(bytes(out))
+    return path
+
+
+def write_synthetic_docx(
+    path: Path,
+    paragraphs: int = 60,
+    words_per_paragraph: int = 60,
+    seed: int = 0,
+) -> Path:
+    from docx import Document
+
+    document = Document()
+    for paragraph in synthetic_paragraphs(paragraphs, words_per_paragraph, seed):
+        document.add_paragraph(paragraph)
+
+    path = Path(path)
+    document.save(str(path))
+    return path
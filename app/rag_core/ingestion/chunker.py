@@ -1,6 +1,6 @@
 import asyncio
-from typing import List
-from app.rag_core.ingestion.loader import DocumentChunk
+from typing import Iterable
+from app.rag_core.ingestion.loader import ChunkBatch, DocumentChunk
 from app.rag_core.embeddings.tokenizer import SentenceTokenizerProvider
 
 
@@ -23,18 +23,23 @@ class AsyncSentenceChunker:
         self.max_tokens = max_tokens
         self.overlap_tokens = overlap_tokens
 
-    async def split(self, documents: List[DocumentChunk]) -> List[DocumentChunk]:
+    async def split(self, documents: ChunkBatch | Iterable[DocumentChunk]) -> ChunkBatch:
         return await asyncio.to_thread(self._split_sync, documents)
 
-    def _split_sync(self, documents: List[DocumentChunk]) -> List[DocumentChunk]:
-        chunks: List[DocumentChunk] = []
+    def _split_sync(self, documents: ChunkBatch | Iterable[DocumentChunk]) -> ChunkBatch:
+        if not isinstance(documents, ChunkBatch):
+            documents = ChunkBatch.from_chunks(documents)
 
-        for doc in documents:
-            paragraphs = [p for p in doc.text.split("\n") if p.strip()]
+        chunks = ChunkBatch()
+
+        for text, metadata in zip(documents.texts, documents.metadata):
             buffer_tokens = []
             buffer_text = ""
 
-            for para in paragraphs:
+            for para in text.split("\n"):
+                if not para.strip():
+                    continue
+
                 para_tokens = self.tokenizer.encode(para, add_special_tokens=False)
 
                 if len(buffer_tokens) + len(para_tokens) <= self.max_tokens:
@@ -42,23 +47,14 @@ class AsyncSentenceChunker:
                     buffer_text += " " + para
                 else:
                     if buffer_text.strip():
-                        chunks.append(
-                            DocumentChunk(
-                                text=buffer_text.strip(),
-                                metadata={**doc.metadata},
-                            )
-                        )
+                        # Shares the section's metadata dict
+                        chunks.append(buffer_text.strip(), metadata)
 
                     overlap = buffer_tokens[-self.overlap_tokens :]
                     buffer_tokens = overlap + para_tokens
                     buffer_text = self.tokenizer.decode(buffer_tokens)
 
             if buffer_text.strip():
-                chunks.append(
-                    DocumentChunk(
-                        text=buffer_text.strip(),
-                        metadata={**doc.metadata},
-                    )
-                )
+                chunks.append(buffer_text.strip(), metadata)
 
         return chunks
@@ -1,62 +1,142 @@
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict
 import asyncio
-from pypdf import PdfReader
-from docx import Document
+from importlib import metadata
+
+# pypdf / python-docx are imported by the parse methods that use them
+
+# Bump when extraction output changes; cached parses are keyed by it
+LOADER_VERSION = "1"
+
+
+def extractor_version() -> str:
+    """
+    Loader logic plus parser library versions (parse cache key component).
+    """
+    return (
+        f"{LOADER_VERSION}/pypdf-{_package_version('pypdf')}"
+        f"/python-docx-{_package_version('python-docx')}"
+    )
+
+
+def _package_version(name: str) -> str:
+    # Installed distribution metadata; avoids importing the parser
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
 
 
 class DocumentChunk:
+    __slots__ = ("text", "metadata")
+
     def __init__(self, text: str, metadata: Dict):
         self.text = text
         self.metadata = metadata
 
 
+class ChunkBatch:
+    """
+    Columnar chunks of one document.
+
+    - texts: chunk texts
+    - metadata: references to the source section's dict, shared by all
+      chunks cut from it (never copied per chunk; treat as read-only).
+      The page number, where the format has one, lives in this dict
+    """
+
+    __slots__ = ("texts", "metadata")
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.metadata: List[Dict] = []
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[DocumentChunk]) -> "ChunkBatch":
+        batch = cls()
+        for chunk in chunks:
+            batch.append(chunk.text, chunk.metadata)
+        return batch
+
+    def append(self, text: str, metadata: Dict):
+        self.texts.append(text)
+        self.metadata.append(metadata)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, i: int) -> DocumentChunk:
+        return DocumentChunk(self.texts[i], self.metadata[i])
+
+    def __iter__(self) -> Iterator[DocumentChunk]:
+        return map(DocumentChunk, self.texts, self.metadata)
+
+
 class AsyncDocumentLoader:
     """
     Async-safe document loader.
     CPU-heavy parsing is offloaded from event loop.
+    With a ParsedTextCache, identical files are parsed only once.
     """
 
-    async def load(self, file_path: Path) -> List[DocumentChunk]:
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    async def load(self, file_path: Path) -> ChunkBatch:
         if file_path.suffix.lower() == ".pdf":
-            return await asyncio.to_thread(self._load_pdf, file_path)
+            parse = self._load_pdf
         elif file_path.suffix.lower() == ".docx":
-            return await asyncio.to_thread(self._load_docx, file_path)
+            parse = self._load_docx
         else:
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
 
-    def _load_pdf(self, file_path: Path) -> List[DocumentChunk]:
+        return await asyncio.to_thread(self._load_sync, file_path, parse)
+
+    def _load_sync(self, file_path: Path, parse) -> ChunkBatch:
+        if self.cache is None:
+            return parse(file_path)
+
+        key = self.cache.key(file_path)
+        sections = self.cache.get(key, source=file_path.name)
+        if sections is None:
+            sections = parse(file_path)
+            self.cache.put(key, sections)
+
+        return sections
+
+    def _load_pdf(self, file_path: Path) -> ChunkBatch:
+        from pypdf import PdfReader
+
         reader = PdfReader(str(file_path))
-        chunks: List[DocumentChunk] = []
+        pages = ChunkBatch()
 
         for page_number, page in enumerate(reader.pages, start=1):
             text = page.extract_text() or ""
             if text.strip():
-                chunks.append(
-                    DocumentChunk(
-                        text=text,
-                        metadata={
-                            "source": file_path.name,
-                            "page": page_number,
-                            "type": "pdf",
-                        },
-                    )
+                pages.append(
+                    text,
+                    {
+                        "source": file_path.name,
+                        "page": page_number,
+                        "type": "pdf",
+                    },
                 )
-        return chunks
+        return pages
+
+    def _load_docx(self, file_path: Path) -> ChunkBatch:
+        from docx import Document
 
-    def _load_docx(self, file_path: Path) -> List[DocumentChunk]:
         doc = Document(str(file_path))
         paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+        sections = ChunkBatch()
 
-        if not paragraphs:
-            return []
-
-        return [
-            DocumentChunk(
-                text="\n".join(paragraphs),
-                metadata={
+        if paragraphs:
+            sections.append(
+                "\n".join(paragraphs),
+                {
                     "source": file_path.name,
                     "type": "docx",
                 },
             )
-        ]
+        return sections
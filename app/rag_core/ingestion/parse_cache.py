@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from app.core.logger import get_logger
+from app.core.metrics import (
+    PARSE_CACHE_BYTES,
+    PARSE_CACHE_ENTRIES,
+    PARSE_CACHE_EVICTIONS,
+    PARSE_CACHE_HITS,
+    PARSE_CACHE_MISSES,
+)
+from app.rag_core.ingestion.loader import ChunkBatch
+
+logger = get_logger(__name__)
+
+_SUFFIX = ".json.gz"
+# Writes between full directory rescans (other processes share the cache)
+_RESCAN_WRITES = 256
+# Eviction frees down to this fraction of the limits, so a full cache
+# is not rescanned on every write
+_LOW_WATER = 0.9
+
+
+class ParsedTextCache:
+    """
+    On-disk cache of extracted document text (per-page texts and
+    metadata), so re-chunking and duplicate uploads skip parsing.
+
+    - Keyed by file content hash + extractor version
+    - One gzip-compressed JSON file per document, written atomically
+    - Bounded by total compressed size and entry count; least recently
+      used (by mtime, touched on every hit) entries are evicted first.
+      Size and count are tracked per write; the directory is rescanned
+      only when over a limit or every _RESCAN_WRITES writes
+    - Safe to share between worker processes: entries are immutable and
+      a lost eviction race only costs a re-parse
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        version: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entries: int = 10000,
+    ):
+        self.directory = Path(directory)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = 0
+        self._bytes = 0
+        self._writes = 0
+
+    def open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._enforce_limits()
+
+        logger.info("Parse cache opened | path=%s", self.directory)
+
+    def key(self, file_path: Path) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{self.version}\0{file_path.suffix.lower()}\0".encode())
+
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    def get(self, key: str, source: str) -> ChunkBatch | None:
+        """
+        Cached sections for `key`, with `source` as the metadata file name.
+        """
+        path = self._path(key)
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            # LRU order is mtime order
+            os.utime(path)
+        except FileNotFoundError:
+            PARSE_CACHE_MISSES.inc()
+            return None
+        except (OSError, ValueError):
+            logger.warning("Discarding unreadable parse cache entry | path=%s", path)
+            self._discard(path)
+            PARSE_CACHE_MISSES.inc()
+            return None
+
+        sections = ChunkBatch()
+        for text, metadata in zip(entry["texts"], entry["metadata"]):
+            sections.append(text, {**metadata, "source": source})
+
+        PARSE_CACHE_HITS.inc()
+        return sections
+
+    def put(self, key: str, sections: ChunkBatch):
+        entry = {
+            "texts": sections.texts,
+            # Upload names differ per copy; the caller's is restored on get
+            "metadata": [
+                {k: v for k, v in metadata.items() if k != "source"}
+                for metadata in sections.metadata
+            ],
+        }
+
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(entry, f, ensure_ascii=False)
+            size = tmp.stat().st_size
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = None
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception("Parse cache write failed | path=%s", path)
+            self._discard(tmp)
+            return
+
+        with self._lock:
+            self._entries += replaced is None
+            self._bytes += size - (replaced or 0)
+            self._writes += 1
+
+            if (
+                self._entries > self.max_entries
+                or self._bytes > self.max_bytes
+                or self._writes >= _RESCAN_WRITES
+            ):
+                self._enforce_limits()
+            else:
+                PARSE_CACHE_ENTRIES.set(self._entries)
+                PARSE_CACHE_BYTES.set(self._bytes)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    @staticmethod
+    def _discard(path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _enforce_limits(self):
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+
+        if len(entries) > self.max_entries or total > self.max_bytes:
+            max_entries = int(self.max_entries * _LOW_WATER)
+            max_bytes = int(self.max_bytes * _LOW_WATER)
+            evicted = 0
+            while entries and (len(entries) - evicted > max_entries or total > max_bytes):
+                _, size, path = entries[evicted]
+                self._discard(path)
+                total -= size
+                evicted += 1
+            del entries[:evicted]
+            PARSE_CACHE_EVICTIONS.inc(evicted)
+
+        self._entries = len(entries)
+        self._bytes = total
+        self._writes = 0
+        PARSE_CACHE_ENTRIES.set(self._entries)
+        PARSE_CACHE_BYTES.set(self._bytes)
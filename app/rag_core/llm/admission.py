@@ -0,0 +1,166 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from app.core.metrics import (
+    LLM_INFLIGHT_REQUESTS,
+    LLM_QUEUED_REQUESTS,
+    LLM_REJECTED_REQUESTS,
+)
+
+
+class LLMOverloadedError(RuntimeError):
+    """
+    Raised when a request is shed by admission control.
+    """
+
+    def __init__(self, model: str, reason: str):
+        super().__init__(f"Model overloaded: {model} ({reason})")
+        self.model = model
+        self.reason = reason
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = monotonic()
+
+    def wait_time(self) -> float:
+        """
+        Seconds until a token is available (0 if one is available now).
+        """
+        now = monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class AdmissionController:
+    """
+    Per-model admission control for upstream LLM streams.
+
+    - At most `max_concurrency` streams in flight
+    - Optional token-bucket rate limit on stream starts
+    - Bounded FIFO wait queue; waiting longer than `max_wait_seconds`
+      or arriving at a full queue sheds the request immediately
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        rate_per_second: float | None = None,
+        burst: int = 1,
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self._bucket = (
+            _TokenBucket(rate_per_second, burst) if rate_per_second else None
+        )
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+        self._inflight_gauge = LLM_INFLIGHT_REQUESTS.labels(model=model)
+        self._queued_gauge = LLM_QUEUED_REQUESTS.labels(model=model)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one upstream slot for the duration of the block.
+        """
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _reject(self, reason: str):
+        LLM_REJECTED_REQUESTS.labels(model=self.model, reason=reason).inc()
+        raise LLMOverloadedError(self.model, reason)
+
+    async def _acquire(self):
+        deadline = monotonic() + self.max_wait_seconds
+
+        # ---------- Concurrency slot ----------
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+        else:
+            if len(self._waiters) >= self.max_queue:
+                self._reject("queue_full")
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._queued_gauge.set(len(self._waiters))
+
+            try:
+                await asyncio.wait_for(waiter, timeout=self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                # Slot may have been handed over as the wait timed out: keep it
+                if not (waiter.done() and not waiter.cancelled()):
+                    self._reject("queue_timeout")
+            except asyncio.CancelledError:
+                # Slot may have been handed over just before cancellation
+                if waiter.done() and not waiter.cancelled():
+                    self._release()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._queued_gauge.set(len(self._waiters))
+
+        # ---------- Rate limit ----------
+        try:
+            while self._bucket is not None:
+                delay = self._bucket.wait_time()
+                if delay == 0:
+                    self._bucket.take()
+                    break
+                if monotonic() + delay > deadline:
+                    self._reject("rate_limited")
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._release()
+            raise
+
+        self._inflight_gauge.set(self._in_flight)
+
+    def _release(self):
+        # Hand the slot straight to the next live waiter (FIFO)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._queued_gauge.set(len(self._waiters))
+                return
+
+        self._in_flight -= 1
+        self._inflight_gauge.set(self._in_flight)
+        self._queued_gauge.set(0)
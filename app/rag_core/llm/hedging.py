@@ -0,0 +1,222 @@
+import asyncio
+from collections import deque
+from time import perf_counter
+
+from app.core.logger import get_logger
+from app.core.metrics import (
+    LLM_HEDGES_TOTAL,
+    LLM_HEDGE_OUTCOMES,
+    LLM_HEDGED_FIRST_TOKEN_LATENCY,
+)
+from app.rag_core.evaluation.stats import percentile
+
+logger = get_logger(__name__)
+
+# Tokens buffered per upstream stream ahead of the consumer
+_STREAM_BUFFER = 64
+_END = object()
+
+
+class FirstTokenTracker:
+    """
+    Rolling first-token latency window per model.
+    Drives the percentile-based hedge delay.
+    """
+
+    def __init__(
+        self,
+        pct: float = 95.0,
+        window: int = 200,
+        min_samples: int = 20,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.3,
+        max_delay: float = 5.0,
+    ):
+        self.pct = pct
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        if model not in self._samples:
+            self._samples[model] = deque(maxlen=self.window)
+        self._samples[model].append(seconds)
+
+    def delay(self, model: str) -> float:
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return self.initial_delay
+
+        return min(
+            self.max_delay,
+            max(self.min_delay, percentile(list(samples), self.pct)),
+        )
+
+
+class HedgedLLMClient:
+    """
+    Streams from a primary model, hedging to a fallback model when the
+    primary has not produced a first token within a percentile-based
+    delay (or fails before its first token).
+
+    Whichever stream yields first wins; the loser is cancelled, which
+    also releases its admission slot. Each upstream stream is driven by
+    one pump task from start to close, so its HTTP stream and admission
+    slot contexts are never resumed from another task.
+    """
+
+    def __init__(self, primary, fallback, tracker: FirstTokenTracker):
+        self.primary = primary
+        self.fallback = fallback
+        self.tracker = tracker
+
+    @property
+    def model(self) -> str:
+        return self.primary.model
+
+    async def warm(self):
+        await self.primary.warm()
+
+    async def stream(self, prompt: str):
+        start = perf_counter()
+        delay = self.tracker.delay(self.primary.model)
+
+        # role -> (pump task, token queue, client); (role, error) per stream
+        # once it yields, ends or fails first
+        streams: dict[str, tuple] = {}
+        firsts: asyncio.Queue = asyncio.Queue()
+
+        def launch(client, role: str):
+            tokens = asyncio.Queue(maxsize=_STREAM_BUFFER)
+            task = asyncio.create_task(
+                self._pump(client.stream(prompt), role, tokens, firsts)
+            )
+            streams[role] = (task, tokens, client)
+
+        launch(self.primary, "primary")
+        hedged = False
+        hedge_at = 0.0
+        winner = None
+        errors: list[BaseException] = []
+
+        try:
+            while winner is None:
+                timeout = (
+                    None if hedged
+                    else max(0.0, delay - (perf_counter() - start))
+                )
+                try:
+                    role, error = await asyncio.wait_for(firsts.get(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    if error is None:
+                        winner = role
+                        break
+                    errors.append(error)
+
+                if not hedged:
+                    # Primary is slow (timeout) or failed: start the fallback
+                    hedged = True
+                    hedge_at = perf_counter() - start
+                    LLM_HEDGES_TOTAL.labels(model=self.primary.model).inc()
+                    logger.info(
+                        "Hedging LLM request | primary=%s | fallback=%s | delay=%.3f",
+                        self.primary.model,
+                        self.fallback.model,
+                        delay,
+                    )
+                    launch(self.fallback, "fallback")
+                elif len(errors) == len(streams):
+                    break
+
+        finally:
+            await self._close_losers(streams, winner)
+
+        if winner is None:
+            # Both streams failed before a first token; an empty stream
+            # (StopAsyncIteration) simply ends the answer.
+            error = next(
+                (e for e in errors if not isinstance(e, StopAsyncIteration)),
+                None,
+            )
+            if error is not None:
+                raise error
+            return
+
+        task, tokens, client = streams[winner]
+        first_token_seconds = perf_counter() - start
+        self._record(winner, client, first_token_seconds, hedged, hedge_at)
+
+        try:
+            while True:
+                token, error = await tokens.get()
+                if token is _END:
+                    if error is not None:
+                        raise error
+                    return
+                yield token
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _record(self, role, client, seconds, hedged, hedge_at):
+        if role == "primary":
+            self.tracker.record(client.model, seconds)
+        else:
+            # Censored sample: the primary took at least this long
+            self.tracker.record(self.primary.model, seconds)
+            self.tracker.record(client.model, seconds - hedge_at)
+
+        outcome = role if hedged else "unhedged"
+        LLM_HEDGE_OUTCOMES.labels(model=self.primary.model, outcome=outcome).inc()
+
+        if hedged:
+            LLM_HEDGED_FIRST_TOKEN_LATENCY.labels(
+                model=self.primary.model, winner=role
+            ).observe(seconds)
+
+    @staticmethod
+    async def _pump(agen, role: str, tokens: asyncio.Queue, firsts: asyncio.Queue):
+        """
+        Drive one upstream stream from a single task, forwarding its
+        tokens (then _END) to `tokens`. Cancelling the task closes the
+        stream, releasing its admission slot.
+        """
+        first = True
+        try:
+            async for token in agen:
+                await tokens.put((token, None))
+                if first:
+                    first = False
+                    firsts.put_nowait((role, None))
+
+            if first:
+                firsts.put_nowait((role, StopAsyncIteration()))
+            await tokens.put((_END, None))
+        except Exception as exc:
+            if first:
+                firsts.put_nowait((role, exc))
+            else:
+                await tokens.put((_END, exc))
+        finally:
+            await agen.aclose()
+
+    @staticmethod
+    async def _close_losers(streams, winner):
+        """
+        Stop every launched stream but the winner's, whether its first
+        token is still pending, arrived alongside the winner's, or failed.
+        """
+        losers = [task for role, (task, _, _) in streams.items() if role != winner]
+        for task in losers:
+            task.cancel()
+
+        await asyncio.gather(*losers, return_exceptions=True)
@@ -1,4 +1,6 @@
 from app.rag_core.llm.nvidia_client import NvidiaLLMClient
+from app.rag_core.llm.admission import AdmissionController
+from app.rag_core.llm.hedging import FirstTokenTracker, HedgedLLMClient
 from app.core.config import settings
 from app.core.logger import get_logger
 
@@ -12,26 +14,99 @@ class LLMRegistry:
 
     def __init__(self):
         self._models: dict[str, NvidiaLLMClient] = {}
+        self._hedged: dict[str, HedgedLLMClient] = {}
+        self._first_tokens = FirstTokenTracker(
+            pct=settings.LLM_HEDGE_PERCENTILE,
+            window=settings.LLM_HEDGE_WINDOW,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+            initial_delay=settings.LLM_HEDGE_INITIAL_DELAY_SECONDS,
+            min_delay=settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+            max_delay=settings.LLM_HEDGE_MAX_DELAY_SECONDS,
+        )
 
     def initialize(self):
         logger.info("Initializing NVIDIA LLM registry")
 
         for model_name in settings.nvidia_model_list:
-            logger.info(f"Loading NVIDIA model: {model_name}")
-            self._models[model_name] = NvidiaLLMClient(model_name)
+            logger.info("Loading NVIDIA model: %s", model_name)
+            self._models[model_name] = NvidiaLLMClient(
+                model_name,
+                admission=self._build_admission(model_name),
+            )
+
+        if settings.LLM_HEDGING_ENABLED:
+            self._initialize_hedging()
 
         logger.info(
-            f"NVIDIA LLM registry ready | models={list(self._models.keys())}"
+            "NVIDIA LLM registry ready | models=%s",
+            list(self._models.keys()),
         )
 
     def get(self, model_name: str | None):
+        """
+        Client for a model; hedged when a fallback is configured.
+        """
         if not model_name:
-            return self._models[settings.NVIDIA_DEFAULT_MODEL]
+            model_name = settings.NVIDIA_DEFAULT_MODEL
 
         if model_name not in self._models:
             raise ValueError(f"Model not available: {model_name}")
 
-        return self._models[model_name]
+        return self._hedged.get(model_name) or self._models[model_name]
+
+    def _initialize_hedging(self):
+        fallbacks = settings.LLM_HEDGE_FALLBACKS
+
+        for model_name, client in self._models.items():
+            fallback = fallbacks.get(model_name, fallbacks.get("*"))
+
+            if not fallback or fallback == model_name:
+                continue
+
+            if fallback not in self._models:
+                logger.warning(
+                    "Hedge fallback not registered | model=%s | fallback=%s",
+                    model_name,
+                    fallback,
+                )
+                continue
+
+            self._hedged[model_name] = HedgedLLMClient(
+                primary=client,
+                fallback=self._models[fallback],
+                tracker=self._first_tokens,
+            )
+            logger.info(
+                "Hedging enabled | model=%s | fallback=%s",
+                model_name,
+                fallback,
+            )
 
     def list_models(self) -> list[str]:
         return list(self._models.keys())
+
+    async def aclose(self):
+        for client in self._models.values():
+            await client.aclose()
+
+    @staticmethod
+    def _build_admission(model_name: str) -> AdmissionController:
+        """
+        Admission limits from settings, with per-model overrides.
+        """
+        limits = settings.LLM_MODEL_LIMITS.get(model_name, {})
+
+        return AdmissionController(
+            model=model_name,
+            max_concurrency=int(
+                limits.get("max_concurrency", settings.LLM_MAX_CONCURRENCY)
+            ),
+            max_queue=int(limits.get("max_queue", settings.LLM_MAX_QUEUE)),
+            max_wait_seconds=limits.get(
+                "max_wait_seconds", settings.LLM_MAX_QUEUE_WAIT_SECONDS
+            ),
+            rate_per_second=limits.get(
+                "rate_per_second", settings.LLM_RATE_LIMIT_PER_SECOND
+            ),
+            burst=int(limits.get("burst", settings.LLM_RATE_LIMIT_BURST)),
+        )
@@ -1,6 +1,10 @@
+import asyncio
+from time import monotonic
+
 import httpx
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.rag_core.llm.admission import AdmissionController
 
 logger = get_logger(__name__)
 
@@ -8,22 +12,89 @@ logger = get_logger(__name__)
 class NvidiaLLMClient:
     """
     NVIDIA LLM streaming client.
+
+    - One pooled keep-alive HTTP client per model (no per-request handshake)
+    - warm() pre-establishes an upstream connection so it can overlap
+      with query embedding and retrieval
     """
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(
+        self,
+        model_name: str | None = None,
+        admission: AdmissionController | None = None,
+    ):
         self.model = model_name or settings.NVIDIA_MODEL
         self.base_url = settings.NVIDIA_BASE_URL
         self.api_key = settings.NVIDIA_API_KEY
+        self.admission = admission
+
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+        # Reads are bounded by the request deadline, not here
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                None, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_POOL_SIZE,
+                max_keepalive_connections=settings.LLM_POOL_SIZE,
+                keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+            ),
+        )
+        self._last_used = 0.0
+        self._warming: asyncio.Future | None = None
+
+    async def warm(self):
+        """
+        Ensure a live keep-alive connection to the upstream.
+        No-op while a recently used connection is still in the pool.
+        """
+        if monotonic() - self._last_used < settings.LLM_KEEPALIVE_SECONDS / 2:
+            return
+
+        if self._warming is None or self._warming.done():
+            self._warming = asyncio.ensure_future(self._warm())
+
+        # Shared by concurrent callers; a cancelled caller does not
+        # abort the handshake for the others
+        await asyncio.shield(self._warming)
+
+    async def aclose(self):
+        await self._http.aclose()
 
     async def stream(self, prompt: str):
         """
         Async generator yielding tokens.
+        Raises LLMOverloadedError before the first token when shed.
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        if self.admission is None:
+            async for token in self._stream(prompt):
+                yield token
+            return
+
+        async with self.admission.slot():
+            async for token in self._stream(prompt):
+                yield token
 
+    async def _warm(self):
+        try:
+            await self._http.get(
+                f"{self.base_url}/models",
+                headers=self._headers,
+            )
+            self._last_used = monotonic()
+        except Exception as e:
+            # Runs fire-and-forget from the chat pipeline: never raise
+            logger.warning(
+                "LLM connection warm-up failed | model=%s | error=%s",
+                self.model,
+                e,
+            )
+
+    async def _stream(self, prompt: str):
         payload = {
             "model": self.model,
             "messages": [
@@ -32,11 +103,11 @@ class NvidiaLLMClient:
             "stream": True,
         }
 
-        async with httpx.AsyncClient(timeout=None) as client:
-            async with client.stream(
+        try:
+            async with self._http.stream(
                 "POST",
                 f"{self.base_url}/chat/completions",
-                headers=headers,
+                headers=self._headers,
                 json=payload,
             ) as response:
 
@@ -58,5 +129,12 @@ class NvidiaLLMClient:
                             yield content
 
                     except Exception as e:
-                        logger.warning(f"Stream parse error: {e}")
+                        logger.warning(
+                            "Stream parse error | model=%s | error=%s",
+                            self.model,
+                            e,
+                        )
                         continue
+
+        finally:
+            self._last_used = monotonic()
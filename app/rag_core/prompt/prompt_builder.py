@@ -1,12 +1,27 @@
-def build_prompt(query: str, contexts: list[str]) -> str:
+def build_prompt(
+    query: str,
+    contexts: list[str],
+    history: list[tuple[str, str]] | None = None,
+) -> str:
     context_block = "\n\n".join(contexts)
 
+    conversation = ""
+    if history:
+        turns = "\n\n".join(
+            f"User: {past_query}\nAssistant: {past_answer}"
+            for past_query, past_answer in history
+        )
+        conversation = f"""
+Conversation so far:
+{turns}
+"""
+
     return f"""
 You are an AI assistant.
 
 Context:
 {context_block}
-
+{conversation}
 Question:
 {query}
 
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import sys
+from array import array
+from collections import OrderedDict
+from time import monotonic
+
+from app.core.metrics import (
+    RETRIEVAL_CACHE_HITS,
+    RETRIEVAL_CACHE_MISSES,
+    RETRIEVAL_CACHE_EVICTIONS,
+    RETRIEVAL_CACHE_BYTES,
+    RETRIEVAL_CACHE_ENTRIES,
+)
+
+
+def vector_digest(vector) -> str:
+    """
+    Stable digest of a query vector.
+    Accepts numpy arrays (raw buffer) or plain float sequences.
+    """
+    if hasattr(vector, "tobytes"):
+        raw = vector.astype("float32", copy=False).tobytes()
+    else:
+        raw = array("f", vector).tobytes()
+
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _estimate_size(matches: list[dict]) -> int:
+    """
+    Rough memory footprint of a cached match list (bytes).
+    """
+    size = sys.getsizeof(matches)
+
+    for match in matches:
+        size += 200  # dict + id + score overhead
+        size += len(match.get("id", ""))
+
+        for key, value in match.get("metadata", {}).items():
+            size += 64 + len(key)
+            if isinstance(value, str):
+                size += len(value)
+
+        values = match.get("values")
+        if values is not None:
+            size += 8 * len(values)
+
+    return size
+
+
+class RetrievalCache:
+    """
+    In-process LRU cache for vector-store query results.
+
+    - Keyed by (namespace, query-vector digest, access rank, top_k, filter)
+    - Bounded by TTL, entry count and approximate memory
+    - Per-namespace generation counter: ingestion bumps it, so
+      results cached before new documents landed are never served
+
+    Not shared across worker processes; each worker invalidates
+    only on ingestions it handled itself (bounded by the TTL).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> (generation, expires_at, size, matches)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._bytes = 0
+
+    # -------------------------
+    # Generations
+    # -------------------------
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        """
+        Invalidate every cached result for a namespace.
+        """
+        generation = self.generation(namespace) + 1
+        self._generations[namespace] = generation
+        return generation
+
+    # -------------------------
+    # Lookup / Store
+    # -------------------------
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        vector,
+        access_rank: int,
+        top_k: int,
+        metadata_filter: dict | None,
+        include_values: bool = False,
+        include_metadata: bool = True,
+    ) -> tuple:
+        filter_key = (
+            json.dumps(metadata_filter, sort_keys=True)
+            if metadata_filter
+            else ""
+        )
+        return (
+            namespace,
+            vector_digest(vector),
+            access_rank,
+            top_k,
+            filter_key,
+            include_values,
+            include_metadata,
+        )
+
+    def get(self, key: tuple) -> list[dict] | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            RETRIEVAL_CACHE_MISSES.inc()
+            return None
+
+        generation, expires_at, _, matches = entry
+
+        if (
+            generation != self.generation(key[0])
+            or expires_at <= monotonic()
+        ):
+            self._remove(key)
+            RETRIEVAL_CACHE_MISSES.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        RETRIEVAL_CACHE_HITS.inc()
+        return matches
+
+    def put(self, key: tuple, matches: list[dict], generation: int):
+        """
+        Store results fetched while `generation` was current.
+        A stale generation (ingestion finished mid-query) is dropped.
+        """
+        if generation != self.generation(key[0]):
+            return
+
+        size = _estimate_size(matches)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (
+            generation,
+            monotonic() + self.ttl_seconds,
+            size,
+            matches,
+        )
+        self._bytes += size
+
+        while (
+            len(self._entries) > self.max_entries
+            or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            RETRIEVAL_CACHE_EVICTIONS.inc()
+
+        self._update_gauges()
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+            self._update_gauges()
+
+    def _update_gauges(self):
+        RETRIEVAL_CACHE_ENTRIES.set(len(self._entries))
+        RETRIEVAL_CACHE_BYTES.set(self._bytes)
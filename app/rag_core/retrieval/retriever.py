@@ -1,13 +1,285 @@
+import asyncio
+import heapq
+
+import numpy as np
+
+from app.rag_core.embeddings.reduction import VectorReducer
+from app.rag_core.retrieval.cache import RetrievalCache
+from app.rag_core.vectorstore.chunk_store import SQLiteChunkStore
+from app.utils.rag_utils import RAGUtils
+
+
+def _to_match_dict(match) -> dict:
+    """
+    Normalize a vector-store match (SDK object or dict) to a plain dict.
+    """
+    normalized = {
+        "id": match["id"],
+        "score": match["score"],
+        "metadata": dict(match.get("metadata") or {}),
+    }
+    values = match.get("values")
+    if values:
+        normalized["values"] = list(values)
+    return normalized
+
+
 class Retriever:
-    def __init__(self, pinecone_client):
+    """
+    Access-aware retrieval over one or many logical namespaces.
+
+    Layouts:
+    - filtered (default): one namespace per tenant, access enforced by a
+      `rag_access_level_rank <= rank` metadata filter
+    - partitioned: one namespace per (tenant, access level); only the
+      readable partitions are queried, in parallel, without a filter
+
+    With a chunk store, the vector store returns IDs/scores only and the
+    final top_k texts are bulk-loaded locally.
+
+    Callers holding chunks from earlier queries (chat sessions) pass them
+    as `known`: the vector store then returns IDs/scores only, known
+    chunks are reused and only new IDs are loaded (chunk store or
+    vector-store fetch).
+
+    With a reducer, the index holds reduced vectors and queries are
+    projected the same way. With rescore_fetch_k (and a chunk store holding
+    full vectors), that many candidates are over-fetched and re-ranked by
+    full-dimension cosine similarity before the top_k are kept.
+    """
+
+    def __init__(
+        self,
+        pinecone_client,
+        cache: RetrievalCache | None = None,
+        partitioned: bool = False,
+        chunk_store: SQLiteChunkStore | None = None,
+        reducer: VectorReducer | None = None,
+        rescore_fetch_k: int = 0,
+    ):
         self.pinecone = pinecone_client
+        self.cache = cache
+        self.partitioned = partitioned
+        self.chunk_store = chunk_store
+        self.reducer = reducer
+        # Rescoring needs the full vectors kept in the chunk store
+        self.rescore_fetch_k = (
+            rescore_fetch_k if reducer is not None and chunk_store is not None else 0
+        )
 
     async def retrieve(self, vector, namespace, access_rank, top_k=5):
-        return await self.pinecone.query(
+        return await self.retrieve_many(vector, [namespace], access_rank, top_k)
+
+    async def retrieve_many(
+        self,
+        vector,
+        namespaces,
+        access_rank,
+        top_k=5,
+        include_values=False,
+        known: dict[str, dict] | None = None,
+    ):
+        """
+        Fan out one query across several namespaces concurrently
+        and merge the global top_k by score.
+        With include_values, matches carry their vectors (for MMR).
+
+        :param known: chunk ID -> metadata (incl. "text") already held
+            by the caller
+        """
+        targets = self._targets(namespaces, access_rank)
+        include_metadata = self.chunk_store is None and known is None
+
+        rescore = self.rescore_fetch_k > top_k
+        fetch_k = self.rescore_fetch_k if rescore else top_k
+        query_vector = (
+            self.reducer.transform(vector).tolist()
+            if self.reducer is not None else vector
+        )
+
+        results = await asyncio.gather(*(
+            self._search(
+                query_vector, physical, access_rank, fetch_k, metadata_filter,
+                include_values, include_metadata,
+            )
+            for _, physical, metadata_filter in targets
+        ))
+
+        candidates = [
+            {**match, "namespace": logical}
+            for (logical, _, _), matches in zip(targets, results)
+            for match in matches
+        ]
+
+        if rescore:
+            candidates = await self._rescore(vector, candidates, top_k)
+        elif len(targets) > 1:
+            candidates = heapq.nlargest(
+                top_k, candidates, key=lambda match: match["score"]
+            )
+
+        if include_metadata:
+            return {"matches": candidates}
+
+        physical = {
+            match["id"]: namespace
+            for (_, namespace, _), matches in zip(targets, results)
+            for match in matches
+        }
+        return await self._hydrate(candidates, physical, known or {})
+
+    def invalidate(self, namespace: str):
+        """
+        Called after new vectors land in a (physical) namespace.
+        """
+        if self.cache is not None:
+            self.cache.bump_generation(namespace)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _targets(self, namespaces, access_rank) -> list[tuple]:
+        """
+        (logical namespace, physical namespace, metadata filter) per query.
+        """
+        if self.partitioned:
+            return [
+                (namespace, partition, None)
+                for namespace in namespaces
+                for partition in RAGUtils.readable_partitions(
+                    namespace, access_rank
+                )
+            ]
+
+        metadata_filter = {
+            "rag_access_level_rank": {"$lte": access_rank}
+        }
+        return [
+            (namespace, namespace, metadata_filter)
+            for namespace in namespaces
+        ]
+
+    async def _search(
+        self, vector, namespace, access_rank, top_k, metadata_filter,
+        include_values=False, include_metadata=True,
+    ) -> list[dict]:
+        if self.cache is None:
+            return await self._query(
+                vector, namespace, top_k, metadata_filter,
+                include_values, include_metadata,
+            )
+
+        # Unfiltered partition results do not depend on the caller's rank,
+        # so they are shared across ranks.
+        key_rank = access_rank if metadata_filter else 0
+        key = self.cache.make_key(
+            namespace, vector, key_rank, top_k, metadata_filter,
+            include_values, include_metadata,
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Captured before the query so results racing an ingestion
+        # are stored under the old generation and never served.
+        generation = self.cache.generation(namespace)
+
+        matches = await self._query(
+            vector, namespace, top_k, metadata_filter,
+            include_values, include_metadata,
+        )
+        self.cache.put(key, matches, generation)
+
+        return matches
+
+    async def _rescore(self, vector, matches: list[dict], top_k: int) -> list[dict]:
+        """
+        Re-rank candidates by cosine similarity of the full-dimension query
+        and chunk vectors. Full and reduced-space scores are not comparable,
+        so candidates are only rescored when every one has a full vector
+        (chunks stored before the vector column existed have none).
+        """
+        full = await self.chunk_store.get_vectors([match["id"] for match in matches])
+
+        if matches and all(match["id"] in full for match in matches):
+            query = np.asarray(vector, dtype=np.float32)
+            matrix = np.stack([full[match["id"]] for match in matches])
+            scores = matrix @ query / np.maximum(
+                np.linalg.norm(matrix, axis=1) * np.linalg.norm(query), 1e-12
+            )
+            for match, score in zip(matches, scores):
+                match["score"] = float(score)
+
+        return heapq.nlargest(top_k, matches, key=lambda match: match["score"])
+
+    async def _hydrate(
+        self, matches: list[dict], physical: dict[str, str], known: dict[str, dict]
+    ) -> dict:
+        """
+        Attach chunk text + metadata: from `known`, else the local chunk
+        store, else a vector-store fetch. Matches without a chunk are dropped.
+        """
+        missing = [match["id"] for match in matches if match["id"] not in known]
+        loaded = await self._load_chunks(missing, physical) if missing else {}
+
+        hydrated = []
+        for match in matches:
+            metadata = known.get(match["id"]) or loaded.get(match["id"])
+            if metadata is None:
+                continue
+            match["metadata"] = dict(metadata)
+            hydrated.append(match)
+
+        return {
+            "matches": hydrated,
+            "reused": len(matches) - len(missing),
+            "fetched": len(loaded),
+        }
+
+    async def _load_chunks(
+        self, ids: list[str], physical: dict[str, str]
+    ) -> dict[str, dict]:
+        if self.chunk_store is not None:
+            chunks = await self.chunk_store.get_many(ids)
+            return {
+                chunk_id: {**chunk["metadata"], "text": chunk["text"]}
+                for chunk_id, chunk in chunks.items()
+            }
+
+        by_namespace: dict[str, list[str]] = {}
+        for chunk_id in ids:
+            by_namespace.setdefault(physical[chunk_id], []).append(chunk_id)
+
+        fetched = await asyncio.gather(*(
+            self.pinecone.fetch(namespace_ids, namespace)
+            for namespace, namespace_ids in by_namespace.items()
+        ))
+        return {
+            chunk_id: vector["metadata"]
+            for vectors in fetched
+            for chunk_id, vector in vectors.items()
+        }
+
+    async def _query(
+        self, vector, namespace, top_k, metadata_filter,
+        include_values=False, include_metadata=True,
+    ) -> list[dict]:
+        query = dict(
             vector=vector,
             namespace=namespace,
             top_k=top_k,
-            metadata_filter={
-                "rag_access_level_rank": {"$lte": access_rank}
-            },
+            include_metadata=include_metadata,
+            metadata_filter=metadata_filter,
         )
+        # Only passed when needed, so plain clients keep working
+        if include_values:
+            query["include_values"] = True
+
+        result = await self.pinecone.query(**query)
+
+        return [
+            _to_match_dict(match)
+            for match in result.get("matches", [])
+        ]
@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate LLM prompt tokens (~4 characters per token).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def mmr(scores: np.ndarray, vectors: np.ndarray, k: int, lambda_: float) -> list[int]:
+    """
+    Greedy maximal marginal relevance over candidate vectors.
+
+    Each step picks the candidate maximizing
+    `lambda_ * relevance - (1 - lambda_) * max similarity to the picked set`.
+    The pairwise similarity matrix is computed once; each step is a
+    vectorized update of the running max.
+
+    :param scores: (n,) relevance to the query (vector-store scores)
+    :param vectors: (n, d) candidate vectors
+    :return: selected positions, in selection order
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = unit @ unit.T
+
+    redundancy = np.zeros(n, dtype=similarity.dtype)
+    available = np.ones(n, dtype=bool)
+    selected = []
+
+    for _ in range(k):
+        marginal = lambda_ * scores - (1 - lambda_) * redundancy
+        marginal[~available] = -np.inf
+
+        best = int(np.argmax(marginal))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected
+
+
+def _prompt_tokens(matches: list[dict]) -> int:
+    return sum(
+        estimate_tokens(match.get("metadata", {}).get("text", ""))
+        for match in matches
+    )
+
+
+def select_matches(
+    matches: list[dict],
+    top_k: int,
+    min_score: float | None = None,
+    adaptive_ratio: float | None = None,
+    mmr_lambda: float | None = None,
+) -> tuple[list[dict], dict]:
+    """
+    Choose the matches that go into the prompt.
+
+    1. min_score: drop matches scoring below an absolute cutoff
+    2. adaptive_ratio: drop matches scoring below ratio * best score
+    3. mmr_lambda: pick top_k by MMR (needs "values" on every match),
+       otherwise the top_k by score
+
+    Savings are measured against the plain top_k by score.
+
+    :return: (selected matches, selection stats)
+    """
+    ranked = sorted(matches, key=lambda match: match["score"], reverse=True)
+    baseline = ranked[:top_k]
+    candidates = ranked
+
+    if min_score is not None:
+        candidates = [m for m in candidates if m["score"] >= min_score]
+    below_min_score = len(ranked) - len(candidates)
+
+    if adaptive_ratio is not None and candidates and candidates[0]["score"] > 0:
+        floor = candidates[0]["score"] * adaptive_ratio
+        candidates = [m for m in candidates if m["score"] >= floor]
+
+    if (
+        mmr_lambda is not None
+        and len(candidates) > 1
+        and all("values" in m for m in candidates)
+    ):
+        order = mmr(
+            np.fromiter((m["score"] for m in candidates), dtype=np.float32, count=len(candidates)),
+            np.asarray([m["values"] for m in candidates], dtype=np.float32),
+            top_k,
+            mmr_lambda,
+        )
+        selected = [candidates[i] for i in order]
+    else:
+        selected = candidates[:top_k]
+
+    return selected, {
+        "candidates": len(ranked),
+        "below_min_score": below_min_score,
+        "selected": len(selected),
+        "contexts_saved": len(baseline) - len(selected),
+        "prompt_tokens_saved": _prompt_tokens(baseline) - _prompt_tokens(selected),
+    }
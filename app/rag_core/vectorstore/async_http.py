@@ -0,0 +1,113 @@
+import httpx
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncPineconeDataPlane:
+    """
+    asyncio-native Pinecone data-plane client.
+
+    - Talks to the index REST API directly over a pooled httpx client
+    - No executor threads: concurrency is bounded by the connection pool
+    - Opened/closed by the application lifespan
+    """
+
+    def __init__(
+        self,
+        host: str,
+        api_key: str,
+        pool_size: int = 100,
+        timeout_seconds: float = 10.0,
+        api_version: str = "2025-04",
+    ):
+        if not host.startswith(("http://", "https://")):
+            host = f"https://{host}"
+
+        self.host = host.rstrip("/")
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout_seconds = timeout_seconds
+        self.api_version = api_version
+
+        self._client: httpx.AsyncClient | None = None
+
+    async def open(self):
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            base_url=self.host,
+            headers={
+                "Api-Key": self.api_key,
+                "Content-Type": "application/json",
+                "X-Pinecone-API-Version": self.api_version,
+            },
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+            timeout=httpx.Timeout(
+                self.timeout_seconds,
+                # Waiting for a pooled connection is part of the budget
+                pool=self.timeout_seconds,
+            ),
+        )
+
+        logger.info(
+            "Pinecone async data plane opened | host=%s | pool_size=%d",
+            self.host,
+            self.pool_size,
+        )
+
+    async def close(self):
+        if self._client is None:
+            return
+
+        await self._client.aclose()
+        self._client = None
+
+        logger.info("Pinecone async data plane closed | host=%s", self.host)
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None
+
+    async def upsert(self, vectors: list, namespace: str) -> dict:
+        response = await self._client.post(
+            "/vectors/upsert",
+            json={"vectors": vectors, "namespace": namespace},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def query(
+        self,
+        vector: list,
+        namespace: str,
+        top_k: int = 5,
+        include_metadata: bool = True,
+        include_values: bool = False,
+        metadata_filter: dict | None = None,
+    ) -> dict:
+        body = {
+            "vector": vector,
+            "namespace": namespace,
+            "topK": top_k,
+            "includeMetadata": include_metadata,
+            "includeValues": include_values,
+        }
+        if metadata_filter:
+            body["filter"] = metadata_filter
+
+        response = await self._client.post("/query", json=body)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch(self, ids: list[str], namespace: str) -> dict:
+        response = await self._client.get(
+            "/vectors/fetch",
+            params={"ids": ids, "namespace": namespace},
+        )
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQLite's default host-parameter limit is 999
+_MAX_PARAMS = 500
+
+
+class SQLiteChunkStore:
+    """
+    Local chunk-text store keyed by vector ID.
+
+    - Chunk text (and display metadata) lives here instead of in
+      vector-store metadata, keeping upserts and query responses small
+    - Written during ingestion, bulk-read after retrieval
+    - WAL mode, so several worker processes can share one file
+    - Blocking SQLite calls run in worker threads
+    - Optionally the full-dimension float32 vector per chunk, for
+      rescoring when the index holds reduced vectors
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        if self._conn is not None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chunks_document "
+            "ON chunks(document_id)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+        if "vector" not in columns:
+            # Stores created before full-vector rescoring
+            self._conn.execute("ALTER TABLE chunks ADD COLUMN vector BLOB")
+        self._conn.commit()
+
+        logger.info("Chunk store opened | path=%s", self.path)
+
+    def close(self):
+        if self._conn is None:
+            return
+
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+        logger.info("Chunk store closed | path=%s", self.path)
+
+    # -------------------------
+    # Async Operations
+    # -------------------------
+
+    async def put_many(
+        self,
+        rows: list[tuple[str, str, str, dict]],
+        vectors: np.ndarray | None = None,
+    ):
+        """
+        Store (vector_id, document_id, text, metadata) rows, plus each
+        row's full-dimension vector when `vectors` is given.
+        """
+        await asyncio.to_thread(self._put_many_sync, rows, vectors)
+
+    async def get_many(self, ids: list[str]) -> dict[str, dict]:
+        """
+        Bulk-load chunks by vector ID.
+        Returns {id: {"text": ..., "metadata": {...}}} for IDs found.
+        """
+        if not ids:
+            return {}
+        return await asyncio.to_thread(self._get_many_sync, ids)
+
+    async def get_vectors(self, ids: list[str]) -> dict[str, np.ndarray]:
+        """
+        Full-dimension float32 vectors by ID (IDs stored without one are absent).
+        """
+        if not ids:
+            return {}
+        return await asyncio.to_thread(self._get_vectors_sync, ids)
+
+    async def sample_texts(self, limit: int) -> list[str]:
+        """
+        Up to `limit` random chunk texts (e.g. to fit a projection).
+        """
+        return await asyncio.to_thread(self._sample_texts_sync, limit)
+
+    # -------------------------
+    # Sync internals (worker thread)
+    # -------------------------
+
+    def _ensure_open(self):
+        if self._conn is None:
+            raise RuntimeError(
+                "SQLiteChunkStore not opened. Call open() at startup."
+            )
+
+    def _put_many_sync(
+        self,
+        rows: list[tuple[str, str, str, dict]],
+        vectors: np.ndarray | None = None,
+    ):
+        self._ensure_open()
+
+        if vectors is None:
+            blobs = [None] * len(rows)
+        else:
+            blobs = [
+                row.tobytes()
+                for row in np.asarray(vectors, dtype=np.float32)
+            ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, document_id, text, metadata, vector) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (vector_id, document_id, text, json.dumps(metadata), blob)
+                    for (vector_id, document_id, text, metadata), blob in zip(rows, blobs)
+                ),
+            )
+            self._conn.commit()
+
+    def _get_many_sync(self, ids: list[str]) -> dict[str, dict]:
+        self._ensure_open()
+
+        found: dict[str, dict] = {}
+
+        with self._lock:
+            for i in range(0, len(ids), _MAX_PARAMS):
+                batch = ids[i : i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+
+                cursor = self._conn.execute(
+                    f"SELECT id, text, metadata FROM chunks "
+                    f"WHERE id IN ({placeholders})",
+                    batch,
+                )
+                for vector_id, text, metadata in cursor:
+                    found[vector_id] = {
+                        "text": text,
+                        "metadata": json.loads(metadata),
+                    }
+
+        return found
+
+    def _get_vectors_sync(self, ids: list[str]) -> dict[str, np.ndarray]:
+        self._ensure_open()
+
+        found: dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for i in range(0, len(ids), _MAX_PARAMS):
+                batch = ids[i : i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+
+                cursor = self._conn.execute(
+                    f"SELECT id, vector FROM chunks "
+                    f"WHERE id IN ({placeholders}) AND vector IS NOT NULL",
+                    batch,
+                )
+                for vector_id, blob in cursor:
+                    found[vector_id] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def _sample_texts_sync(self, limit: int) -> list[str]:
+        self._ensure_open()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT text FROM chunks ORDER BY RANDOM() LIMIT ?",
+                (limit,),
+            )
+            return [text for (text,) in cursor]
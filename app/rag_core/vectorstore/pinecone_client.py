@@ -1,16 +1,29 @@
 import asyncio
-from pinecone import Pinecone, ServerlessSpec
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.rag_core.vectorstore.async_http import AsyncPineconeDataPlane
 
 logger = get_logger(__name__)
 
 
+def _serialize_batch(vectors: list) -> list:
+    """
+    Plain-list values for one upsert batch. Embeddings stay numpy rows
+    until here, so only `batch_size` vectors of Python floats exist at once.
+    """
+    return [
+        {**vector, "values": vector["values"].tolist()}
+        if hasattr(vector["values"], "tolist") else vector
+        for vector in vectors
+    ]
+
+
 class PineconeClient:
     """
     Singleton Pinecone client.
     - Index is created/validated at startup
-    - Async-safe upsert/query via executor
+    - Native async upsert/query over a pooled HTTP client once open()ed
+    - Falls back to the sync SDK via executor otherwise
     """
 
     _instance = None
@@ -19,6 +32,7 @@ class PineconeClient:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
+            cls._instance._data_plane = None
         return cls._instance
 
     def initialize(self):
@@ -29,33 +43,70 @@ class PineconeClient:
         if self._initialized:
             return
 
+        # The SDK is only needed from here on
+        from pinecone import Pinecone, ServerlessSpec
+
         logger.info("Initializing Pinecone client")
 
         self._pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 
-        existing_indexes = [
-            idx["name"] for idx in self._pc.list_indexes()
-        ]
+        if settings.PINECONE_INDEX_HOST:
+            # Direct data-plane host (e.g. Pinecone Local / stand-in),
+            # skips control-plane index management
+            self._host = settings.PINECONE_INDEX_HOST
+        else:
+            existing_indexes = [
+                idx["name"] for idx in self._pc.list_indexes()
+            ]
+
+            if settings.PINECONE_INDEX_NAME not in existing_indexes:
+                logger.info(
+                    "Creating Pinecone index: %s",
+                    settings.PINECONE_INDEX_NAME,
+                )
+
+                self._pc.create_index(
+                    name=settings.PINECONE_INDEX_NAME,
+                    dimension=settings.vector_dimension,
+                    metric="cosine",
+                    spec=ServerlessSpec(
+                        cloud=settings.PINECONE_CLOUD,
+                        region=settings.PINECONE_REGION,
+                    ),
+                )
+
+            self._host = self._pc.describe_index(
+                settings.PINECONE_INDEX_NAME
+            ).host
+
+        self._index = self._pc.Index(host=self._host)
+        self._initialized = True
 
-        if settings.PINECONE_INDEX_NAME not in existing_indexes:
-            logger.info(
-                f"Creating Pinecone index: {settings.PINECONE_INDEX_NAME}"
-            )
+        logger.info("Pinecone index is ready")
 
-            self._pc.create_index(
-                name=settings.PINECONE_INDEX_NAME,
-                dimension=settings.EMBEDDING_DIMENSION,
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud=settings.PINECONE_CLOUD,
-                    region=settings.PINECONE_REGION,
-                ),
-            )
+    async def open(self):
+        """
+        Open the pooled async data-plane client.
+        Called from the application lifespan after initialize().
+        """
+        if not settings.PINECONE_ASYNC_HTTP or self._data_plane is not None:
+            return
 
-        self._index = self._pc.Index(settings.PINECONE_INDEX_NAME)
-        self._initialized = True
+        self._data_plane = AsyncPineconeDataPlane(
+            host=self._host,
+            api_key=settings.PINECONE_API_KEY,
+            pool_size=settings.PINECONE_POOL_SIZE,
+            timeout_seconds=settings.PINECONE_TIMEOUT_SECONDS,
+            api_version=settings.PINECONE_API_VERSION,
+        )
+        await self._data_plane.open()
 
-        logger.info("Pinecone index is ready")
+    async def close(self):
+        if self._data_plane is None:
+            return
+
+        await self._data_plane.close()
+        self._data_plane = None
 
     # -------------------------
     # Async Operations
@@ -79,7 +130,11 @@ class PineconeClient:
         loop = asyncio.get_running_loop()
 
         for i in range(0, len(vectors), batch_size):
-            batch = vectors[i : i + batch_size]
+            batch = _serialize_batch(vectors[i : i + batch_size])
+
+            if self._data_plane is not None:
+                await self._data_plane.upsert(batch, namespace)
+                continue
 
             await loop.run_in_executor(
                 None,
@@ -90,7 +145,9 @@ class PineconeClient:
             )
 
         logger.info(
-            f"Upsert completed | vectors={len(vectors)} | namespace={namespace}"
+            "Upsert completed | vectors=%d | namespace=%s",
+            len(vectors),
+            namespace,
         )
 
     async def query(
@@ -100,6 +157,7 @@ class PineconeClient:
     top_k: int = 5,
     include_metadata: bool = True,
     metadata_filter: dict | None = None,
+    include_values: bool = False,
     ):
 
         """
@@ -111,6 +169,16 @@ class PineconeClient:
                 "Call initialize() at startup."
             )
 
+        if self._data_plane is not None:
+            return await self._data_plane.query(
+                vector=vector,
+                namespace=namespace,
+                top_k=top_k,
+                include_metadata=include_metadata,
+                include_values=include_values,
+                metadata_filter=metadata_filter,
+            )
+
         loop = asyncio.get_running_loop()
 
         result = await loop.run_in_executor(
@@ -120,8 +188,43 @@ class PineconeClient:
                 top_k=top_k,
                 namespace=namespace,
                 include_metadata=include_metadata,
+                include_values=include_values,
                 filter=metadata_filter,
             ),
         )
 
         return result
+
+    async def fetch(self, ids: list[str], namespace: str) -> dict:
+        """
+        Async fetch of stored vectors by ID.
+
+        :return: {id: {"id", "metadata"}} for the IDs found
+        """
+        if not self._initialized:
+            raise RuntimeError(
+                "PineconeClient not initialized. "
+                "Call initialize() at startup."
+            )
+
+        if not ids:
+            return {}
+
+        if self._data_plane is not None:
+            result = await self._data_plane.fetch(ids, namespace)
+            vectors = result.get("vectors", {})
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                lambda: self._index.fetch(ids=ids, namespace=namespace),
+            )
+            vectors = result.vectors
+
+        return {
+            vector_id: {
+                "id": vector_id,
+                "metadata": dict(vector.get("metadata") or {}),
+            }
+            for vector_id, vector in vectors.items()
+        }
@@ -1,15 +1,24 @@
+import asyncio
 from fastapi import WebSocket
 from time import perf_counter
 from app.core.config import settings
+from app.core.deadline import Deadline, StageTimeoutError
 from app.core.logger import get_logger
+from app.core.tracing import Trace, current_request_id, new_request_id
 from app.rag_core.chain.rag_chain import RAGChain
+from app.rag_core.llm.admission import LLMOverloadedError
+from app.rag_core.retrieval.selection import select_matches
+from app.service.chat_session import ChatSession
 from app.core.metrics import (
     CHAT_REQUESTS_TOTAL,
     CHAT_ERRORS_TOTAL,
     EMBEDDING_LATENCY,
     RETRIEVAL_LATENCY,
     RETRIEVED_CONTEXTS,
+    RETRIEVAL_CONTEXTS_SAVED,
+    RETRIEVAL_PROMPT_TOKENS_SAVED,
     CHAT_TOTAL_LATENCY,
+    CHAT_PHASE_LATENCY,
     LLM_FIRST_TOKEN_LATENCY,
 )
 from app.utils.rag_utils import RAGUtils
@@ -26,70 +35,187 @@ class ChatService:
     async def handle_chat(
         ws: WebSocket,
         payload: dict,
+        request_id: str | None = None,
+        session: ChatSession | None = None,
     ):
-        start_time = perf_counter()
+        trace = Trace(request_id or new_request_id())
 
+        with trace.activate():
+            try:
+                await ChatService._handle_chat(ws, payload, trace, session)
+            finally:
+                duration = trace.finish()
+                # Labelled with the registry model that served the request
+                # ("unknown" if rejected before one was resolved)
+                CHAT_REQUESTS_TOTAL.labels(model=trace.model).inc()
+                CHAT_TOTAL_LATENCY.labels(model=trace.model).observe(
+                    duration, exemplar=trace.exemplar()
+                )
+                ws.app.state.traces.offer(trace)
+
+    @staticmethod
+    async def _handle_chat(
+        ws: WebSocket,
+        payload: dict,
+        trace: Trace,
+        session: ChatSession | None = None,
+    ):
         query = payload.get("query")
-        namespace = payload.get("namespace")
         model_name = payload.get("model")
 
         if not query:
             CHAT_ERRORS_TOTAL.inc()
+            trace.status = "invalid"
             await ws.send_json({
                 "event_type": "error",
                 "message": "Query is required",
             })
             return
 
-        # -------------------------
-        # Metrics: request count
-        # -------------------------
-        CHAT_REQUESTS_TOTAL.labels(model=model_name).inc()
+        try:
+            namespaces = RAGUtils.resolve_namespaces(
+                payload.get("namespaces") or payload.get("namespace"),
+                raise_http=False,
+            )
+        except ValueError as exc:
+            CHAT_ERRORS_TOTAL.inc()
+            trace.status = "invalid"
+            await ws.send_json({
+                "event_type": "error",
+                "message": str(exc),
+            })
+            return
+
+        namespace = ",".join(namespaces)
+        top_k = settings.RETRIEVAL_TOP_K
+        use_mmr = settings.RETRIEVAL_MMR_ENABLED
+        deadline = Deadline(ChatService._resolve_deadline(payload))
+        mode = "pipelined" if settings.CHAT_PIPELINED else "serial"
+        warm_task = None
 
         # -------------------------
         # Fetch shared resources
         # -------------------------
         embedder = ws.app.state.embedder
-        pinecone = ws.app.state.pinecone
+        retriever = ws.app.state.retriever
         llm_registry = ws.app.state.llms
 
+        trace.attrs["namespace"] = namespace
+
+        if session is not None and payload.get("reset_session"):
+            session.reset()
+
         logger.info(
-            "Chat request received | namespace=%s | model=%s",
+            "Chat request received | request_id=%s | namespace=%s | model=%s",
+            trace.request_id,
             namespace,
             model_name,
         )
 
         try:
+            level, access_rank = RAGUtils.validate_rag_access_level(
+                rag_access_level=payload.get("rag_access_level","public"),
+                raise_http=False,
+            )
+
             # -------------------------
-            # 1. Embed query
+            # 0. Fetch preloaded LLM; in pipelined mode its upstream
+            #    connection is warmed while we embed and retrieve
             # -------------------------
-            with EMBEDDING_LATENCY.time():
-                query_vector = await embedder.embed_query(query)
+            llm_client = llm_registry.get(model_name)
+
+            if not llm_client:
+                CHAT_ERRORS_TOTAL.inc()
+                trace.status = "invalid"
+                logger.error(
+                    "Requested model not found in registry | model=%s",
+                    model_name,
+                )
+                await ws.send_json({
+                    "event_type": "error",
+                    "message": "Requested model not available",
+                })
+                return
+
+            # Label per-model metrics with the model that serves the request,
+            # also when the payload relies on the default
+            model_name = llm_client.model
+            trace.model = model_name
+
+            if settings.CHAT_PIPELINED:
+                warm_task = asyncio.create_task(llm_client.warm())
 
             # -------------------------
-            # 2. Vector retrieval (Pinecone)
+            # 1-2. Embed query + vector retrieval
+            # Overrunning either degrades to answering without context,
+            # keeping budget in reserve for the LLM.
             # -------------------------
-            level, access_rank = RAGUtils.validate_rag_access_level(
-                rag_access_level=payload.get("rag_access_level","public"),
-                raise_http=False,
-            )
+            try:
+                with trace.span("embed") as embed_span, EMBEDDING_LATENCY.time():
+                    query_vector = await deadline.run(
+                        "embedding",
+                        embedder.embed_query(query),
+                        cap=settings.CHAT_EMBEDDING_TIMEOUT_SECONDS,
+                        reserve=settings.CHAT_LLM_RESERVE_SECONDS,
+                    )
+                CHAT_PHASE_LATENCY.labels(phase="embedding", mode=mode).observe(
+                    embed_span.duration
+                )
 
-            with RETRIEVAL_LATENCY.time():
-                result = await pinecone.query(
-                    vector=query_vector,
-                    namespace=settings.NAME_SPACE,
-                    top_k=5,
-                    include_metadata=True,
-                    metadata_filter={
-                        "rag_access_level_rank": {"$lte": access_rank}
-                    },
+                # A near-identical follow-up reuses the session's last retrieval
+                result = (
+                    session.reusable_result(query_vector, namespaces, access_rank)
+                    if session is not None else None
                 )
+                trace.attrs["retrieval_reused"] = result is not None
 
-            matches = result.get("matches", [])
+                if result is None:
+                    with trace.span("retrieve") as retrieve_span, RETRIEVAL_LATENCY.time():
+                        result = await deadline.run(
+                            "retrieval",
+                            retriever.retrieve_many(
+                                vector=query_vector,
+                                namespaces=namespaces,
+                                access_rank=access_rank,
+                                top_k=max(top_k, settings.RETRIEVAL_MMR_FETCH_K) if use_mmr else top_k,
+                                include_values=use_mmr,
+                                # Only new chunk IDs are loaded
+                                known=session.chunks if session is not None and session.chunks else None,
+                            ),
+                            cap=settings.CHAT_RETRIEVAL_TIMEOUT_SECONDS,
+                            reserve=settings.CHAT_LLM_RESERVE_SECONDS,
+                        )
+                    CHAT_PHASE_LATENCY.labels(phase="retrieval", mode=mode).observe(
+                        retrieve_span.duration
+                    )
+
+                    if session is not None:
+                        session.record_retrieval(
+                            query_vector, namespaces, access_rank, result
+                        )
+
+            except StageTimeoutError as exc:
+                trace.attrs["degraded"] = exc.stage
+                await ChatService._send_timeout(ws, exc, deadline, degraded=True)
+                result = {}
+
+            matches, selection = select_matches(
+                result.get("matches", []),
+                top_k=top_k,
+                min_score=settings.RETRIEVAL_MIN_SCORE,
+                adaptive_ratio=settings.RETRIEVAL_ADAPTIVE_RATIO,
+                mmr_lambda=settings.RETRIEVAL_MMR_LAMBDA if use_mmr else None,
+            )
+            trace.attrs["matches"] = len(matches)
+            trace.attrs["contexts_saved"] = selection["contexts_saved"]
+            trace.attrs["prompt_tokens_saved"] = selection["prompt_tokens_saved"]
+            RETRIEVAL_CONTEXTS_SAVED.inc(max(selection["contexts_saved"], 0))
+            RETRIEVAL_PROMPT_TOKENS_SAVED.observe(max(selection["prompt_tokens_saved"], 0))
 
             logger.info(
-                "Vector retrieval completed | namespace=%s | matches=%d",
+                "Vector retrieval completed | namespace=%s | candidates=%d | matches=%d",
                 namespace,
+                selection["candidates"],
                 len(matches),
             )
 
@@ -117,25 +243,19 @@ class ChatService:
                 )
 
             # -------------------------
-            # 3. Fetch preloaded LLM
+            # 3. Upstream connection ready (pipelined mode)
             # -------------------------
-            llm_client = llm_registry.get(model_name)
-
-            if not llm_client:
-                CHAT_ERRORS_TOTAL.inc()
-                logger.error(
-                    "Requested model not found in registry | model=%s",
-                    model_name,
+            if warm_task is not None:
+                with trace.span("llm_connect_wait") as connect_span:
+                    await asyncio.wait({warm_task}, timeout=deadline.remaining())
+                CHAT_PHASE_LATENCY.labels(phase="llm_connect_wait", mode=mode).observe(
+                    connect_span.duration
                 )
-                await ws.send_json({
-                    "event_type": "error",
-                    "message": "Requested model not available",
-                })
-                return
 
             # -------------------------
             # 4. Streaming RAG chain
             # -------------------------
+            deadline.check("prompt")
             rag_chain = RAGChain(llm_client)
 
             logger.info(
@@ -144,24 +264,67 @@ class ChatService:
                 len(contexts),
             )
 
+            history = session.history() if session is not None else None
+            answer = []
             first_token = True
+            tokens = 0
+            send_seconds = 0.0
             llm_start = perf_counter()
+            first_token_at = llm_start
+
+            token_stream = deadline.stream(
+                rag_chain.stream(query, contexts, history),
+                first_stage="llm_first_token",
+                next_stage="llm_stream",
+                first_cap=settings.CHAT_FIRST_TOKEN_TIMEOUT_SECONDS,
+            )
 
-            async for token in rag_chain.stream(query, contexts):
+            async for token in token_stream:
                 if first_token:
-                    LLM_FIRST_TOKEN_LATENCY.observe(
-                        perf_counter() - llm_start
+                    first_token_at = perf_counter()
+                    trace.record("first_token", llm_start, first_token_at - llm_start)
+                    LLM_FIRST_TOKEN_LATENCY.labels(model=model_name).observe(
+                        first_token_at - llm_start, exemplar=trace.exemplar()
+                    )
+                    CHAT_PHASE_LATENCY.labels(phase="llm_first_token", mode=mode).observe(
+                        first_token_at - llm_start
+                    )
+                    CHAT_PHASE_LATENCY.labels(phase="time_to_first_token", mode=mode).observe(
+                        trace.elapsed()
                     )
                     first_token = False
 
+                tokens += 1
+                answer.append(token)
+                send_start = perf_counter()
                 await ws.send_json({
                     "event_type": "chat_stream",
                     "token": token,
                 })
+                send_seconds += perf_counter() - send_start
 
-            await ws.send_json({
+            # Time from first to last token; "send" is the part of it
+            # spent writing to the socket
+            trace.record(
+                "stream", first_token_at, perf_counter() - first_token_at,
+                tokens=tokens,
+            )
+            trace.record("send", first_token_at, send_seconds, messages=tokens)
+
+            if session is not None:
+                session.add_turn(query, "".join(answer))
+
+            complete = {
                 "event_type": "chat_complete",
-            })
+                "request_id": trace.request_id,
+            }
+            if payload.get("include_timings"):
+                complete["timings_ms"] = trace.span_durations()
+            if payload.get("include_retrieval_stats"):
+                complete["retrieval"] = selection
+                if session is not None:
+                    complete["session"] = session.stats()
+            await ws.send_json(complete)
 
             logger.info(
                 "Chat completed | namespace=%s | model=%s",
@@ -169,20 +332,85 @@ class ChatService:
                 model_name,
             )
 
+        except StageTimeoutError as exc:
+            # Terminal: no budget left to produce (the rest of) an answer
+            CHAT_ERRORS_TOTAL.inc()
+            trace.status = "timeout"
+            await ChatService._send_timeout(ws, exc, deadline, degraded=False)
+
+        except LLMOverloadedError as exc:
+            # Shed fast: the client may retry or pick another model
+            CHAT_ERRORS_TOTAL.inc()
+            trace.status = "overloaded"
+            logger.warning(
+                "Chat shed by admission control | model=%s | reason=%s",
+                exc.model,
+                exc.reason,
+            )
+            await ws.send_json({
+                "event_type": "error",
+                "code": "overloaded",
+                "message": "Model is overloaded, please retry shortly",
+                "model": exc.model,
+                "request_id": trace.request_id,
+            })
+
         except Exception as exc:
             CHAT_ERRORS_TOTAL.inc()
+            trace.status = "error"
             logger.exception(
-                "Chat processing failed | namespace=%s | model=%s",
+                "Chat processing failed | request_id=%s | namespace=%s | model=%s",
+                trace.request_id,
                 namespace,
                 model_name,
             )
             await ws.send_json({
                 "event_type": "error",
                 "message": "Internal server error",
+                "request_id": trace.request_id,
             })
             raise exc
 
         finally:
-            CHAT_TOTAL_LATENCY.observe(
-                perf_counter() - start_time
-            )
+            if warm_task is not None and not warm_task.done():
+                warm_task.cancel()
+
+    @staticmethod
+    def _resolve_deadline(payload: dict) -> float:
+        """
+        Request deadline in seconds: payload `deadline_ms` (capped) or default.
+        """
+        deadline_ms = payload.get("deadline_ms")
+
+        try:
+            seconds = float(deadline_ms) / 1000 if deadline_ms else None
+        except (TypeError, ValueError):
+            seconds = None
+
+        if not seconds or seconds <= 0:
+            return settings.CHAT_DEADLINE_SECONDS
+
+        return min(seconds, settings.CHAT_MAX_DEADLINE_SECONDS)
+
+    @staticmethod
+    async def _send_timeout(
+        ws: WebSocket,
+        exc: StageTimeoutError,
+        deadline: Deadline,
+        degraded: bool,
+    ):
+        logger.warning(
+            "Chat stage timed out | stage=%s | budget=%.3f | elapsed=%.3f | degraded=%s",
+            exc.stage,
+            exc.budget,
+            deadline.elapsed(),
+            degraded,
+        )
+        await ws.send_json({
+            "event_type": "timeout",
+            "stage": exc.stage,
+            "degraded": degraded,
+            "elapsed_ms": round(deadline.elapsed() * 1000),
+            "deadline_ms": round(deadline.seconds * 1000),
+            "request_id": current_request_id(),
+        })
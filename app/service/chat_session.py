@@ -0,0 +1,152 @@
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import (
+    CHAT_SESSION_RETRIEVALS_AVOIDED,
+    CHAT_SESSION_RETRIEVALS_AVOIDED_PER_SESSION,
+    CHAT_SESSION_CHUNKS,
+)
+from app.rag_core.retrieval.selection import estimate_tokens
+
+
+class ChatSession:
+    """
+    Conversation state for one WebSocket connection.
+
+    - recent (query, answer) turns for a bounded multi-turn prompt
+    - chunks retrieved so far (ID -> metadata incl. text, LRU-bounded),
+      so follow-up retrievals only load new IDs
+    - the last query vector and its matches: with reuse_similarity set,
+      a follow-up that embeds close enough to it, over the same
+      namespaces/access rank, reuses them without querying the vector store
+
+    Chunk IDs are per ingestion, so a stored chunk never changes; documents
+    ingested after a reused retrieval show up on the next real retrieval.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 6,
+        max_chunks: int = 256,
+        history_tokens: int = 1024,
+        reuse_similarity: float | None = None,
+    ):
+        self.max_chunks = max_chunks
+        self.history_tokens = history_tokens
+        self.reuse_similarity = reuse_similarity
+
+        self.turns: deque[tuple[str, str]] = deque(maxlen=max_turns)
+        self.chunks: OrderedDict[str, dict] = OrderedDict()
+
+        self._last_vector: np.ndarray | None = None
+        self._last_scope: tuple | None = None
+        self._last_result: dict | None = None
+
+        self.retrievals = 0
+        self.retrievals_avoided = 0
+        self.chunks_reused = 0
+        self.chunks_fetched = 0
+
+    @classmethod
+    def from_settings(cls) -> "ChatSession":
+        return cls(
+            max_turns=settings.CHAT_SESSION_MAX_TURNS,
+            max_chunks=settings.CHAT_SESSION_MAX_CHUNKS,
+            history_tokens=settings.CHAT_SESSION_HISTORY_TOKENS,
+            reuse_similarity=settings.CHAT_SESSION_REUSE_SIMILARITY,
+        )
+
+    # -------------------------
+    # Retrieval
+    # -------------------------
+
+    def reusable_result(self, vector, namespaces, access_rank) -> dict | None:
+        """
+        The previous retrieval result, if the query is near-identical
+        to the previous one and searches the same scope.
+        """
+        if (
+            self.reuse_similarity is None
+            or self._last_result is None
+            or self._last_scope != (tuple(namespaces), access_rank)
+        ):
+            return None
+
+        current = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(current) * np.linalg.norm(self._last_vector)
+        if not norms or float(current @ self._last_vector) / norms < self.reuse_similarity:
+            return None
+
+        self.retrievals_avoided += 1
+        CHAT_SESSION_RETRIEVALS_AVOIDED.inc()
+        return self._last_result
+
+    def record_retrieval(self, vector, namespaces, access_rank, result: dict):
+        """
+        Remember a fresh retrieval: its chunks and, for reuse, the query.
+        """
+        matches = result.get("matches", [])
+        # Results with inline metadata loaded every chunk
+        reused = result.get("reused", 0)
+        fetched = result.get("fetched", len(matches))
+
+        self.retrievals += 1
+        self.chunks_reused += reused
+        self.chunks_fetched += fetched
+
+        for match in matches:
+            self.chunks[match["id"]] = match["metadata"]
+            self.chunks.move_to_end(match["id"])
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+
+        CHAT_SESSION_CHUNKS.labels(source="reused").inc(reused)
+        CHAT_SESSION_CHUNKS.labels(source="fetched").inc(fetched)
+
+        self._last_vector = np.asarray(vector, dtype=np.float32)
+        self._last_scope = (tuple(namespaces), access_rank)
+        self._last_result = result
+
+    # -------------------------
+    # Conversation
+    # -------------------------
+
+    def add_turn(self, query: str, answer: str):
+        self.turns.append((query, answer))
+
+    def history(self) -> list[tuple[str, str]]:
+        """
+        Most recent turns, oldest first, within the history token budget.
+        """
+        kept = []
+        budget = self.history_tokens
+
+        for query, answer in reversed(self.turns):
+            cost = estimate_tokens(query) + estimate_tokens(answer)
+            if cost > budget:
+                break
+            budget -= cost
+            kept.append((query, answer))
+
+        kept.reverse()
+        return kept
+
+    def reset(self):
+        self.turns.clear()
+        self.chunks.clear()
+        self._last_vector = self._last_scope = self._last_result = None
+
+    def close(self):
+        CHAT_SESSION_RETRIEVALS_AVOIDED_PER_SESSION.observe(self.retrievals_avoided)
+
+    def stats(self) -> dict:
+        return {
+            "turns": len(self.turns),
+            "chunks": len(self.chunks),
+            "retrievals": self.retrievals,
+            "retrievals_avoided": self.retrievals_avoided,
+            "chunks_reused": self.chunks_reused,
+            "chunks_fetched": self.chunks_fetched,
+        }
@@ -1,12 +1,13 @@
 import uuid
 from pathlib import Path
 from fastapi import Request
-from app.rag_core.ingestion.loader import AsyncDocumentLoader
+from app.rag_core.ingestion.loader import AsyncDocumentLoader, ChunkBatch
 from app.rag_core.ingestion.chunker import AsyncSentenceChunker
 from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
 from app.rag_core.vectorstore.pinecone_client import PineconeClient
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.utils.rag_utils import RAGUtils
 
 logger = get_logger(__name__)
 
@@ -17,19 +18,24 @@ class IngestionService:
     """
 
     @staticmethod
-    async def ingest_document(file_path: Path, request: Request,rag_access_level:str,access_rank:int):
+    async def ingest_document(file_path: Path, request: Request,rag_access_level:str,access_rank:int,namespace:str | None = None):
         document_id = str(uuid.uuid4())
+        namespace = namespace or settings.NAME_SPACE
 
         try:
             
-            logger.info(f"Starting ingestion | doc_id={document_id}")
+            logger.info(
+                "Starting ingestion | doc_id=%s | namespace=%s",
+                document_id,
+                namespace,
+            )
 
             # ---------- Load document ----------
-            loader = AsyncDocumentLoader()
+            loader = AsyncDocumentLoader(cache=request.app.state.parse_cache)
             raw_documents = await loader.load(file_path)
 
             if not raw_documents:
-                logger.warning(f"No content extracted | doc_id={document_id}")
+                logger.warning("No content extracted | doc_id=%s", document_id)
                 return
 
             # ---------- Chunk document ----------
@@ -41,45 +47,103 @@ class IngestionService:
             chunks = await chunker.split(raw_documents)
 
             logger.info(
-                f"Chunking completed | doc_id={document_id} | chunks={len(chunks)}"
+                "Chunking completed | doc_id=%s | chunks=%d",
+                document_id,
+                len(chunks),
             )
 
             # ---------- Embed chunks ----------
             embedder = request.app.state.embedder
 
-            texts = [chunk.text for chunk in chunks]
-            embeddings = await embedder.embed_texts(texts)
+            # One contiguous array; rows become lists only per upsert batch
+            embeddings = await embedder.embed_array(chunks.texts)
+
+            # The index may hold reduced vectors; the chunk store then keeps
+            # the full ones for rescoring
+            reducer = request.app.state.reducer
+            stored = reducer.transform(embeddings) if reducer is not None else embeddings
 
             # ---------- Prepare Pinecone vectors ----------
-            
-            vectors = []
-            for i, (chunk, vector) in enumerate(zip(chunks, embeddings)):
-                vectors.append(
-                    {
-                        "id": f"{document_id}-{i}",
-                        "values": vector,
-                        "metadata": {
-                            **chunk.metadata,
-                            "document_id": document_id,
-                            "text": chunk.text,
-                            "rag_access_level": rag_access_level,
-                            "rag_access_level_rank": access_rank,  # 🔑 critical
-                        }
-
-                        ,
-                    }
+            # With a chunk store, text stays local and only filterable
+            # metadata goes to Pinecone.
+            chunk_store = request.app.state.chunk_store
+
+            vectors = IngestionService._build_vectors(
+                chunks,
+                stored,
+                document_id=document_id,
+                rag_access_level=rag_access_level,
+                access_rank=access_rank,
+                include_text=chunk_store is None,
+            )
+
+            # ---------- Store chunk texts locally ----------
+            # Written before the upsert so every queryable vector has its text
+            if chunk_store is not None:
+                await chunk_store.put_many(
+                    [
+                        (v["id"], document_id, text, v["metadata"])
+                        for v, text in zip(vectors, chunks.texts)
+                    ],
+                    vectors=embeddings if reducer is not None else None,
                 )
 
             # ---------- Upsert to Pinecone ----------
+            storage_namespace = RAGUtils.storage_namespace(
+                namespace, rag_access_level
+            )
+
             pinecone = request.app.state.pinecone
             await pinecone.upsert(
                 vectors=vectors,
-                namespace=settings.NAME_SPACE,
+                namespace=storage_namespace,
             )
 
+            # ---------- Invalidate cached retrievals ----------
+            request.app.state.retriever.invalidate(storage_namespace)
+
             logger.info(
-                f"Ingestion completed | doc_id={document_id} | vectors={len(vectors)}"
+                "Ingestion completed | doc_id=%s | vectors=%d",
+                document_id,
+                len(vectors),
             )
 
         except Exception:
-            logger.exception(f"Ingestion failed | doc_id={document_id}")
+            logger.exception("Ingestion failed | doc_id=%s", document_id)
+
+    @staticmethod
+    def _build_vectors(
+        chunks: ChunkBatch,
+        embeddings,
+        document_id: str,
+        rag_access_level: str,
+        access_rank: int,
+        include_text: bool = True,
+    ) -> list[dict]:
+        """
+        Pinecone upsert payload for one document's chunks.
+        `values` are row views of `embeddings` (no copies).
+        """
+        base = {
+            "document_id": document_id,
+            "rag_access_level": rag_access_level,
+            "rag_access_level_rank": access_rank,  # 🔑 critical
+        }
+
+        vectors = []
+        for i, (text, chunk_metadata, vector) in enumerate(
+            zip(chunks.texts, chunks.metadata, embeddings)
+        ):
+            metadata = {**chunk_metadata, **base}
+            if include_text:
+                metadata["text"] = text
+
+            vectors.append(
+                {
+                    "id": f"{document_id}-{i}",
+                    "values": vector,
+                    "metadata": metadata,
+                }
+            )
+
+        return vectors
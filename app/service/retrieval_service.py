@@ -0,0 +1,103 @@
+import asyncio
+from time import perf_counter
+
+from app.core.logger import get_logger
+from app.core.metrics import (
+    RETRIEVAL_BATCH_EMBEDDING_LATENCY,
+    RETRIEVAL_BATCH_LATENCY,
+    RETRIEVAL_BATCH_QUERIES,
+)
+from app.utils.rag_utils import RAGUtils
+
+logger = get_logger(__name__)
+
+
+class RetrievalService:
+    """
+    Batch retrieval without the chat pipeline: one embedding pass for
+    every query, then bounded-concurrency vector-store lookups.
+    """
+
+    @staticmethod
+    def resolve(queries: list[dict]) -> list[dict]:
+        """
+        Validate access levels/namespaces up front (HTTP 400 on the first
+        invalid query), so no work starts for a malformed batch.
+        """
+        resolved = []
+        for query in queries:
+            _, access_rank = RAGUtils.validate_rag_access_level(
+                query.get("rag_access_level") or "public"
+            )
+            resolved.append({
+                **query,
+                "access_rank": access_rank,
+                "namespaces": RAGUtils.resolve_namespaces(query.get("namespaces")),
+            })
+        return resolved
+
+    @staticmethod
+    async def retrieve_batch(
+        queries: list[dict],
+        embedder,
+        retriever,
+        concurrency: int = 16,
+    ) -> dict:
+        """
+        :param queries: resolved queries (see resolve())
+        :return: per-query ranked matches plus timings and queries/sec
+        """
+        start = perf_counter()
+
+        with RETRIEVAL_BATCH_EMBEDDING_LATENCY.time():
+            vectors = await embedder.embed_queries([q["query"] for q in queries])
+        embed_seconds = perf_counter() - start
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def retrieve(query: dict, vector) -> dict:
+            async with semaphore:
+                try:
+                    result = await retriever.retrieve_many(
+                        vector=vector,
+                        namespaces=query["namespaces"],
+                        access_rank=query["access_rank"],
+                        top_k=query["top_k"],
+                    )
+                except Exception:
+                    logger.exception(
+                        "Batch retrieval query failed | namespaces=%s",
+                        ",".join(query["namespaces"]),
+                    )
+                    return {"id": query.get("id"), "matches": [], "error": "retrieval_failed"}
+
+            return {"id": query.get("id"), "matches": result.get("matches", [])}
+
+        retrieval_start = perf_counter()
+        results = await asyncio.gather(*(
+            retrieve(query, vector.tolist())
+            for query, vector in zip(queries, vectors)
+        ))
+        retrieval_seconds = perf_counter() - retrieval_start
+
+        elapsed = perf_counter() - start
+        RETRIEVAL_BATCH_QUERIES.observe(len(queries))
+        RETRIEVAL_BATCH_LATENCY.observe(elapsed)
+
+        logger.info(
+            "Batch retrieval completed | queries=%d | failed=%d | elapsed_ms=%.1f",
+            len(queries),
+            sum(1 for r in results if "error" in r),
+            elapsed * 1000,
+        )
+
+        return {
+            "results": results,
+            "count": len(results),
+            "timings_ms": {
+                "embed": embed_seconds * 1000,
+                "retrieve": retrieval_seconds * 1000,
+                "total": elapsed * 1000,
+            },
+            "queries_per_second": len(queries) / elapsed if elapsed else 0.0,
+        }
@@ -4,9 +4,16 @@ import aiofiles
 from fastapi import UploadFile
 
 UPLOAD_DIR = Path("data/uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 class FileUtils:
+    @staticmethod
+    def prepare_upload_dir() -> Path:
+        """
+        Create the upload directory (application startup).
+        """
+        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        return UPLOAD_DIR
+
     @staticmethod
     async def save_upload_async(file: UploadFile) -> Path:
         filename = f"{uuid.uuid4()}_{file.filename}"
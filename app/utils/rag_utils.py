@@ -1,6 +1,9 @@
+import re
 from fastapi import HTTPException
 from app.core.config import settings
 
+_NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.\-]{0,63}$")
+
 
 class RAGUtils:
     @staticmethod
@@ -34,3 +37,105 @@ class RAGUtils:
             raise ValueError(msg)
 
         return level, settings.RAG_ACCESS_LEVELS[level]
+
+    @staticmethod
+    def validate_namespace(
+        namespace: str | None,
+        *,
+        raise_http: bool = True,
+    ) -> str:
+        """
+        Validate a tenant/collection namespace.
+        Falls back to the default namespace when none is given.
+
+        :param namespace: input namespace
+        :param raise_http: raise HTTPException (True) or ValueError (False)
+        :return: normalized namespace
+        """
+
+        if namespace is not None and not isinstance(namespace, str):
+            msg = f"Invalid namespace {namespace!r}. Namespaces must be strings"
+            if raise_http:
+                raise HTTPException(status_code=400, detail=msg)
+            raise ValueError(msg)
+
+        if not namespace:
+            return settings.NAME_SPACE
+
+        namespace = namespace.strip()
+
+        if not _NAMESPACE_PATTERN.match(namespace):
+            msg = (
+                f"Invalid namespace '{namespace}'. Use 1-64 letters, digits, "
+                "'_', '-' or '.', starting with a letter or digit"
+            )
+            if raise_http:
+                raise HTTPException(status_code=400, detail=msg)
+            raise ValueError(msg)
+
+        return namespace
+
+    @staticmethod
+    def resolve_namespaces(
+        namespaces: str | list[str] | None,
+        *,
+        raise_http: bool = True,
+    ) -> list[str]:
+        """
+        Normalize one or many namespaces for a fan-out query.
+
+        :param namespaces: single namespace, list of namespaces, or None
+        :param raise_http: raise HTTPException (True) or ValueError (False)
+        :return: de-duplicated list of validated namespaces
+        """
+
+        if not namespaces or isinstance(namespaces, str):
+            namespaces = [namespaces or None]
+        elif not isinstance(namespaces, list):
+            msg = "namespaces must be a string or a list of strings"
+            if raise_http:
+                raise HTTPException(status_code=400, detail=msg)
+            raise ValueError(msg)
+
+        resolved = list(dict.fromkeys(
+            RAGUtils.validate_namespace(ns, raise_http=raise_http)
+            for ns in namespaces
+        ))
+
+        if len(resolved) > settings.RETRIEVAL_MAX_NAMESPACES:
+            msg = (
+                f"Too many namespaces ({len(resolved)}). "
+                f"Maximum is {settings.RETRIEVAL_MAX_NAMESPACES}"
+            )
+            if raise_http:
+                raise HTTPException(status_code=400, detail=msg)
+            raise ValueError(msg)
+
+        return resolved
+
+    @staticmethod
+    def partition_namespace(namespace: str, rag_access_level: str) -> str:
+        """
+        Physical namespace holding one access level of a logical namespace.
+        """
+        return f"{namespace}__{rag_access_level}"
+
+    @staticmethod
+    def storage_namespace(namespace: str, rag_access_level: str) -> str:
+        """
+        Namespace that ingestion writes to under the configured layout.
+        """
+        if settings.ACCESS_PARTITIONED_NAMESPACES:
+            return RAGUtils.partition_namespace(namespace, rag_access_level)
+        return namespace
+
+    @staticmethod
+    def readable_partitions(namespace: str, access_rank: int) -> list[str]:
+        """
+        Access-level partitions a caller of `access_rank` may read.
+        """
+        return [
+            RAGUtils.partition_namespace(namespace, level)
+            for level, rank in settings.RAG_ACCESS_LEVELS.items()
+            if rank <= access_rank
+        ]
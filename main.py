@@ -1,12 +1,23 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
+from functools import partial
 
 from app.api.router import api_router
 from app.rag_core.vectorstore.pinecone_client import PineconeClient
 from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+from app.rag_core.embeddings.reduction import load_reducer
+from app.rag_core.embeddings.sidecar import SidecarEmbedder
+from app.rag_core.ingestion.loader import extractor_version
+from app.rag_core.ingestion.parse_cache import ParsedTextCache
 from app.rag_core.llm.llm_registry import LLMRegistry
+from app.rag_core.retrieval.cache import RetrievalCache
+from app.rag_core.retrieval.retriever import Retriever
+from app.rag_core.vectorstore.chunk_store import SQLiteChunkStore
 from app.core.config import settings
-from app.core.logger import get_logger
+from app.core.logger import configure_logging, get_logger, shutdown_logging
+from app.core.profiling import EventLoopLagMonitor, SamplingProfiler
+from app.core.tracing import SlowTraceBuffer
+from app.utils.file_utils import FileUtils
 from prometheus_client import make_asgi_app
 
 logger = get_logger("startup")
@@ -15,21 +26,96 @@ metrics_app = make_asgi_app()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Settings, log files and the log writer thread are set up here,
+    # not at import
+    configure_logging()
     logger.info("Application startup initiated")
 
+    FileUtils.prepare_upload_dir()
+
     # -------------------------
     # Initialize Pinecone (ONCE)
     # -------------------------
     pinecone_client = PineconeClient()
     pinecone_client.initialize()
+    await pinecone_client.open()
+
+    # -------------------------
+    # Retriever + result cache
+    # -------------------------
+    retrieval_cache = None
+    if settings.RETRIEVAL_CACHE_ENABLED:
+        retrieval_cache = RetrievalCache(
+            ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS,
+            max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RETRIEVAL_CACHE_MAX_MB * 1024 * 1024,
+        )
+
+    parse_cache = None
+    if settings.PARSE_CACHE_ENABLED:
+        parse_cache = ParsedTextCache(
+            settings.PARSE_CACHE_DIR,
+            version=extractor_version(),
+            max_bytes=settings.PARSE_CACHE_MAX_MB * 1024 * 1024,
+            max_entries=settings.PARSE_CACHE_MAX_ENTRIES,
+        )
+        parse_cache.open()
+
+    chunk_store = None
+    if settings.CHUNK_STORE_ENABLED:
+        chunk_store = SQLiteChunkStore(settings.CHUNK_STORE_PATH)
+        chunk_store.open()
+
+    reducer = load_reducer(
+        settings.EMBEDDING_REDUCTION,
+        settings.EMBEDDING_REDUCTION_PATH,
+        dimension=settings.EMBEDDING_REDUCED_DIMENSION,
+        source_dimension=settings.EMBEDDING_DIMENSION,
+        model_name=settings.EMBEDDING_MODEL,
+    )
+    if settings.RETRIEVAL_RESCORE_ENABLED and (reducer is None or chunk_store is None):
+        logger.warning(
+            "RETRIEVAL_RESCORE_ENABLED needs EMBEDDING_REDUCTION and "
+            "CHUNK_STORE_ENABLED; rescoring is off"
+        )
+
+    retriever = Retriever(
+        pinecone_client,
+        cache=retrieval_cache,
+        partitioned=settings.ACCESS_PARTITIONED_NAMESPACES,
+        chunk_store=chunk_store,
+        reducer=reducer,
+        rescore_fetch_k=(
+            settings.RETRIEVAL_RESCORE_FETCH_K if settings.RETRIEVAL_RESCORE_ENABLED else 0
+        ),
+    )
 
     # -------------------------
     # Initialize Embedder (ONCE)
     # -------------------------
-    embedder = AsyncSentenceEmbedder(
-        model_name=settings.EMBEDDING_MODEL
+    local_embedder = partial(
+        AsyncSentenceEmbedder,
+        model_name=settings.EMBEDDING_MODEL,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        backend=settings.EMBEDDING_BACKEND,
+        quantize=settings.EMBEDDING_ONNX_QUANTIZE,
+        quantization_config=settings.EMBEDDING_ONNX_QUANTIZATION_CONFIG,
+        onnx_dir=settings.EMBEDDING_ONNX_DIR,
+        num_threads=settings.EMBEDDING_NUM_THREADS,
+        dtype=settings.EMBEDDING_DTYPE,
     )
 
+    if settings.EMBEDDING_SIDECAR_SOCKET:
+        embedder = SidecarEmbedder(
+            settings.EMBEDDING_SIDECAR_SOCKET,
+            fallback=local_embedder if settings.EMBEDDING_SIDECAR_FALLBACK else None,
+            retry_seconds=settings.EMBEDDING_SIDECAR_RETRY_SECONDS,
+            dtype=settings.EMBEDDING_DTYPE,
+        )
+        await embedder.start()
+    else:
+        embedder = local_embedder()
+
      # LLM Registry
     llm_registry = LLMRegistry()
     llm_registry.initialize()
@@ -37,8 +123,21 @@ async def lifespan(app: FastAPI):
     # Store in app.state
     # -------------------------
     app.state.pinecone = pinecone_client
+    app.state.retriever = retriever
+    app.state.chunk_store = chunk_store
+    app.state.reducer = reducer
+    app.state.parse_cache = parse_cache
     app.state.embedder = embedder
     app.state.llms = llm_registry
+    app.state.traces = SlowTraceBuffer(settings.TRACE_SLOW_BUFFER_SIZE)
+
+    # -------------------------
+    # Diagnostics
+    # -------------------------
+    loop_lag = EventLoopLagMonitor(settings.EVENT_LOOP_LAG_PROBE_INTERVAL_SECONDS)
+    loop_lag.start()
+    app.state.loop_lag = loop_lag
+    app.state.profiler = SamplingProfiler()
 
     logger.info("Shared resources initialized")
     logger.info("Application startup completed")
@@ -46,7 +145,17 @@ async def lifespan(app: FastAPI):
     yield  # ---- App is running ----
 
     logger.info("Application shutdown initiated")
+
+    await loop_lag.stop()
+    await pinecone_client.close()
+    await llm_registry.aclose()
+    if isinstance(embedder, SidecarEmbedder):
+        await embedder.aclose()
+    if chunk_store is not None:
+        chunk_store.close()
+
     logger.info("Application shutdown completed")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -0,0 +1,122 @@
+"""
+Filtered single namespace vs access-rank partitioned fan-out.
+
+Loads the same synthetic corpus into both layouts of an in-memory
+Pinecone stand-in and runs the real Retriever for callers of every
+access level, reporting latency per layout/level and checking that both
+layouts return identical results.
+
+    python -m scripts.benchmarks.access_partitions --vectors 200000
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+NAMESPACE = "bench"
+
+
+def _build_corpus(args):
+    import numpy as np
+    from app.core.config import settings
+
+    rng = np.random.default_rng(0)
+    levels = list(settings.RAG_ACCESS_LEVELS.items())
+    weights = np.array(args.level_weights, dtype=float)
+    weights /= weights.sum()
+
+    values = rng.standard_normal((args.vectors, 384), dtype=np.float32)
+    assigned = rng.choice(len(levels), size=args.vectors, p=weights)
+
+    corpus = []
+    for i in range(args.vectors):
+        level, rank = levels[assigned[i]]
+        corpus.append((level, {
+            "id": f"v-{i}",
+            "values": values[i],
+            "metadata": {
+                "rag_access_level": level,
+                "rag_access_level_rank": rank,
+            },
+        }))
+    return corpus
+
+
+async def main(args):
+    import numpy as np
+    from app.core.config import settings
+    from app.rag_core.evaluation.stand_ins import InMemoryPineconeClient
+    from app.rag_core.evaluation.stats import summarize
+    from app.rag_core.retrieval.retriever import Retriever
+    from app.utils.rag_utils import RAGUtils
+
+    corpus = _build_corpus(args)
+
+    filtered_store = InMemoryPineconeClient()
+    partitioned_store = InMemoryPineconeClient()
+
+    await filtered_store.upsert([v for _, v in corpus], NAMESPACE)
+    for level in settings.RAG_ACCESS_LEVELS:
+        await partitioned_store.upsert(
+            [v for lvl, v in corpus if lvl == level],
+            RAGUtils.partition_namespace(NAMESPACE, level),
+        )
+
+    layouts = {
+        "filtered": Retriever(filtered_store),
+        "partitioned": Retriever(partitioned_store, partitioned=True),
+    }
+
+    queries = np.random.default_rng(1).standard_normal(
+        (args.queries, 384), dtype=np.float32
+    )
+
+    rows = []
+    mismatches = 0
+    for level, rank in settings.RAG_ACCESS_LEVELS.items():
+        latencies = {name: [] for name in layouts}
+
+        for query in queries:
+            ids = {}
+            for name, retriever in layouts.items():
+                start = perf_counter()
+                result = await retriever.retrieve(query, NAMESPACE, rank, args.top_k)
+                latencies[name].append(perf_counter() - start)
+                ids[name] = [m["id"] for m in result["matches"]]
+
+            mismatches += ids["filtered"] != ids["partitioned"]
+
+        for name in layouts:
+            rows.append({
+                "layout": name,
+                "caller_level": level,
+                **summarize(latencies[name]),
+            })
+
+    print_table(rows, ["layout", "caller_level", "count", "p50", "p99", "mean"])
+    print(f"\nResult mismatches between layouts: {mismatches}")
+
+    path = save_results(
+        "access_partitions",
+        {"config": vars(args), "results": rows, "mismatches": mismatches},
+    )
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--level-weights",
+        type=float,
+        nargs="+",
+        default=[0.1, 0.2, 0.3, 0.4],
+        help="Share of vectors per access level, lowest rank first",
+    )
+    args = parser.parse_args()
+
+    configure_env()
+    asyncio.run(main(args))
@@ -0,0 +1,115 @@
+"""
+Batch retrieval throughput: per-query embed + retrieve vs RetrievalService.
+
+- sequential:  one query at a time, embed_query then retrieve (an offline
+               job driving the chat path)
+- concurrent:  --clients callers doing the same in parallel (one model
+               call per query)
+- batch:       RetrievalService.retrieve_batch: one embedding pass,
+               vector-store queries bounded by --concurrency
+
+The vector store is the in-memory stand-in with --latency-ms added per
+query to stand in for the network round trip.
+
+    python -m scripts.benchmarks.batch_retrieval --queries 256 --latency-ms 20
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+
+class _LatencyClient:
+    def __init__(self, client, latency_seconds: float):
+        self.client = client
+        self.latency_seconds = latency_seconds
+
+    async def query(self, **kwargs):
+        await asyncio.sleep(self.latency_seconds)
+        return await self.client.query(**kwargs)
+
+
+async def run(args) -> list[dict]:
+    from app.core.config import settings
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+    from app.rag_core.evaluation.stand_ins import (
+        InMemoryPineconeClient,
+        seed_random_vectors,
+    )
+    from app.rag_core.evaluation.synthetic_docs import synthetic_paragraphs
+    from app.rag_core.retrieval.retriever import Retriever
+    from app.service.retrieval_service import RetrievalService
+
+    namespace = "bench"
+    client = InMemoryPineconeClient(dimension=settings.EMBEDDING_DIMENSION)
+    seed_random_vectors(client.index, namespace, args.vectors)
+    retriever = Retriever(_LatencyClient(client, args.latency_ms / 1000))
+
+    embedder = AsyncSentenceEmbedder(
+        model_name=settings.EMBEDDING_MODEL,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+    )
+    texts = synthetic_paragraphs(args.queries, 12, seed=3)
+    await embedder.embed_queries(texts[:8])  # warm-up
+
+    async def one(text: str):
+        vector = await embedder.embed_query(text)
+        await retriever.retrieve(vector, namespace, 4, args.top_k)
+
+    rows = []
+
+    start = perf_counter()
+    for text in texts:
+        await one(text)
+    rows.append({"mode": "sequential", "seconds": perf_counter() - start})
+
+    pending = iter(texts)
+
+    async def caller():
+        for text in pending:
+            await one(text)
+
+    start = perf_counter()
+    await asyncio.gather(*(caller() for _ in range(args.clients)))
+    rows.append({"mode": f"concurrent[c={args.clients}]", "seconds": perf_counter() - start})
+
+    queries = [
+        {"query": text, "namespaces": [namespace], "access_rank": 4, "top_k": args.top_k}
+        for text in texts
+    ]
+    start = perf_counter()
+    await RetrievalService.retrieve_batch(
+        queries, embedder, retriever, concurrency=args.concurrency
+    )
+    rows.append({"mode": f"batch[c={args.concurrency}]", "seconds": perf_counter() - start})
+
+    for row in rows:
+        row["queries"] = len(texts)
+        row["queries_per_sec"] = len(texts) / row["seconds"]
+
+    return rows
+
+
+def main(args):
+    rows = asyncio.run(run(args))
+    print_table(rows, ["mode", "queries", "seconds", "queries_per_sec"])
+
+    path = save_results("batch_retrieval", {"config": vars(args), "results": rows})
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    configure_env()
+    main(args)
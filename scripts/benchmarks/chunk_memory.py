@@ -0,0 +1,133 @@
+"""
+Chunk representation memory on a large PDF.
+
+Loads and splits a generated PDF once, then measures what holding the
+chunks costs in each representation (texts are shared by both and not
+counted):
+
+- objects:  previous pipeline, one DocumentChunk with its own copy of the
+            page metadata per chunk, plus the separate texts list
+- columnar: the ChunkBatch produced by AsyncSentenceChunker (shared
+            metadata references)
+
+A second table reports tracemalloc peak and wall time for the full
+columnar path: load -> split -> _build_vectors.
+
+    python -m scripts.benchmarks.chunk_memory --pages 1000
+"""
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+
+def retained(build) -> tuple[object, int, float]:
+    """
+    (result, bytes still allocated after build(), seconds)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    result = build()
+    seconds = perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, seconds
+
+
+def main(args):
+    from app.core.config import settings
+    from app.rag_core.evaluation.synthetic_docs import write_synthetic_pdf
+    from app.rag_core.ingestion.chunker import AsyncSentenceChunker
+    from app.rag_core.ingestion.loader import AsyncDocumentLoader, ChunkBatch, DocumentChunk
+    from app.service.ingestion_service import IngestionService
+
+    chunker = AsyncSentenceChunker(
+        model_name=settings.EMBEDDING_MODEL,
+        max_tokens=args.chunk_size,
+        overlap_tokens=args.overlap,
+    )
+    loader = AsyncDocumentLoader()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = write_synthetic_pdf(Path(tmp) / "large.pdf", pages=args.pages)
+        pages = loader._load_pdf(pdf_path)
+        chunks = chunker._split_sync(pages)
+
+        def objects():
+            legacy = [DocumentChunk(text, {**metadata}) for text, metadata in zip(chunks.texts, chunks.metadata)]
+            return legacy, [chunk.text for chunk in legacy]
+
+        def columnar():
+            batch = ChunkBatch()
+            for text, metadata in zip(chunks.texts, chunks.metadata):
+                batch.append(text, metadata)
+            return batch
+
+        rows = []
+        for name, build in (("objects", objects), ("columnar", columnar)):
+            result, size, seconds = retained(build)
+            rows.append({
+                "representation": name,
+                "chunks": len(chunks),
+                "retained_mb": size / 1e6,
+                "bytes_per_chunk": size / len(chunks),
+                "build_ms": seconds * 1000,
+            })
+            del result
+
+        print_table(rows, ["representation", "chunks", "retained_mb", "bytes_per_chunk", "build_ms"])
+
+        embeddings = np.zeros((len(chunks), settings.EMBEDDING_DIMENSION), dtype=np.float32)
+
+        def pipeline():
+            batch = chunker._split_sync(loader._load_pdf(pdf_path))
+            return IngestionService._build_vectors(
+                batch,
+                embeddings,
+                document_id="bench-doc",
+                rag_access_level="public",
+                access_rank=1,
+            )
+
+        gc.collect()
+        tracemalloc.start()
+        start = perf_counter()
+        pipeline()
+        seconds = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    end_to_end = {
+        "pages": args.pages,
+        "chunks": len(chunks),
+        "seconds": seconds,
+        "peak_mb": peak / 1e6,
+    }
+    print()
+    print_table([end_to_end], ["pages", "chunks", "seconds", "peak_mb"])
+
+    path = save_results(
+        "chunk_memory",
+        {"config": vars(args), "results": rows, "end_to_end": end_to_end},
+    )
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--overlap", type=int, default=40)
+    args = parser.parse_args()
+
+    configure_env()
+    main(args)
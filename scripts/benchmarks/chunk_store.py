@@ -0,0 +1,167 @@
+"""
+Chunk text in vector metadata vs local chunk store.
+
+Reports upsert/query payload sizes and end-to-end retrieval latency
+(stand-in vector store over HTTP + SQLiteChunkStore bulk fetch) for
+chunks of roughly CHUNK_SIZE tokens.
+
+    python -m scripts.benchmarks.chunk_store --vectors 5000
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+HOST = "127.0.0.1"
+WITH_TEXT = "with-text"
+IDS_ONLY = "ids-only"
+
+
+def _synthetic_text(rng, chars: int) -> str:
+    words = ["retrieval", "vector", "policy", "employee", "benefit",
+             "quarterly", "report", "customer", "platform", "access"]
+    out, size = [], 0
+    while size < chars:
+        word = words[int(rng.integers(len(words)))]
+        out.append(word)
+        size += len(word) + 1
+    return " ".join(out)
+
+
+async def main(args):
+    import httpx
+    import numpy as np
+    from app.rag_core.evaluation.stand_ins import (
+        serve_vector_store,
+        start_process,
+        wait_for_port,
+    )
+    from app.rag_core.evaluation.stats import summarize
+    from app.rag_core.retrieval.retriever import Retriever
+    from app.rag_core.vectorstore.chunk_store import SQLiteChunkStore
+    from app.rag_core.vectorstore.pinecone_client import PineconeClient
+
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal((args.vectors, 384)).astype("float32")
+    texts = [_synthetic_text(rng, args.chunk_chars) for _ in range(args.vectors)]
+
+    def vector(i: int, with_text: bool) -> dict:
+        metadata = {
+            "source": "bench.pdf",
+            "page": i // 4 + 1,
+            "type": "pdf",
+            "document_id": "bench-doc",
+            "rag_access_level": "public",
+            "rag_access_level_rank": 1,
+        }
+        if with_text:
+            metadata["text"] = texts[i]
+        return {"id": f"v-{i}", "values": values[i].tolist(), "metadata": metadata}
+
+    # ---------- Payload sizes ----------
+    batch = range(min(100, args.vectors))
+    upsert_bytes = {
+        WITH_TEXT: len(json.dumps([vector(i, True) for i in batch])),
+        IDS_ONLY: len(json.dumps([vector(i, False) for i in batch])),
+    }
+
+    server = start_process(serve_vector_store, host=HOST, port=args.port)
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    try:
+        wait_for_port(HOST, args.port)
+
+        client = PineconeClient()
+        client.initialize()
+        await client.open()
+
+        store = SQLiteChunkStore(Path(tmp_dir.name) / "chunks.sqlite3")
+        store.open()
+
+        for start in range(0, args.vectors, 100):
+            ids = range(start, min(start + 100, args.vectors))
+            await client.upsert([vector(i, True) for i in ids], WITH_TEXT)
+            await client.upsert([vector(i, False) for i in ids], IDS_ONLY)
+            await store.put_many([
+                (f"v-{i}", "bench-doc", texts[i], vector(i, False)["metadata"])
+                for i in ids
+            ])
+
+        # ---------- Query response sizes ----------
+        probe = values[0].tolist()
+        response_bytes = {}
+        async with httpx.AsyncClient(base_url=f"http://{HOST}:{args.port}") as http:
+            for namespace, include_metadata in ((WITH_TEXT, True), (IDS_ONLY, False)):
+                response = await http.post("/query", json={
+                    "vector": probe,
+                    "namespace": namespace,
+                    "topK": args.top_k,
+                    "includeMetadata": include_metadata,
+                })
+                response_bytes[namespace] = len(response.content)
+
+        # ---------- Retrieval latency ----------
+        retrievers = {
+            WITH_TEXT: Retriever(client),
+            IDS_ONLY: Retriever(client, chunk_store=store),
+        }
+        queries = rng.standard_normal((args.queries, 384)).astype("float32")
+
+        rows = []
+        for namespace, retriever in retrievers.items():
+            latencies = []
+
+            async def one(query):
+                start = perf_counter()
+                await retriever.retrieve(query.tolist(), namespace, 1, args.top_k)
+                latencies.append(perf_counter() - start)
+
+            for offset in range(0, args.queries, args.concurrency):
+                await asyncio.gather(*(
+                    one(q) for q in queries[offset : offset + args.concurrency]
+                ))
+
+            rows.append({
+                "layout": namespace,
+                "upsert_batch_bytes": upsert_bytes[namespace],
+                "query_response_bytes": response_bytes[namespace],
+                **summarize(latencies),
+            })
+
+        print_table(rows, [
+            "layout", "upsert_batch_bytes", "query_response_bytes",
+            "p50", "p99", "mean",
+        ])
+
+        path = save_results("chunk_store", {"config": vars(args), "results": rows})
+        print(f"\nSaved {path}")
+
+        store.close()
+        await client.close()
+
+    finally:
+        server.terminate()
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=4000,
+        help="~4 characters per token, so 4000 ~= CHUNK_SIZE=1000",
+    )
+    parser.add_argument("--port", type=int, default=5082)
+    args = parser.parse_args()
+
+    configure_env(PINECONE_INDEX_HOST=f"http://{HOST}:{args.port}")
+    asyncio.run(main(args))
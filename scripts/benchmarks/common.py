@@ -0,0 +1,56 @@
+"""
+Shared helpers for benchmark scripts.
+
+Run benchmarks from the repository root, e.g.:
+    python -m scripts.benchmarks.vectorstore_async
+"""
+import json
+import os
+from pathlib import Path
+
+RESULTS_DIR = Path("data/benchmarks")
+
+# Required settings that benchmarks never use for real network calls
+_PLACEHOLDER_ENV = {
+    "PINECONE_API_KEY": "bench",
+    "OPENAI_API_KEY": "bench",
+    "NVIDIA_API_KEY": "bench",
+    "NVIDIA_BASE_URL": "http://127.0.0.1:9",
+    "NVIDIA_MODELS": "bench-model",
+    "NVIDIA_DEFAULT_MODEL": "bench-model",
+}
+
+
+def configure_env(**overrides: str) -> None:
+    """
+    Provide placeholder values for required settings.
+    Must run before settings are first read.
+    """
+    for key, value in _PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+
+
+def save_results(name: str, results: dict) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{name}.json"
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    widths = {
+        col: max(len(col), *(len(_fmt(row.get(col))) for row in rows))
+        for col in columns
+    }
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(col)).ljust(widths[col]) for col in columns))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return "" if value is None else str(value)
@@ -0,0 +1,110 @@
+"""
+Embedding backends: PyTorch vs ONNX Runtime vs ONNX int8.
+
+Reports single-query throughput and latency, ingestion chunks/sec at
+EMBEDDING_BATCH_SIZE, and cosine agreement of each backend's vectors with
+the PyTorch path on the same texts.
+
+    python -m scripts.benchmarks.embedding_backends --threads 4
+    python -m scripts.benchmarks.embedding_backends --backends torch,onnx-int8 --quantization-config avx2
+
+ONNX backends need sentence-transformers[onnx].
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+BACKENDS = {
+    "torch": {"backend": "torch"},
+    "onnx": {"backend": "onnx"},
+    "onnx-int8": {"backend": "onnx", "quantize": True},
+}
+
+
+def main(args):
+    from app.core.config import settings
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+    from app.rag_core.evaluation.stats import summarize
+    from app.rag_core.evaluation.synthetic_docs import synthetic_paragraphs
+
+    queries = [p[:120] for p in synthetic_paragraphs(args.queries, 20, seed=1)]
+    chunks = synthetic_paragraphs(args.chunks, args.chunk_words, seed=2)
+    probe = queries[:50] + chunks[:50]
+
+    reference = None
+    rows = []
+
+    for name in ["torch"] + [b for b in args.backends.split(",") if b != "torch"]:
+        embedder = AsyncSentenceEmbedder(
+            model_name=settings.EMBEDDING_MODEL,
+            device="cpu",
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            quantization_config=args.quantization_config,
+            onnx_dir=settings.EMBEDDING_ONNX_DIR,
+            num_threads=args.threads,
+            **BACKENDS[name],
+        )
+        embedder._embed_sync(queries[:8])  # warm-up
+
+        latencies = []
+        start = perf_counter()
+        for query in queries:
+            t = perf_counter()
+            embedder._embed_sync([query])
+            latencies.append(perf_counter() - t)
+        query_seconds = perf_counter() - start
+
+        start = perf_counter()
+        embedder._embed_sync(chunks)
+        ingest_seconds = perf_counter() - start
+
+        vectors = np.asarray(embedder._embed_sync(probe), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        if reference is None:
+            reference = vectors
+        cosine = np.sum(vectors * reference, axis=1)
+
+        latency = summarize(latencies)
+        rows.append({
+            "backend": name,
+            "queries_per_sec": len(queries) / query_seconds,
+            "query_p50_ms": latency["p50"] * 1000,
+            "query_p99_ms": latency["p99"] * 1000,
+            "chunks_per_sec": len(chunks) / ingest_seconds,
+            "cosine_mean": float(cosine.mean()),
+            "cosine_min": float(cosine.min()),
+        })
+
+        # Only one model resident at a time
+        del embedder
+
+    print_table(rows, [
+        "backend", "queries_per_sec", "query_p50_ms", "query_p99_ms",
+        "chunks_per_sec", "cosine_mean", "cosine_min",
+    ])
+
+    path = save_results("embedding_backends", {"config": vars(args), "results": rows})
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--chunk-words", type=int, default=180)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument(
+        "--quantization-config",
+        default="avx512_vnni",
+        choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+    )
+    args = parser.parse_args()
+
+    configure_env()
+    main(args)
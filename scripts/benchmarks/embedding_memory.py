@@ -0,0 +1,115 @@
+"""
+Embedding representation during ingestion: Python float lists vs arrays.
+
+Replays the ingestion path after the forward pass for a large backfill:
+build the upsert payload with IngestionService._build_vectors and
+serialize it in upsert batches (JSON, as the async data plane sends it).
+
+- lists:   previous behaviour, the model output is converted with .tolist()
+- float32: rows stay array views until PineconeClient serializes a batch
+- float16: as float32 with half the resident embedding memory
+
+The forward pass is replaced by a random matrix so only the
+representation differs between cases. Reports tracemalloc peak, wall
+time and garbage-collector passes.
+
+    python -m scripts.benchmarks.embedding_memory --chunks 50000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+CASES = ("lists", "float32", "float16")
+
+
+def run_case(case: str, chunks, dimension: int, batch_size: int, seed: int = 0):
+    from app.rag_core.vectorstore.pinecone_client import _serialize_batch
+    from app.service.ingestion_service import IngestionService
+
+    # Stand-in for model.encode() output
+    rng = np.random.default_rng(seed)
+    matrix = rng.standard_normal((len(chunks), dimension), dtype=np.float32)
+
+    if case == "lists":
+        embeddings = matrix.tolist()
+    else:
+        embeddings = matrix.astype(case, copy=False)
+    del matrix
+
+    vectors = IngestionService._build_vectors(
+        chunks,
+        embeddings,
+        document_id="bench-doc",
+        rag_access_level="public",
+        access_rank=1,
+    )
+
+    payload_bytes = 0
+    for i in range(0, len(vectors), batch_size):
+        body = {"vectors": _serialize_batch(vectors[i : i + batch_size]), "namespace": "bench"}
+        payload_bytes += len(json.dumps(body))
+
+    return payload_bytes
+
+
+def measure(case: str, chunks, args) -> dict:
+    gc.collect()
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    start = perf_counter()
+    payload_bytes = run_case(case, chunks, args.dimension, args.batch_size)
+    seconds = perf_counter() - start
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections
+
+    gc.collect()
+    tracemalloc.start()
+    run_case(case, chunks, args.dimension, args.batch_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "case": case,
+        "chunks": len(chunks),
+        "seconds": seconds,
+        "chunks_per_sec": len(chunks) / seconds,
+        "peak_mb": peak / 1e6,
+        "gc_passes": collections,
+        "payload_mb": payload_bytes / 1e6,
+    }
+
+
+def main(args):
+    from app.rag_core.evaluation.synthetic_docs import synthetic_paragraphs
+    from app.rag_core.ingestion.loader import ChunkBatch
+
+    # Texts are shared objects so they do not dominate the peak
+    texts = synthetic_paragraphs(256, 120)
+    chunks = ChunkBatch()
+    for i in range(args.chunks):
+        chunks.append(texts[i % len(texts)], {"source": "bench.pdf", "page": i // 8})
+
+    rows = [measure(case, chunks, args) for case in args.cases.split(",")]
+
+    print_table(rows, ["case", "chunks", "seconds", "chunks_per_sec", "peak_mb", "gc_passes", "payload_mb"])
+
+    path = save_results("embedding_memory", {"config": vars(args), "results": rows})
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--cases", default=",".join(CASES))
+    args = parser.parse_args()
+
+    configure_env()
+    main(args)
@@ -0,0 +1,238 @@
+"""
+Ingestion hot-path microbenchmarks with regression thresholds.
+
+Covers AsyncDocumentLoader._load_pdf/_load_docx (and a parse-cache hit),
+AsyncSentenceChunker._split_sync, AsyncSentenceEmbedder._encode at several
+batch sizes and IngestionService._build_vectors, on generated synthetic
+PDF/DOCX files.
+Each case reports median throughput over --repeats runs and the
+tracemalloc peak of one extra run.
+
+    python -m scripts.benchmarks.ingestion --save-baseline
+    python -m scripts.benchmarks.ingestion            # exits 1 on regression
+    python -m scripts.benchmarks.ingestion --only load_pdf,build_vectors
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from scripts.benchmarks.common import (
+    RESULTS_DIR,
+    configure_env,
+    print_table,
+    save_results,
+)
+
+DEFAULT_BASELINE = RESULTS_DIR / "ingestion_baseline.json"
+
+
+def measure(name: str, fn, items: int, unit: str, repeats: int) -> dict:
+    fn()  # warm-up (lazy model/tokenizer state, caches)
+
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = perf_counter()
+        fn()
+        timings.append(perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        "case": name,
+        "items": items,
+        "unit": unit,
+        "median_ms": seconds * 1000,
+        "throughput": items / seconds if seconds else 0.0,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def run_cases(args, tmp_dir: Path) -> list[dict]:
+    from app.core.config import settings
+    from app.rag_core.evaluation.synthetic_docs import (
+        write_synthetic_docx,
+        write_synthetic_pdf,
+    )
+    from app.rag_core.ingestion.loader import AsyncDocumentLoader
+
+    selected = set(args.only.split(",")) if args.only else None
+
+    def wanted(case: str) -> bool:
+        return selected is None or case in selected or case.split("[")[0] in selected
+
+    pdf_path = write_synthetic_pdf(tmp_dir / "bench.pdf", pages=args.pdf_pages)
+    docx_path = write_synthetic_docx(tmp_dir / "bench.docx", paragraphs=args.docx_paragraphs)
+
+    loader = AsyncDocumentLoader()
+    pages = loader._load_pdf(pdf_path)
+    rows = []
+
+    if wanted("load_pdf"):
+        rows.append(measure(
+            "load_pdf", lambda: loader._load_pdf(pdf_path),
+            args.pdf_pages, "pages", args.repeats,
+        ))
+
+    if wanted("load_pdf[cached]"):
+        from app.rag_core.ingestion.loader import extractor_version
+        from app.rag_core.ingestion.parse_cache import ParsedTextCache
+
+        cache = ParsedTextCache(tmp_dir / "parse_cache", version=extractor_version())
+        cache.open()
+        cached_loader = AsyncDocumentLoader(cache=cache)
+        rows.append(measure(
+            "load_pdf[cached]",
+            lambda: cached_loader._load_sync(pdf_path, cached_loader._load_pdf),
+            args.pdf_pages, "pages", args.repeats,
+        ))
+
+    if wanted("load_docx"):
+        rows.append(measure(
+            "load_docx", lambda: loader._load_docx(docx_path),
+            args.docx_paragraphs, "paragraphs", args.repeats,
+        ))
+
+    needs_model = any(wanted(c) for c in ("split", "embed", "build_vectors"))
+    if not needs_model:
+        return rows
+
+    from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+    from app.rag_core.ingestion.chunker import AsyncSentenceChunker
+    from app.service.ingestion_service import IngestionService
+
+    chunker = AsyncSentenceChunker(
+        model_name=settings.EMBEDDING_MODEL,
+        max_tokens=settings.CHUNK_SIZE,
+        overlap_tokens=settings.CHUNK_OVERLAP,
+    )
+    chunks = chunker._split_sync(pages)
+
+    if wanted("split"):
+        rows.append(measure(
+            "split", lambda: chunker._split_sync(pages),
+            len(pages), "pages", args.repeats,
+        ))
+
+    texts = [chunks.texts[i % len(chunks)] for i in range(args.embed_texts)]
+    embedder = AsyncSentenceEmbedder(model_name=settings.EMBEDDING_MODEL)
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        case = f"embed[b={batch_size}]"
+        if wanted(case):
+            embedder.batch_size = batch_size
+            rows.append(measure(
+                case, lambda: embedder._encode(texts),
+                len(texts), "texts", args.repeats,
+            ))
+
+    if wanted("build_vectors"):
+        embedder.batch_size = settings.EMBEDDING_BATCH_SIZE
+        embeddings = embedder._encode(chunks.texts)
+        rows.append(measure(
+            "build_vectors",
+            lambda: IngestionService._build_vectors(
+                chunks, embeddings,
+                document_id="bench-doc",
+                rag_access_level="public",
+                access_rank=1,
+            ),
+            len(chunks), "vectors", args.repeats,
+        ))
+
+    return rows
+
+
+def check(rows: list[dict], baseline: dict, threshold: float, memory_slack_mb: float) -> list[str]:
+    """
+    Regressions: throughput more than `threshold` below baseline, or peak
+    memory more than `threshold` (and `memory_slack_mb`) above it.
+    """
+    previous = {row["case"]: row for row in baseline.get("results", [])}
+    regressions = []
+
+    for row in rows:
+        base = previous.get(row["case"])
+        if base is None:
+            continue
+
+        if base["throughput"] and row["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{row['case']}: throughput {base['throughput']:.1f} -> "
+                f"{row['throughput']:.1f} {row['unit']}/s"
+            )
+
+        grew = row["peak_mb"] - base["peak_mb"]
+        if grew > memory_slack_mb and row["peak_mb"] > base["peak_mb"] * (1 + threshold):
+            regressions.append(
+                f"{row['case']}: peak memory {base['peak_mb']:.1f} -> {row['peak_mb']:.1f} MB"
+            )
+
+    return regressions
+
+
+def main(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = run_cases(args, Path(tmp))
+
+    print_table(rows, ["case", "items", "unit", "median_ms", "throughput", "peak_mb"])
+
+    results = {"config": vars(args), "results": rows}
+    path = save_results("ingestion", results)
+    print(f"\nSaved {path}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline first")
+        return 0
+
+    regressions = check(
+        rows,
+        json.loads(baseline_path.read_text()),
+        args.threshold,
+        args.memory_slack_mb,
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+
+    print(f"No regressions against {baseline_path} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pdf-pages", type=int, default=50)
+    parser.add_argument("--docx-paragraphs", type=int, default=500)
+    parser.add_argument("--embed-texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="8,32,64,128")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", help="comma-separated cases, e.g. load_pdf,embed")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--memory-slack-mb", type=float, default=1.0)
+    args = parser.parse_args()
+
+    configure_env()
+    sys.exit(main(args))
@@ -0,0 +1,169 @@
+"""
+Per-request logging overhead on the calling thread.
+
+Replays the log calls of one chat request (INFO lines from ChatService
+plus `--parse-warnings` hot-path warnings, as NvidiaLLMClient emits on
+malformed stream lines) against several logger setups, each writing to a
+temp file through a QueueListener thread:
+
+    unbounded-fstring  previous setup: Queue(-1), f-string messages
+    bounded-text       bounded queue, %-style, text format
+    bounded-json       bounded queue, %-style, JSON with request IDs
+    bounded-json-limited  + per-logger rate limit and INFO sampling
+
+    python -m scripts.benchmarks.logging_overhead --requests 20000
+"""
+import argparse
+import logging
+import logging.handlers
+import queue
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+
+def _chat_request_fstring(chat, llm, request_id, parse_warnings):
+    namespace, model = "Enterprise-RAG", "bench-model"
+    chat.info(f"Chat request received | namespace={namespace} | model={model}")
+    chat.info(f"Vector retrieval completed | namespace={namespace} | matches={5}")
+    chat.info(f"Context extraction completed | usable_contexts={5}")
+    chat.info(f"Starting RAG streaming | model={model} | contexts={5}")
+    for i in range(parse_warnings):
+        llm.warning(f"Stream parse error: Expecting value: line 1 column {i}")
+    chat.info(f"Chat completed | namespace={namespace} | model={model}")
+
+
+def _chat_request(chat, llm, request_id, parse_warnings):
+    namespace, model = "Enterprise-RAG", "bench-model"
+    chat.info(
+        "Chat request received | request_id=%s | namespace=%s | model=%s",
+        request_id, namespace, model,
+    )
+    chat.info("Vector retrieval completed | namespace=%s | matches=%d", namespace, 5)
+    chat.info("Context extraction completed | usable_contexts=%d", 5)
+    chat.info("Starting RAG streaming | model=%s | contexts=%d", model, 5)
+    for i in range(parse_warnings):
+        llm.warning(
+            "Stream parse error | model=%s | error=%s",
+            model, f"Expecting value: line 1 column {i}",
+        )
+    chat.info("Chat completed | namespace=%s | model=%s", namespace, model)
+
+
+def _setup(name: str, log_path: Path, args):
+    from app.core.logger import (
+        TEXT_FORMAT,
+        BoundedQueueHandler,
+        BoundedQueueListener,
+        JsonFormatter,
+        RateLimitFilter,
+        RequestContextFilter,
+    )
+
+    file_handler = logging.FileHandler(log_path)
+
+    if name == "unbounded-fstring":
+        log_queue = queue.Queue(-1)
+        handler = logging.handlers.QueueHandler(log_queue)
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        log_queue = queue.Queue(maxsize=args.queue_size)
+        handler = BoundedQueueHandler(log_queue, policy=args.policy)
+        handler.addFilter(RequestContextFilter())
+        file_handler.setFormatter(
+            JsonFormatter() if "json" in name else logging.Formatter(TEXT_FORMAT)
+        )
+
+    loggers = []
+    for suffix in ("chat", "llm"):
+        logger = logging.getLogger(f"bench.{name}.{suffix}")
+        logger.handlers.clear()
+        logger.filters.clear()
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        loggers.append(logger)
+
+    if name == "bounded-json-limited":
+        loggers[0].addFilter(RateLimitFilter(sample=args.sample))
+        loggers[1].addFilter(RateLimitFilter(rate=args.rate))
+
+    listener = BoundedQueueListener(log_queue, file_handler)
+    return loggers, listener, file_handler
+
+
+def run(name: str, args, tmp_dir: Path) -> dict:
+    from app.core.metrics import LOG_RECORDS_DROPPED
+    from app.core.tracing import Trace
+    from app.rag_core.evaluation.stats import summarize
+
+    log_path = tmp_dir / f"{name}.log"
+    (chat, llm), listener, file_handler = _setup(name, log_path, args)
+    emit = _chat_request_fstring if name == "unbounded-fstring" else _chat_request
+
+    dropped = LOG_RECORDS_DROPPED.labels(policy=args.policy)
+    dropped_before = dropped._value.get()
+
+    listener.start()
+    latencies = []
+    wall_start = perf_counter()
+
+    for i in range(args.requests):
+        trace = Trace(f"req-{i:08d}")
+        with trace.activate():
+            start = perf_counter()
+            emit(chat, llm, trace.request_id, args.parse_warnings)
+            latencies.append(perf_counter() - start)
+
+    caller_seconds = perf_counter() - wall_start
+    listener.stop()
+    file_handler.close()
+
+    summary = summarize([s * 1e6 for s in latencies])
+    return {
+        "setup": name,
+        "us_per_request_p50": summary["p50"],
+        "us_per_request_p99": summary["p99"],
+        "us_per_request_mean": summary["mean"],
+        "requests_per_sec": args.requests / caller_seconds,
+        "lines_written": sum(1 for _ in log_path.open()),
+        "dropped": int(dropped._value.get() - dropped_before),
+        "log_mb": log_path.stat().st_size / 1e6,
+    }
+
+
+def main(args):
+    setups = [
+        "unbounded-fstring",
+        "bounded-text",
+        "bounded-json",
+        "bounded-json-limited",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [run(name, args, Path(tmp)) for name in setups]
+
+    print_table(rows, [
+        "setup", "us_per_request_p50", "us_per_request_p99",
+        "us_per_request_mean", "requests_per_sec", "lines_written",
+        "dropped", "log_mb",
+    ])
+
+    path = save_results("logging_overhead", {"config": vars(args), "results": rows})
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--parse-warnings", type=int, default=3)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--policy", choices=["drop", "block"], default="drop")
+    parser.add_argument("--rate", type=float, default=5.0, help="hot-path records/sec")
+    parser.add_argument("--sample", type=float, default=0.1, help="INFO fraction kept")
+    args = parser.parse_args()
+
+    configure_env()
+    main(args)
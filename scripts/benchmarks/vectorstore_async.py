@@ -0,0 +1,110 @@
+"""
+Retrieval latency: executor-wrapped sync SDK vs native async data plane.
+
+Starts a local Pinecone stand-in (simulated server latency), then fires
+N concurrent queries through PineconeClient in both modes and reports
+p50/p99 and throughput.
+
+    python -m scripts.benchmarks.vectorstore_async --concurrency 200
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from scripts.benchmarks.common import configure_env, print_table, save_results
+
+HOST = "127.0.0.1"
+NAMESPACE = "bench"
+
+
+async def _run(client, vectors, concurrency: int) -> dict:
+    from app.rag_core.evaluation.stats import summarize
+
+    latencies: list[float] = []
+
+    async def one(i: int):
+        start = perf_counter()
+        await client.query(
+            vector=vectors[i % len(vectors)],
+            namespace=NAMESPACE,
+            top_k=5,
+            include_metadata=True,
+            metadata_filter={"rag_access_level_rank": {"$lte": 2}},
+        )
+        latencies.append(perf_counter() - start)
+
+    wall_start = perf_counter()
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    wall = perf_counter() - wall_start
+
+    return {**summarize(latencies), "wall_seconds": wall, "qps": concurrency / wall}
+
+
+async def main(args):
+    import numpy as np
+    from app.rag_core.evaluation.stand_ins import (
+        serve_vector_store,
+        start_process,
+        wait_for_port,
+    )
+    from app.rag_core.vectorstore.pinecone_client import PineconeClient
+
+    server = start_process(
+        serve_vector_store,
+        host=HOST,
+        port=args.port,
+        latency_seconds=args.server_latency_ms / 1000,
+        seed_namespaces={NAMESPACE: args.vectors},
+    )
+
+    try:
+        wait_for_port(HOST, args.port)
+
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((64, 384)).astype("float32").tolist()
+
+        client = PineconeClient()
+        client.initialize()
+
+        results = {}
+        for mode in ("executor", "async_http"):
+            if mode == "async_http":
+                await client.open()
+
+            await _run(client, vectors, 10)  # warm up connections/threads
+
+            runs = [
+                await _run(client, vectors, args.concurrency)
+                for _ in range(args.repeats)
+            ]
+            results[mode] = min(runs, key=lambda r: r["p99"])
+
+            await client.close()
+
+        rows = [{"mode": mode, **stats} for mode, stats in results.items()]
+        print_table(rows, ["mode", "count", "p50", "p99", "max", "qps"])
+
+        path = save_results(
+            "vectorstore_async",
+            {"config": vars(args), "results": results},
+        )
+        print(f"\nSaved {path}")
+
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--vectors", type=int, default=20_000)
+    parser.add_argument("--server-latency-ms", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=5081)
+    args = parser.parse_args()
+
+    configure_env(
+        PINECONE_INDEX_HOST=f"http://{HOST}:{args.port}",
+        PINECONE_POOL_SIZE=str(args.concurrency),
+    )
+    asyncio.run(main(args))
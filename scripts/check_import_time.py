@@ -0,0 +1,105 @@
+"""
+Import-time budget check.
+
+Imports each module in a fresh interpreter under `python -X importtime`
+and fails (exit 1) when
+- its cumulative import time exceeds --budget-ms (best of --repeat runs), or
+- it pulls in a heavy dependency that must stay lazy (--forbid)
+
+The slowest imports are listed to show where time goes. No settings or
+.env are needed: importing the app must not read configuration.
+
+    python -m scripts.check_import_time
+    python -m scripts.check_import_time --modules main --budget-ms 1200 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "main",
+    "app.rag_core.embeddings.sidecar",
+    "app.rag_core.evaluation.load_test",
+    "app.rag_core.evaluation.retrieval_eval",
+]
+
+# Loaded on first use by the components that need them
+DEFAULT_FORBIDDEN = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "onnxruntime",
+    "pypdf",
+    "docx",
+    "pinecone",
+]
+
+
+def measure(module: str) -> tuple[float, dict[str, float], dict[str, float]]:
+    """
+    :return: (total ms, self ms per module, cumulative ms per module)
+    """
+    env = {
+        key: value for key, value in os.environ.items()
+        if key in ("PATH", "HOME", "PYTHONPATH", "VIRTUAL_ENV")
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    self_ms, cumulative_ms = {}, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        self_ms[name] = int(own) / 1000
+        cumulative_ms[name] = int(cumulative) / 1000
+
+    return cumulative_ms[module], self_ms, cumulative_ms
+
+
+def check(module: str, args) -> bool:
+    runs = [measure(module) for _ in range(args.repeat)]
+    total, self_ms, cumulative_ms = min(runs, key=lambda run: run[0])
+
+    forbidden = [
+        name for name in args.forbid
+        if name in cumulative_ms
+    ]
+    ok = total <= args.budget_ms and not forbidden
+
+    print(f"{'OK  ' if ok else 'FAIL'} {module}: {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if forbidden:
+        print(f"     imports heavy dependencies: {', '.join(forbidden)}")
+
+    slowest = sorted(self_ms.items(), key=lambda item: item[1], reverse=True)
+    for name, ms in slowest[: args.top]:
+        print(f"     {ms:8.1f} ms self  {cumulative_ms[name]:8.1f} ms cumulative  {name}")
+
+    return ok
+
+
+def main(args) -> int:
+    results = [check(module, args) for module in args.modules]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--modules", type=lambda s: s.split(","), default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--forbid", type=lambda s: s.split(","), default=DEFAULT_FORBIDDEN)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.exit(main(args))
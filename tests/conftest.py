@@ -0,0 +1,12 @@
+import os
+
+# Required settings without a default; tests never reach the real services
+for key, value in {
+    "PINECONE_API_KEY": "test",
+    "OPENAI_API_KEY": "test",
+    "NVIDIA_API_KEY": "test",
+    "NVIDIA_BASE_URL": "http://localhost",
+    "NVIDIA_MODELS": "test-model",
+    "NVIDIA_DEFAULT_MODEL": "test-model",
+}.items():
+    os.environ.setdefault(key, value)
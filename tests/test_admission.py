@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.rag_core.llm import admission
+from app.rag_core.llm.admission import AdmissionController, LLMOverloadedError
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        model="test-model",
+        max_concurrency=1,
+        max_queue=1,
+        max_wait_seconds=0.05,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+@pytest.mark.asyncio
+async def test_queue_full_is_rejected():
+    controller = make_controller()
+    holder_started = asyncio.Event()
+    holder_done = asyncio.Event()
+
+    async def hold():
+        async with controller.slot():
+            holder_started.set()
+            await holder_done.wait()
+
+    holder = asyncio.create_task(hold())
+    await holder_started.wait()
+    queued = asyncio.create_task(controller._acquire())
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+
+    with pytest.raises(LLMOverloadedError) as exc:
+        await controller._acquire()
+    assert exc.value.reason == "queue_full"
+
+    holder_done.set()
+    await holder
+    await queued
+    controller._release()
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_rejected_and_releases_nothing():
+    controller = make_controller()
+    await controller._acquire()
+
+    with pytest.raises(LLMOverloadedError) as exc:
+        await controller._acquire()
+    assert exc.value.reason == "queue_timeout"
+    assert controller.in_flight == 1
+    assert controller.queued == 0
+
+    controller._release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_wait_times_out_is_kept(monkeypatch):
+    controller = make_controller()
+    await controller._acquire()
+
+    async def handed_over_then_timed_out(waiter, timeout):
+        # The holder releases into the waiter just before the timeout fires
+        controller._release()
+        assert waiter.done()
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(admission.asyncio, "wait_for", handed_over_then_timed_out)
+    await controller._acquire()
+    monkeypatch.undo()
+
+    assert controller.in_flight == 1
+    controller._release()
+    assert controller.in_flight == 0
+
+    # Capacity is intact: a new request is admitted straight away
+    await controller._acquire()
+    assert controller.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue_and_slot_count_intact():
+    controller = make_controller(max_wait_seconds=5)
+    await controller._acquire()
+
+    waiting = asyncio.create_task(controller._acquire())
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert controller.queued == 0
+
+    controller._release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_after_handover_releases_the_slot():
+    controller = make_controller(max_wait_seconds=5)
+    await controller._acquire()
+
+    waiting = asyncio.create_task(controller._acquire())
+    await asyncio.sleep(0)
+
+    # Hand the slot over, then cancel before the waiter resumes
+    controller._release()
+    waiting.cancel()
+    try:
+        await waiting
+    except asyncio.CancelledError:
+        pass
+    else:
+        # Some wait_for versions return the handed-over result instead
+        controller._release()
+
+    assert controller.in_flight == 0
+    assert controller.queued == 0
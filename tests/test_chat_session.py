@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.service.chat_service import ChatService
+from app.service.chat_session import ChatSession
+
+VECTOR = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+RESULT = {"matches": [{"id": "c1", "score": 0.9, "metadata": {"text": "chunk one"}}]}
+
+
+def recorded(reuse_similarity: float | None = 0.95) -> ChatSession:
+    session = ChatSession(reuse_similarity=reuse_similarity)
+    session.record_retrieval(VECTOR, ["team-a"], 2, RESULT)
+    return session
+
+
+def test_reuse_is_off_by_default():
+    session = ChatSession()
+    session.record_retrieval(VECTOR, ["team-a"], 2, RESULT)
+
+    assert session.reusable_result(VECTOR, ["team-a"], 2) is None
+    assert session.retrievals_avoided == 0
+
+
+def test_near_identical_follow_up_reuses_the_previous_retrieval():
+    session = recorded()
+    close = VECTOR + np.array([0.0, 0.1, 0.0, 0.0], dtype=np.float32)
+
+    assert session.reusable_result(close, ["team-a"], 2) is RESULT
+    assert session.retrievals_avoided == 1
+
+
+def test_dissimilar_follow_up_re_queries():
+    session = recorded()
+    other = np.array([1.0, 1.0, 0.0, 0.0], dtype=np.float32)  # cosine ~0.71
+
+    assert session.reusable_result(other, ["team-a"], 2) is None
+    assert session.retrievals_avoided == 0
+
+
+@pytest.mark.parametrize(
+    "namespaces, access_rank",
+    [(["team-b"], 2), (["team-a", "team-b"], 2), (["team-a"], 4)],
+    ids=["other-namespace", "added-namespace", "other-access-rank"],
+)
+def test_reuse_is_refused_when_the_scope_changes(namespaces, access_rank):
+    session = recorded()
+
+    assert session.reusable_result(VECTOR, namespaces, access_rank) is None
+    assert session.retrievals_avoided == 0
+
+
+def test_reset_forgets_the_previous_retrieval():
+    session = recorded()
+    session.reset()
+
+    assert session.reusable_result(VECTOR, ["team-a"], 2) is None
+
+
+# -------------------------
+# Through the chat pipeline
+# -------------------------
+
+
+class FakeSocket:
+    def __init__(self, state):
+        self.app = SimpleNamespace(state=state)
+        self.sent = []
+
+    async def send_json(self, message: dict):
+        self.sent.append(message)
+
+
+class FakeLLM:
+    model = "test-model"
+
+    async def warm(self):
+        pass
+
+    async def stream(self, prompt: str):
+        yield "answer"
+
+
+class CountingRetriever:
+    def __init__(self):
+        self.calls = []
+
+    async def retrieve_many(self, namespaces, **kwargs):
+        self.calls.append(namespaces)
+        return RESULT
+
+
+@pytest.mark.asyncio
+async def test_chat_reuses_retrieval_only_within_the_same_scope():
+    async def embed_query(query):
+        return VECTOR.tolist()
+
+    llm = FakeLLM()
+    retriever = CountingRetriever()
+    ws = FakeSocket(SimpleNamespace(
+        embedder=SimpleNamespace(embed_query=embed_query),
+        retriever=retriever,
+        llms=SimpleNamespace(get=lambda name: llm),
+        traces=SimpleNamespace(offer=lambda trace: None),
+    ))
+    session = ChatSession(reuse_similarity=0.95)
+
+    for namespace in ("team-a", "team-a", "team-b"):
+        await ChatService.handle_chat(
+            ws, {"query": "What is covered?", "namespace": namespace}, session=session
+        )
+
+    # The repeat is served from the session; the new namespace re-queries
+    assert retriever.calls == [["team-a"], ["team-b"]]
+    assert session.retrievals == 2
+    assert session.retrievals_avoided == 1
+    assert [m["event_type"] for m in ws.sent].count("chat_complete") == 3
@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.deadline import Deadline, StageTimeoutError
+from app.service.chat_service import ChatService
+
+
+@pytest.fixture(params=["native", "call_later"])
+def timeout_impl(request, monkeypatch):
+    """
+    Run with asyncio.timeout (3.11+) and with the Python 3.10 fallback.
+    """
+    if request.param == "native" and not hasattr(asyncio, "timeout"):
+        pytest.skip("asyncio.timeout needs Python 3.11+")
+    if request.param == "call_later":
+        monkeypatch.delattr(asyncio, "timeout", raising=False)
+    return request.param
+
+
+async def ticker(interval: float, log: list, count: int | None = None):
+    i = 0
+    try:
+        while count is None or i < count:
+            await asyncio.sleep(interval)
+            log.append(asyncio.current_task())
+            yield i
+            i += 1
+    finally:
+        log.append("closed")
+
+
+@pytest.mark.asyncio
+async def test_stage_times_out_at_its_cap():
+    deadline = Deadline(5)
+
+    with pytest.raises(StageTimeoutError) as exc:
+        await deadline.run("embedding", asyncio.sleep(1), cap=0.05)
+
+    assert exc.value.stage == "embedding"
+    assert exc.value.budget == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_remaining_budget_is_shared_across_stages():
+    deadline = Deadline(0.3)
+
+    await deadline.run("embedding", asyncio.sleep(0.2), cap=1)
+    assert deadline.remaining() < 0.11
+
+    # The second stage only gets what the first left over, not its cap
+    with pytest.raises(StageTimeoutError) as exc:
+        await deadline.run("retrieval", asyncio.sleep(0.5), cap=1)
+    assert exc.value.stage == "retrieval"
+    assert exc.value.budget < 0.11
+
+
+def test_reserve_never_takes_more_than_half_of_what_is_left():
+    deadline = Deadline(2)
+    assert deadline.budget(reserve=5) == pytest.approx(1, abs=0.01)
+    assert deadline.budget(cap=0.5, reserve=0.1) == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_rejects_without_awaiting():
+    deadline = Deadline(0)
+    work = asyncio.sleep(1)
+
+    with pytest.raises(StageTimeoutError):
+        await deadline.run("retrieval", work)
+    # Closed rather than left un-awaited
+    assert work.cr_frame is None
+
+
+@pytest.mark.asyncio
+async def test_stream_is_cut_off_at_the_deadline(timeout_impl):
+    deadline = Deadline(0.2)
+    log, items = [], []
+
+    with pytest.raises(StageTimeoutError) as exc:
+        async for item in deadline.stream(ticker(0.03, log), "first", "next"):
+            items.append(item)
+
+    assert exc.value.stage == "next"
+    assert 3 <= len(items) <= 7
+    assert log[-1] == "closed"
+    # Driven by the consuming task, never a per-item task
+    assert set(log[:-1]) == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_first_item_is_bounded_by_its_cap(timeout_impl):
+    deadline = Deadline(5)
+    log = []
+
+    with pytest.raises(StageTimeoutError) as exc:
+        async for _ in deadline.stream(ticker(0.5, log), "first", "next", first_cap=0.05):
+            pass
+
+    assert exc.value.stage == "first"
+    assert log == ["closed"]
+
+
+@pytest.mark.asyncio
+async def test_stream_within_budget_completes(timeout_impl):
+    deadline = Deadline(5)
+    log = []
+
+    items = [item async for item in deadline.stream(ticker(0.001, log, 5), "first", "next")]
+
+    assert items == [0, 1, 2, 3, 4]
+    assert log[-1] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_external_cancellation_is_not_a_timeout(timeout_impl):
+    async def consume():
+        async for _ in Deadline(5).stream(ticker(1, []), "first", "next"):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+# -------------------------
+# Chat pipeline degradation
+# -------------------------
+
+
+class FakeSocket:
+    def __init__(self, state):
+        self.app = SimpleNamespace(state=state)
+        self.sent = []
+
+    async def send_json(self, message: dict):
+        self.sent.append(message)
+
+
+class FakeLLM:
+    model = "test-model"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def warm(self):
+        pass
+
+    async def stream(self, prompt: str):
+        self.prompts.append(prompt)
+        for token in ("no", " context"):
+            yield token
+
+
+class SlowRetriever:
+    async def retrieve_many(self, **kwargs):
+        await asyncio.sleep(5)
+
+
+@pytest.mark.asyncio
+async def test_chat_answers_without_context_when_retrieval_times_out(monkeypatch):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "CHAT_RETRIEVAL_TIMEOUT_SECONDS", 0.05)
+
+    async def embed_query(query):
+        return [1.0, 0.0, 0.0, 0.0]
+
+    llm = FakeLLM()
+    ws = FakeSocket(SimpleNamespace(
+        embedder=SimpleNamespace(embed_query=embed_query),
+        retriever=SlowRetriever(),
+        llms=SimpleNamespace(get=lambda name: llm),
+        traces=SimpleNamespace(offer=lambda trace: None),
+    ))
+
+    await ChatService.handle_chat(ws, {"query": "What is covered?", "deadline_ms": 2000})
+
+    events = [message["event_type"] for message in ws.sent]
+    assert events == ["timeout", "chat_stream", "chat_stream", "chat_complete"]
+    assert ws.sent[0]["stage"] == "retrieval"
+    assert ws.sent[0]["degraded"] is True
+    assert len(llm.prompts) == 1
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from app.rag_core.embeddings.embedder import AsyncSentenceEmbedder
+from app.rag_core.embeddings.sidecar import EmbeddingSidecarServer, SidecarEmbedder
+
+
+class HashingModel:
+    """
+    Stand-in for the SentenceTransformer model: deterministic float32
+    vectors without loading weights.
+    """
+
+    dimension = 16
+
+    def encode(self, texts, **kwargs):
+        rng = np.random.default_rng([sum(map(ord, text)) for text in texts] or [0])
+        vectors = rng.standard_normal((len(texts), self.dimension)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def local_embedder(dtype: str = "float16") -> AsyncSentenceEmbedder:
+    embedder = AsyncSentenceEmbedder.__new__(AsyncSentenceEmbedder)
+    embedder.device = "cpu"
+    embedder.normalize_embeddings = True
+    embedder.batch_size = 32
+    embedder.backend = "torch"
+    embedder.dtype = np.dtype(dtype)
+    embedder.model = HashingModel()
+    return embedder
+
+
+TEXTS = ["first chunk", "second chunk", "third chunk"]
+
+
+@pytest.mark.asyncio
+async def test_in_process_ingestion_arrays_use_dtype_and_queries_stay_float32():
+    embedder = local_embedder("float16")
+
+    assert (await embedder.embed_array(TEXTS)).dtype == np.float16
+    assert (await embedder.embed_queries(TEXTS)).dtype == np.float32
+    # Query vectors are not rounded through float16
+    assert await embedder.embed_query(TEXTS[0]) == embedder.model.encode(TEXTS[:1])[0].tolist()
+
+
+@pytest.mark.asyncio
+async def test_sidecar_ingestion_arrays_use_dtype_and_queries_stay_float32(tmp_path):
+    server_embedder = local_embedder("float32")
+    server = EmbeddingSidecarServer(server_embedder, tmp_path / "e.sock", max_wait_seconds=0.001)
+    await server.start()
+    client = SidecarEmbedder(tmp_path / "e.sock", dtype="float16")
+
+    try:
+        array = await client.embed_array(TEXTS)
+        queries = await client.embed_queries(TEXTS)
+    finally:
+        await client.aclose()
+        await server.close()
+
+    assert array.dtype == np.float16
+    assert queries.dtype == np.float32
+    np.testing.assert_array_equal(queries, server_embedder.model.encode(TEXTS))
+
+
+@pytest.mark.asyncio
+async def test_sidecar_fallback_ingestion_arrays_use_dtype(tmp_path):
+    client = SidecarEmbedder(
+        tmp_path / "missing.sock",
+        fallback=lambda: local_embedder("float16"),
+        dtype="float16",
+    )
+
+    assert (await client.embed_array(TEXTS)).dtype == np.float16
+    assert (await client.embed_queries(TEXTS)).dtype == np.float32
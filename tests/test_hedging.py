@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from app.rag_core.llm.admission import AdmissionController
+from app.rag_core.llm.hedging import FirstTokenTracker, HedgedLLMClient
+
+
+class GatedClient:
+    """
+    Stand-in LLM client that holds an admission slot and yields its
+    tokens once `gate` is set.
+    """
+
+    def __init__(self, model: str, gate: asyncio.Event):
+        self.model = model
+        self.gate = gate
+        self.admission = AdmissionController(
+            model=model, max_concurrency=1, max_queue=0, max_wait_seconds=0
+        )
+
+    async def warm(self):
+        pass
+
+    async def stream(self, prompt: str):
+        async with self.admission.slot():
+            await self.gate.wait()
+            for token in (self.model, " answer"):
+                yield token
+
+
+@pytest.mark.asyncio
+async def test_first_tokens_in_same_iteration_release_both_slots():
+    gate = asyncio.Event()
+    primary = GatedClient("primary-model", gate)
+    fallback = GatedClient("fallback-model", gate)
+    client = HedgedLLMClient(
+        primary, fallback, FirstTokenTracker(initial_delay=0.01, min_delay=0.0)
+    )
+
+    async def open_gate():
+        # Both streams are waiting on the gate once the hedge has started
+        while fallback.admission.in_flight == 0:
+            await asyncio.sleep(0.005)
+        gate.set()
+
+    opener = asyncio.create_task(open_gate())
+    stream = client.stream("question")
+
+    first = await stream.__anext__()
+    await opener
+
+    # The loser is closed before the winner's first token is handed out
+    loser = fallback if first == primary.model else primary
+    assert loser.admission.in_flight == 0
+
+    rest = [token async for token in stream]
+    assert rest == [" answer"]
+    assert primary.admission.in_flight == 0
+    assert fallback.admission.in_flight == 0
+
+
+class RecordingClient:
+    """
+    Stand-in LLM client recording which task resumes its generator.
+    """
+
+    def __init__(self, model: str, tokens=("a", "b", "c"), fail: bool = False):
+        self.model = model
+        self.tokens = tokens
+        self.fail = fail
+        self.tasks = set()
+        self.admission = AdmissionController(
+            model=model, max_concurrency=1, max_queue=0, max_wait_seconds=0
+        )
+
+    async def warm(self):
+        pass
+
+    async def stream(self, prompt: str):
+        async with self.admission.slot():
+            self.tasks.add(asyncio.current_task())
+            if self.fail:
+                raise RuntimeError("upstream failed")
+            for token in self.tokens:
+                await asyncio.sleep(0)
+                self.tasks.add(asyncio.current_task())
+                yield token
+
+
+@pytest.mark.asyncio
+async def test_upstream_stream_is_resumed_by_one_task():
+    primary = RecordingClient("primary-model")
+    client = HedgedLLMClient(
+        primary, RecordingClient("fallback-model"), FirstTokenTracker(initial_delay=5)
+    )
+
+    tokens = [token async for token in client.stream("question")]
+
+    assert tokens == ["a", "b", "c"]
+    assert len(primary.tasks) == 1
+    assert asyncio.current_task() not in primary.tasks
+    assert primary.admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_primary_hedges_to_fallback():
+    primary = RecordingClient("primary-model", fail=True)
+    fallback = RecordingClient("fallback-model", tokens=("x", "y"))
+    client = HedgedLLMClient(primary, fallback, FirstTokenTracker(initial_delay=5))
+
+    tokens = [token async for token in client.stream("question")]
+
+    assert tokens == ["x", "y"]
+    assert primary.admission.in_flight == 0
+    assert fallback.admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_early_releases_the_winner_slot():
+    primary = RecordingClient("primary-model", tokens=tuple("abcdefgh"))
+    client = HedgedLLMClient(
+        primary, RecordingClient("fallback-model"), FirstTokenTracker(initial_delay=5)
+    )
+
+    stream = client.stream("question")
+    assert await stream.__anext__() == "a"
+    await stream.aclose()
+
+    assert primary.admission.in_flight == 0
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_logging_without_settings_does_not_raise(tmp_path):
+    # Fresh interpreter, no settings in the environment and no .env in cwd
+    env = {key: os.environ[key] for key in ("PATH", "HOME") if key in os.environ}
+    env["PYTHONPATH"] = str(ROOT)
+
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app.core.logger import get_logger, shutdown_logging\n"
+            "logger = get_logger('tests.no_settings')\n"
+            "logger.debug('hidden')\n"
+            "logger.info('hello %s', 'world')\n"
+            "shutdown_logging()\n",
+        ],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert "| INFO | tests.no_settings | hello world" in proc.stdout
+    assert "hidden" not in proc.stdout
+
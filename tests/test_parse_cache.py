@@ -0,0 +1,78 @@
+import os
+import random
+
+from app.rag_core.ingestion.loader import ChunkBatch
+from app.rag_core.ingestion.parse_cache import ParsedTextCache
+
+
+def sections_for(seed: int, size: int = 4000) -> ChunkBatch:
+    # Random hex so entries compress to roughly the same size
+    rng = random.Random(seed)
+    sections = ChunkBatch()
+    for page in (1, 2):
+        text = "".join(rng.choice("0123456789abcdef") for _ in range(size))
+        sections.append(text, {"source": "upload.pdf", "page": page, "type": "pdf"})
+    return sections
+
+
+def open_cache(tmp_path, **kwargs) -> ParsedTextCache:
+    cache = ParsedTextCache(tmp_path / "cache", version="1/test", **kwargs)
+    cache.open()
+    return cache
+
+
+def test_hit_returns_sections_under_the_callers_file_name(tmp_path):
+    cache = open_cache(tmp_path)
+    document = tmp_path / "a.pdf"
+    document.write_bytes(b"%PDF document bytes")
+
+    sections = sections_for(0)
+    cache.put(cache.key(document), sections)
+
+    # A copy of the same bytes under another name
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(document.read_bytes())
+    cached = cache.get(cache.key(copy), "copy.pdf")
+
+    assert cached.texts == sections.texts
+    assert [m["page"] for m in cached.metadata] == [1, 2]
+    assert {m["source"] for m in cached.metadata} == {"copy.pdf"}
+
+
+def test_changed_content_or_version_misses(tmp_path):
+    cache = open_cache(tmp_path)
+    document = tmp_path / "a.pdf"
+    document.write_bytes(b"%PDF version one")
+    cache.put(cache.key(document), sections_for(0))
+
+    document.write_bytes(b"%PDF version two")
+    assert cache.get(cache.key(document), "a.pdf") is None
+
+    document.write_bytes(b"%PDF version one")
+    assert cache.get(cache.key(document), "a.pdf") is not None
+
+    # Same bytes, new extractor version
+    upgraded = ParsedTextCache(tmp_path / "cache", version="2/test")
+    assert upgraded.get(upgraded.key(document), "a.pdf") is None
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = open_cache(tmp_path)
+    keys = ["a" * 40, "b" * 40, "c" * 40]
+
+    cache.put(keys[0], sections_for(0))
+    entry_size = cache._path(keys[0]).stat().st_size
+    cache.max_bytes = int(entry_size * 2.5)
+    cache.put(keys[1], sections_for(1))
+
+    os.utime(cache._path(keys[0]), (1000, 1000))
+    os.utime(cache._path(keys[1]), (2000, 2000))
+    # A hit makes the oldest entry the most recently used
+    assert cache.get(keys[0], "a.pdf") is not None
+
+    cache.put(keys[2], sections_for(2))
+
+    assert not cache._path(keys[1]).exists()
+    assert cache.get(keys[0], "a.pdf") is not None
+    assert cache.get(keys[2], "c.pdf") is not None
+    assert sum(p.stat().st_size for p in cache.directory.iterdir()) <= cache.max_bytes
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from app.rag_core.embeddings.reduction import VectorReducer, load_reducer
+from app.rag_core.retrieval.retriever import Retriever
+
+
+def low_rank_sample(n: int = 200, rank: int = 4, dimension: int = 16) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    basis = np.linalg.qr(rng.standard_normal((dimension, rank)))[0].T
+    vectors = rng.standard_normal((n, rank)) @ basis
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_pca_round_trip_preserves_projection_and_similarities(tmp_path):
+    sample = low_rank_sample()
+    reducer = VectorReducer.fit_pca(sample, 4, model_name="test-model")
+    path = reducer.save(tmp_path / "reduction" / "projection.npz")
+
+    loaded = VectorReducer.load(path)
+
+    assert (loaded.method, loaded.dimension, loaded.source_dimension, loaded.model_name) == (
+        "pca", 4, 16, "test-model"
+    )
+    assert loaded.explained_variance == pytest.approx(1.0)
+    np.testing.assert_array_equal(loaded.components, reducer.components)
+    np.testing.assert_array_equal(loaded.transform(sample), reducer.transform(sample))
+
+    # The sample lies in a 4-d subspace, so 4 components keep every cosine
+    reduced = loaded.transform(sample)
+    assert reduced.shape == (200, 4)
+    np.testing.assert_allclose(reduced @ reduced.T, sample @ sample.T, atol=1e-4)
+
+
+def test_truncation_round_trip_keeps_leading_dimensions(tmp_path):
+    reducer = VectorReducer.truncation(16, 8, model_name="test-model")
+    loaded = VectorReducer.load(reducer.save(tmp_path / "projection.npz"))
+
+    assert (loaded.method, loaded.dimension, loaded.components) == ("truncate", 8, None)
+    assert loaded.explained_variance is None
+
+    vector = np.arange(1, 17, dtype=np.float32)
+    expected = vector[:8] / np.linalg.norm(vector[:8])
+    np.testing.assert_allclose(loaded.transform(vector), expected, rtol=1e-6)
+
+
+def test_load_reducer_rejects_a_projection_for_other_settings(tmp_path):
+    path = tmp_path / "projection.npz"
+    VectorReducer.fit_pca(low_rank_sample(), 4, model_name="test-model").save(path)
+
+    assert load_reducer("pca", path, 4, 16, "test-model").dimension == 4
+    with pytest.raises(RuntimeError):
+        load_reducer("pca", path, 8, 16, "test-model")
+    with pytest.raises(RuntimeError):
+        load_reducer("pca", path, 4, 16, "other-model")
+    with pytest.raises(RuntimeError):
+        load_reducer("pca", tmp_path / "missing.npz", 4, 16, "test-model")
+
+
+# -------------------------
+# Full-dimension rescoring
+# -------------------------
+
+
+class FakeChunkStore:
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = {id_: np.asarray(v, dtype=np.float32) for id_, v in vectors.items()}
+
+    async def get_vectors(self, ids: list[str]) -> dict[str, np.ndarray]:
+        return {id_: self.vectors[id_] for id_ in ids if id_ in self.vectors}
+
+
+QUERY = [1.0, 0.0, 0.0]
+
+
+def candidates() -> list[dict]:
+    # Reduced-space scores; the full vectors rank them the other way round
+    return [
+        {"id": "a", "score": 0.9},
+        {"id": "b", "score": 0.8},
+        {"id": "c", "score": 0.7},
+    ]
+
+
+def retriever_with(vectors: dict) -> Retriever:
+    return Retriever(None, chunk_store=FakeChunkStore(vectors))
+
+
+@pytest.mark.asyncio
+async def test_rescore_reranks_when_every_candidate_has_a_full_vector():
+    retriever = retriever_with({"a": [0.1, 1.0, 0.0], "b": [0.5, 0.5, 0.0], "c": [1.0, 0.0, 0.0]})
+
+    rescored = await retriever._rescore(QUERY, candidates(), top_k=2)
+
+    assert [m["id"] for m in rescored] == ["c", "b"]
+    assert rescored[0]["score"] == pytest.approx(1.0)
+    assert rescored[1]["score"] == pytest.approx(2 ** -0.5)
+
+
+@pytest.mark.asyncio
+async def test_rescore_never_mixes_full_and_reduced_scores():
+    # "b" predates the vector column: full cosines for a/c would not be
+    # comparable with its reduced score
+    retriever = retriever_with({"a": [0.1, 1.0, 0.0], "c": [1.0, 0.0, 0.0]})
+
+    rescored = await retriever._rescore(QUERY, candidates(), top_k=2)
+
+    assert [(m["id"], m["score"]) for m in rescored] == [("a", 0.9), ("b", 0.8)]
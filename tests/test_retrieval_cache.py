@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from app.rag_core.evaluation.stand_ins import InMemoryPineconeClient
+from app.rag_core.retrieval import cache as cache_module
+from app.rag_core.retrieval.cache import RetrievalCache, _estimate_size
+from app.rag_core.retrieval.retriever import Retriever
+from app.utils.rag_utils import RAGUtils
+
+
+def matches_for(name: str, text_size: int = 10) -> list[dict]:
+    return [{"id": name, "score": 0.9, "metadata": {"text": "x" * text_size}}]
+
+
+def key_for(cache: RetrievalCache, namespace: str, seed: int) -> tuple:
+    vector = np.random.default_rng(seed).standard_normal(8).astype(np.float32)
+    return cache.make_key(namespace, vector, 4, 5, None)
+
+
+def test_hit_returns_stored_matches_for_equal_vectors():
+    cache = RetrievalCache()
+    vector = np.arange(8, dtype=np.float32)
+    key = cache.make_key("ns", vector, 4, 5, {"rank": {"$lte": 4}})
+    cache.put(key, matches_for("a"), cache.generation("ns"))
+
+    # Same vector as a plain list, same filter with reordered keys
+    same = cache.make_key("ns", vector.tolist(), 4, 5, {"rank": {"$lte": 4}})
+    assert cache.get(same) == matches_for("a")
+    assert cache.get(key_for(cache, "ns", 1)) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+
+    cache = RetrievalCache(ttl_seconds=10)
+    key = key_for(cache, "ns", 0)
+    cache.put(key, matches_for("a"), cache.generation("ns"))
+
+    now[0] += 9.9
+    assert cache.get(key) is not None
+
+    now[0] += 0.2
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_byte_bound_evicts_least_recently_used():
+    entry_size = _estimate_size(matches_for("a", text_size=1000))
+    cache = RetrievalCache(max_bytes=int(entry_size * 2.5))
+    keys = [key_for(cache, "ns", seed) for seed in range(3)]
+
+    cache.put(keys[0], matches_for("a", 1000), 0)
+    cache.put(keys[1], matches_for("b", 1000), 0)
+    # Touch the oldest entry so the second one is least recently used
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], matches_for("c", 1000), 0)
+
+    assert len(cache) == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_oversized_results_are_not_cached():
+    cache = RetrievalCache(max_bytes=100)
+    key = key_for(cache, "ns", 0)
+    cache.put(key, matches_for("a", 1000), 0)
+    assert len(cache) == 0
+
+
+def test_results_from_a_stale_generation_are_dropped():
+    cache = RetrievalCache()
+    key = key_for(cache, "ns", 0)
+    generation = cache.generation("ns")
+
+    # Ingestion finished while the query was in flight
+    cache.bump_generation("ns")
+    cache.put(key, matches_for("a"), generation)
+    assert cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_upsert_into_physical_namespace_invalidates_cached_results():
+    client = InMemoryPineconeClient(dimension=4)
+    retriever = Retriever(client, cache=RetrievalCache(), partitioned=True)
+    partition = RAGUtils.partition_namespace("tenant", "internal")
+
+    await client.upsert(
+        [{"id": "old", "values": [1, 1, 0, 0], "metadata": {"text": "old"}}],
+        namespace=partition,
+    )
+    query = [1.0, 0.0, 0.0, 0.0]
+
+    first = await retriever.retrieve(query, "tenant", access_rank=4, top_k=1)
+    assert [m["id"] for m in first["matches"]] == ["old"]
+
+    await client.upsert(
+        [{"id": "new", "values": [1, 0, 0, 0], "metadata": {"text": "new"}}],
+        namespace=partition,
+    )
+
+    # Served from the cache until the ingestion invalidates the partition
+    cached = await retriever.retrieve(query, "tenant", access_rank=4, top_k=1)
+    assert [m["id"] for m in cached["matches"]] == ["old"]
+
+    retriever.invalidate(partition)
+    fresh = await retriever.retrieve(query, "tenant", access_rank=4, top_k=1)
+    assert [m["id"] for m in fresh["matches"]] == ["new"]
+
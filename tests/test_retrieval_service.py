@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from app.core.metrics import EMBEDDING_LATENCY, RETRIEVAL_BATCH_EMBEDDING_LATENCY
+from app.service.retrieval_service import RetrievalService
+
+
+class FakeEmbedder:
+    async def embed_queries(self, texts):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class FakeRetriever:
+    async def retrieve_many(self, vector, namespaces, access_rank, top_k):
+        return {"matches": [{"id": namespaces[0], "score": 1.0}]}
+
+
+def histogram_count(histogram) -> float:
+    return next(
+        sample.value
+        for metric in histogram.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_embedding_is_timed_separately_from_chat_queries():
+    queries = RetrievalService.resolve([
+        {"id": f"q{i}", "query": f"question {i}", "top_k": 1} for i in range(8)
+    ])
+    single, batch = histogram_count(EMBEDDING_LATENCY), histogram_count(RETRIEVAL_BATCH_EMBEDDING_LATENCY)
+
+    result = await RetrievalService.retrieve_batch(queries, FakeEmbedder(), FakeRetriever())
+
+    assert [r["id"] for r in result["results"]] == [f"q{i}" for i in range(8)]
+    # One observation per request, none in the per-query histogram
+    assert histogram_count(RETRIEVAL_BATCH_EMBEDDING_LATENCY) == batch + 1
+    assert histogram_count(EMBEDDING_LATENCY) == single
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from app.rag_core.retrieval.selection import mmr, select_matches
+
+
+def match(id_: str, score: float, values=None, text: str = "x" * 40) -> dict:
+    m = {"id": id_, "score": score, "metadata": {"text": text}}
+    if values is not None:
+        m["values"] = values
+    return m
+
+
+# Two near-duplicates of the best chunk and one distinct, lower-scoring chunk
+CANDIDATES = [
+    match("duplicate", 0.89, [1.0, 0.01]),
+    match("distinct", 0.70, [0.0, 1.0]),
+    match("best", 0.90, [1.0, 0.0]),
+    match("duplicate-2", 0.88, [1.0, 0.02]),
+]
+
+
+def ids(matches: list[dict]) -> list[str]:
+    return [m["id"] for m in matches]
+
+
+def test_mmr_trades_relevance_for_diversity():
+    scores = np.array([0.9, 0.89, 0.7], dtype=np.float32)
+    vectors = np.array([[1.0, 0.0], [1.0, 0.01], [0.0, 1.0]], dtype=np.float32)
+
+    # lambda 0.5: the duplicate's redundancy (~1) outweighs its relevance edge
+    assert mmr(scores, vectors, 2, 0.5) == [0, 2]
+    assert mmr(scores, vectors, 3, 0.5) == [0, 2, 1]
+    # lambda 1 is plain relevance order
+    assert mmr(scores, vectors, 3, 1.0) == [0, 1, 2]
+    assert mmr(scores, vectors, 0, 0.5) == []
+
+
+def test_select_matches_with_mmr_skips_near_duplicates():
+    selected, stats = select_matches(CANDIDATES, top_k=2, mmr_lambda=0.5)
+
+    assert ids(selected) == ["best", "distinct"]
+    assert stats["candidates"] == 4
+    assert stats["selected"] == 2
+    assert stats["contexts_saved"] == 0
+
+
+def test_min_score_cutoff_drops_low_scores():
+    selected, stats = select_matches(CANDIDATES, top_k=4, min_score=0.85)
+
+    assert ids(selected) == ["best", "duplicate", "duplicate-2"]
+    assert stats["below_min_score"] == 1
+    assert stats["contexts_saved"] == 1
+    assert stats["prompt_tokens_saved"] == 10
+
+
+def test_adaptive_ratio_is_relative_to_the_best_score():
+    selected, _ = select_matches(CANDIDATES, top_k=4, adaptive_ratio=0.8)
+    assert ids(selected) == ["best", "duplicate", "duplicate-2"]
+
+
+def test_cutoff_applies_before_mmr():
+    # The distinct chunk is below the cutoff, so MMR only sees duplicates
+    selected, _ = select_matches(CANDIDATES, top_k=2, min_score=0.85, mmr_lambda=0.5)
+    assert ids(selected) == ["best", "duplicate"]
+
+
+@pytest.mark.parametrize(
+    "candidates, mmr_lambda",
+    [
+        (CANDIDATES, None),
+        # A candidate without its vector disables MMR for the whole request
+        (CANDIDATES[:-1] + [match("duplicate-2", 0.88)], 0.5),
+    ],
+    ids=["mmr-disabled", "missing-values"],
+)
+def test_falls_back_to_plain_top_k(candidates, mmr_lambda):
+    selected, stats = select_matches(candidates, top_k=2, mmr_lambda=mmr_lambda)
+
+    assert ids(selected) == ["best", "duplicate"]
+    assert stats["contexts_saved"] == 0
+    assert stats["prompt_tokens_saved"] == 0